@@ -0,0 +1,84 @@
+# coding: utf-8
+"""Benchmark the date extraction of external references on the MITRE bundle.
+
+Usage: python benchmarks/bench_date_extraction.py [--rounds 3]
+"""
+import argparse
+import datetime
+import json
+import os
+import time
+
+import datefinder
+
+from pycti.utils import opencti_stix2_dates
+
+BUNDLE = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "data", "mitre_att_capec.json"
+)
+
+
+def load_texts() -> list:
+    with open(BUNDLE, encoding="utf-8") as file:
+        bundle = json.load(file)
+    texts = []
+    for stix_object in bundle["objects"]:
+        for external_reference in stix_object.get("external_references") or []:
+            texts.append(
+                external_reference["description"]
+                if "description" in external_reference
+                else external_reference.get("source_name")
+            )
+    return texts
+
+
+def datefinder_extract_date(text):
+    yesterday = datetime.datetime.now() - datetime.timedelta(days=1)
+    try:
+        for match in datefinder.find_dates(
+            text, base_date=datetime.datetime.fromtimestamp(0)
+        ):
+            if match.timestamp() < yesterday.timestamp() and len(str(match.year)) == 4:
+                return match.strftime("%Y-%m-%dT%H:%M:%SZ")
+    except Exception:
+        return None
+    return None
+
+
+def measure(name, function, texts, rounds, setup=None):
+    timings = []
+    for _ in range(rounds):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for text in texts:
+            function(text)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(
+        "%s: %d texts, best of %d: %.3fs (%.0f texts/s)"
+        % (name, len(texts), rounds, best, len(texts) / best)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    texts = load_texts()
+    measure("datefinder", datefinder_extract_date, texts, args.rounds)
+    measure(
+        "extract_date (cold)",
+        opencti_stix2_dates.extract_date,
+        texts,
+        args.rounds,
+        setup=opencti_stix2_dates.clear_cache,
+    )
+    measure(
+        "extract_date (memoized)", opencti_stix2_dates.extract_date, texts, args.rounds
+    )
+
+
+if __name__ == "__main__":
+    main()
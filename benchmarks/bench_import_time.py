@@ -0,0 +1,82 @@
+# coding: utf-8
+"""Benchmark the import time of pycti with ``python -X importtime``.
+
+Each statement runs in a fresh interpreter, the cumulative import time of
+the imported modules is reported with the slowest third party packages.
+Use ``--max-ms`` to fail when ``import pycti`` regresses.
+
+Usage: python benchmarks/bench_import_time.py [--rounds 5] [--max-ms 100]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+STATEMENTS = [
+    "import pycti",
+    "from pycti import OpenCTIApiClient",
+    "from pycti import OpenCTIApiClient; "
+    "OpenCTIApiClient('http://fake:4000', 'fake', perform_health_check=False)",
+    "from pycti import OpenCTIConnectorHelper",
+]
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_times(statement: str) -> list:
+    """Run a statement and parse the import time of its top level modules.
+
+    :return: (module, cumulative microseconds) of the top level imports
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        # Top level imports are indented by a single space
+        if match is not None and len(match.group(3)) == 1:
+            modules.append((match.group(4), int(match.group(2))))
+    return modules
+
+
+def measure(statement: str, rounds: int) -> float:
+    totals = []
+    modules = {}
+    for _ in range(rounds):
+        times = [entry for entry in import_times(statement) if entry[0] != "site"]
+        totals.append(sum(cumulative for _, cumulative in times))
+        for name, cumulative in times:
+            modules[name] = min(modules.get(name, cumulative), cumulative)
+    best = min(totals) / 1000
+    slowest = sorted(modules.items(), key=lambda entry: -entry[1])[:5]
+    print("%s: best of %d: %.1fms" % (statement, rounds, best))
+    for name, cumulative in slowest:
+        print("    %-40s %.1fms" % (name, cumulative / 1000))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=None,
+        help="fail if import pycti takes longer than this",
+    )
+    args = parser.parse_args()
+
+    results = [measure(statement, args.rounds) for statement in STATEMENTS]
+    if args.max_ms is not None and results[0] > args.max_ms:
+        print("import pycti is slower than %.1fms" % args.max_ms)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
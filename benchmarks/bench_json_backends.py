@@ -0,0 +1,63 @@
+# coding: utf-8
+"""Compare the JSON backends on the STIX bundles of tests/data.
+
+Usage: python benchmarks/bench_json_backends.py [--rounds 20] [files...]
+"""
+import argparse
+import glob
+import time
+
+from pycti.utils import opencti_json
+
+
+def best_of(rounds: int, func) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("files", nargs="*")
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob("tests/data/*.json"))
+    contents = []
+    for file_path in files:
+        with open(file_path, "rb") as file:
+            contents.append(file.read())
+    size = sum(len(content) for content in contents)
+    print("%d files, %.1f MB" % (len(contents), size / 1024 / 1024))
+
+    previous = opencti_json.get_backend()
+    try:
+        for backend in opencti_json.available_backends():
+            opencti_json.set_backend(backend)
+            objects = [opencti_json.loads(content) for content in contents]
+            load_time = best_of(
+                args.rounds,
+                lambda: [opencti_json.loads(content) for content in contents],
+            )
+            dump_time = best_of(
+                args.rounds, lambda: [opencti_json.dumps(obj) for obj in objects]
+            )
+            print(
+                "%-8s loads %.4fs (%.0f MB/s)  dumps %.4fs (%.0f MB/s)"
+                % (
+                    backend,
+                    load_time,
+                    size / load_time / 1024 / 1024,
+                    dump_time,
+                    size / dump_time / 1024 / 1024,
+                )
+            )
+    finally:
+        opencti_json.set_backend(previous)
+
+
+if __name__ == "__main__":
+    main()
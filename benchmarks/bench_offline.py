@@ -0,0 +1,280 @@
+# coding: utf-8
+"""Offline benchmark suite of the connector and import paths.
+
+The platform is replaced by the local GraphQL server of
+:py:mod:`fake_opencti` and RabbitMQ by its in-process AMQP stub, no OpenCTI
+instance is needed. Results are written as JSON to track regressions
+between releases. With ``--memory`` the split, import and export phases
+are profiled with tracemalloc (much slower, compare the memory figures
+only with other ``--memory`` runs) and ``--max-rss-mb`` fails the run when
+the peak RSS of the process is too high.
+
+Usage: python benchmarks/bench_offline.py [--rounds 3] [--latency 0.001]
+    [--output results.json] [--memory] [--max-rss-mb 500] [scenario ...]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+import uuid
+from unittest.mock import patch
+
+from fake_opencti import FakeAmqpConnection, FakeOpenCTIServer, paginated
+
+import pycti
+from pycti import OpenCTIApiClient, OpenCTIConnectorHelper, OpenCTIStix2ImportStats
+from pycti.utils import opencti_memory_profiler
+from pycti.utils.opencti_stix2_splitter import OpenCTIStix2Splitter
+
+BUNDLE = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "data", "mitre_att_capec.json"
+)
+
+
+def malware_node(index: int) -> dict:
+    return {
+        "id": str(index),
+        "standard_id": "malware--" + str(uuid.UUID(int=index)),
+        "entity_type": "Malware",
+        "parent_types": ["Stix-Domain-Object", "Stix-Core-Object"],
+        "spec_version": "2.1",
+        "name": "Malware %d" % index,
+        "description": "Benchmark malware",
+        "created": "2024-01-01T00:00:00.000Z",
+        "modified": "2024-01-01T00:00:00.000Z",
+        "is_family": True,
+        "revoked": False,
+        "confidence": 50,
+        "createdBy": None,
+        "objectMarking": [],
+        "objectLabel": [],
+        "externalReferences": {"edges": []},
+        "killChainPhases": [],
+        "x_opencti_stix_ids": [],
+    }
+
+
+def register_connector(variables: dict) -> dict:
+    return {
+        "id": variables["input"]["id"],
+        "connector_state": None,
+        "connector_user_id": str(uuid.uuid4()),
+        "config": {
+            "connection": {
+                "host": "localhost",
+                "vhost": "/",
+                "use_ssl": False,
+                "port": 5672,
+                "user": "guest",
+                "pass": "guest",
+            },
+            "listen": "listen",
+            "listen_routing": "listen",
+            "listen_exchange": "listen",
+            "push": "push",
+            "push_routing": "push",
+            "push_exchange": "push",
+        },
+    }
+
+
+def best_of(rounds: int, run) -> tuple:
+    """Run `run` `rounds` times.
+
+    :return: the best duration and the result of the last run
+    """
+    timings = []
+    result = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = run()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def bench_splitter(server, bundle: str, rounds: int) -> dict:
+    def run():
+        return OpenCTIStix2Splitter().split_bundle_with_expectations(
+            bundle=bundle, use_json=True
+        )
+
+    duration, (expectations, _, bundles) = best_of(rounds, run)
+    return {
+        "objects": expectations,
+        "bundles": len(bundles),
+        "seconds": duration,
+        "objects_per_second": expectations / duration,
+    }
+
+
+def bench_import_bundle(server, bundle: str, rounds: int) -> dict:
+    client = OpenCTIApiClient(server.url, "fake", log_level="error")
+    stix_bundle = json.loads(bundle)
+    requests = server.requests
+    stats = OpenCTIStix2ImportStats()
+    duration, (imported, _) = best_of(
+        rounds, lambda: client.stix2.import_bundle(stix_bundle, stats=stats)
+    )
+    return {
+        "objects": len(imported),
+        "seconds": duration,
+        "objects_per_second": len(imported) / duration,
+        "queries_per_object": (server.requests - requests) / rounds / len(imported),
+        "stats": stats.to_dict(),
+    }
+
+
+def bench_export_list(server, bundle: str, rounds: int, sizes=(100, 1000)) -> dict:
+    client = OpenCTIApiClient(server.url, "fake", log_level="error")
+    results = {}
+    for size in sizes:
+        server.responses["malwares"] = paginated(malware_node, size)
+        duration, exported = best_of(
+            rounds, lambda: client.stix2.export_list("Malware")
+        )
+        results[str(size)] = {
+            "objects": len(exported["objects"]),
+            "seconds": duration,
+            "objects_per_second": len(exported["objects"]) / duration,
+        }
+    return results
+
+
+def bench_pagination(
+    server, bundle: str, rounds: int, total: int = 10000, page_size: int = 500
+) -> dict:
+    client = OpenCTIApiClient(server.url, "fake", log_level="error")
+    server.responses["malwares"] = paginated(malware_node, total)
+    duration, nodes = best_of(
+        rounds, lambda: client.malware.list(getAll=True, first=page_size)
+    )
+    return {
+        "objects": len(nodes),
+        "pages": -(-total // page_size),
+        "seconds": duration,
+        "objects_per_second": len(nodes) / duration,
+    }
+
+
+def bench_send_stix2_bundle(server, bundle: str, rounds: int) -> dict:
+    server.responses["registerConnector"] = register_connector
+    helper = OpenCTIConnectorHelper(
+        {
+            "opencti": {"url": server.url, "token": "fake"},
+            "connector": {
+                "id": str(uuid.uuid4()),
+                "type": "EXTERNAL_IMPORT",
+                "name": "benchmark",
+                "scope": "malware",
+                "log_level": "error",
+                "run_and_terminate": True,
+            },
+        }
+    )
+    amqp = FakeAmqpConnection()
+    with patch("pika.BlockingConnection", amqp):
+        duration, bundles = best_of(rounds, lambda: helper.send_stix2_bundle(bundle))
+    return {
+        "messages": len(bundles),
+        "megabytes": amqp.bytes / rounds / 1024 / 1024,
+        "seconds": duration,
+        "messages_per_second": len(bundles) / duration,
+    }
+
+
+def memory_summary() -> dict:
+    """Summarize the memory records of the phases run by a scenario."""
+    phases = {}
+    for record in opencti_memory_profiler.records():
+        summary = phases.setdefault(
+            record["phase"], {"runs": 0, "peak": 0, "growth": 0, "top": []}
+        )
+        summary["runs"] += 1
+        summary["growth"] = max(summary["growth"], record["after"] - record["before"])
+        if record["peak"] >= summary["peak"]:
+            summary["peak"] = record["peak"]
+            summary["top"] = record.get("top", [])
+    return {"peak_rss": opencti_memory_profiler.peak_rss(), "phases": phases}
+
+
+SCENARIOS = {
+    "splitter": bench_splitter,
+    "import_bundle": bench_import_bundle,
+    "export_list": bench_export_list,
+    "pagination": bench_pagination,
+    "send_stix2_bundle": bench_send_stix2_bundle,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="seconds the fake platform waits before each response",
+    )
+    parser.add_argument("--bundle", default=BUNDLE)
+    parser.add_argument("--output", help="write the JSON results to this file")
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="profile the memory of the split, import and export phases",
+    )
+    parser.add_argument(
+        "--max-rss-mb",
+        type=float,
+        default=None,
+        help="fail if the peak RSS of the run is higher than this",
+    )
+    parser.add_argument("scenarios", nargs="*", help=", ".join(SCENARIOS))
+    args = parser.parse_args()
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error("unknown scenario " + name)
+
+    with open(args.bundle, encoding="utf-8") as file:
+        bundle = file.read()
+    results = {
+        "pycti_version": pycti.__version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "rounds": args.rounds,
+        "latency": args.latency,
+        "bundle": os.path.basename(args.bundle),
+        "memory": args.memory,
+        "scenarios": {},
+    }
+    if args.memory:
+        opencti_memory_profiler.enable_memory_profiling(top=5)
+    with FakeOpenCTIServer(latency=args.latency) as server:
+        for name in args.scenarios or SCENARIOS:
+            print("running %s" % name, file=sys.stderr)
+            opencti_memory_profiler.clear_records()
+            result = SCENARIOS[name](server, bundle, args.rounds)
+            if args.memory:
+                result["memory"] = memory_summary()
+            results["scenarios"][name] = result
+    results["peak_rss"] = opencti_memory_profiler.peak_rss()
+
+    output = json.dumps(results, indent=2)
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    print(output)
+    if (
+        args.max_rss_mb is not None
+        and results["peak_rss"] is not None
+        and results["peak_rss"] > args.max_rss_mb * 1024 * 1024
+    ):
+        print("peak RSS is higher than %.0fMB" % args.max_rss_mb, file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
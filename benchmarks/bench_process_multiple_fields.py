@@ -0,0 +1,81 @@
+# coding: utf-8
+"""Benchmark OpenCTIApiClient.process_multiple on synthetic list responses.
+
+Usage: python benchmarks/bench_process_multiple_fields.py [--nodes 100000]
+"""
+import argparse
+import copy
+import time
+
+from pycti import OpenCTIApiClient
+
+
+def build_response(nodes: int) -> dict:
+    edges = []
+    for i in range(nodes):
+        edges.append(
+            {
+                "node": {
+                    "id": "id-" + str(i),
+                    "standard_id": "malware--" + str(i),
+                    "entity_type": "Malware",
+                    "parent_types": ["Basic-Object", "Stix-Domain-Object"],
+                    "name": "Malware " + str(i),
+                    "createdBy": {
+                        "id": "identity-1",
+                        "entity_type": "Organization",
+                        "objectMarking": [],
+                        "objectLabel": [],
+                    },
+                    "objectMarking": [
+                        {
+                            "id": "marking-1",
+                            "entity_type": "Marking-Definition",
+                            "definition": "TLP:CLEAR",
+                        }
+                    ],
+                    "objectLabel": [
+                        {"id": "label-1", "value": "malware", "color": "#ff0000"}
+                    ],
+                    "externalReferences": {
+                        "edges": [
+                            {
+                                "node": {
+                                    "id": "ref-" + str(i),
+                                    "source_name": "mitre-attack",
+                                }
+                            }
+                        ]
+                    },
+                    "killChainPhases": [],
+                }
+            }
+        )
+    return {"edges": edges, "pageInfo": {"hasNextPage": False}}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    client = OpenCTIApiClient(
+        "http://fake:4000", "fake", ssl_verify=False, perform_health_check=False
+    )
+    response = build_response(args.nodes)
+    timings = []
+    for _ in range(args.rounds):
+        data = copy.deepcopy(response)
+        start = time.perf_counter()
+        client.process_multiple(data)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(
+        "process_multiple: %d nodes, best of %d: %.3fs (%.0f nodes/s)"
+        % (args.nodes, args.rounds, best, args.nodes / best)
+    )
+
+
+if __name__ == "__main__":
+    main()
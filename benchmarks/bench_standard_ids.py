@@ -0,0 +1,91 @@
+# coding: utf-8
+"""Benchmark standard id generation on the relationships and external
+references of the MITRE bundle.
+
+Usage: python benchmarks/bench_standard_ids.py [--rounds 5]
+"""
+import argparse
+import json
+import os
+import time
+import uuid
+
+from stix2.canonicalization.Canonicalize import canonicalize
+
+from pycti.utils import opencti_stix2_identifier
+
+BUNDLE = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "data", "mitre_att_capec.json"
+)
+
+
+def load_records() -> list:
+    with open(BUNDLE, encoding="utf-8") as file:
+        bundle = json.load(file)
+    records = []
+    for stix_object in bundle["objects"]:
+        if stix_object["type"] == "relationship":
+            records.append(
+                (
+                    "relationship",
+                    {
+                        "relationship_type": stix_object["relationship_type"],
+                        "source_ref": stix_object["source_ref"],
+                        "target_ref": stix_object["target_ref"],
+                    },
+                )
+            )
+        for external_reference in stix_object.get("external_references") or []:
+            if "url" in external_reference:
+                records.append(
+                    ("external-reference", {"url": external_reference["url"]})
+                )
+    return records
+
+
+def baseline_generate_id(entity_type, data):
+    data = canonicalize(data, utf8=False)
+    id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
+    return entity_type + "--" + id
+
+
+def measure(name, function, records, rounds, setup=None):
+    timings = []
+    for _ in range(rounds):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for entity_type, data in records:
+            function(entity_type, data)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(
+        "%s: %d ids, best of %d: %.3fs (%.0f ids/s)"
+        % (name, len(records), rounds, best, len(records) / best)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    records = load_records()
+    measure("canonicalize + uuid5", baseline_generate_id, records, args.rounds)
+    measure(
+        "generate_standard_id (cold)",
+        opencti_stix2_identifier.generate_standard_id,
+        records,
+        args.rounds,
+        setup=opencti_stix2_identifier.clear_standard_id_cache,
+    )
+    measure(
+        "generate_standard_id (memoized)",
+        opencti_stix2_identifier.generate_standard_id,
+        records,
+        args.rounds,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# coding: utf-8
+"""Offline stand-ins of the OpenCTI platform used by the benchmarks.
+
+:py:class:`FakeOpenCTIServer` is a local GraphQL/HTTP server answering every
+query with a canned response after a configurable latency, and
+:py:class:`FakeAmqpConnection` replaces ``pika.BlockingConnection`` to count
+the published messages without a RabbitMQ broker.
+"""
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+
+ROOT_FIELD = re.compile(r"\{\s*(\w+)")
+MULTIPART_OPERATIONS = re.compile(
+    rb'name="operations"\r\n(?:[^\r\n]+\r\n)*\r\n(.*?)\r\n--', re.DOTALL
+)
+
+
+def generic_entity(variables: Optional[Dict]) -> Dict:
+    """Canned entity returned by queries without a registered response."""
+    entity_id = str(uuid.uuid4())
+    entity = {
+        "id": entity_id,
+        "standard_id": "x-opencti-fake--" + entity_id,
+        "entity_type": "Stix-Domain-Object",
+        "parent_types": [],
+    }
+    data = (variables or {}).get("input")
+    if isinstance(data, dict) and data.get("stix_id"):
+        entity["standard_id"] = data["stix_id"]
+    return entity
+
+
+def paginated(node: Callable[[int], Dict], total: int) -> Callable[[Dict], Dict]:
+    """Canned response of a list query returning `total` nodes by pages.
+
+    :param node: builds the node at a given index
+    :param total: number of nodes of the list
+    :return: the response, paginated with the ``first`` and ``after`` variables
+    """
+
+    def response(variables: Dict) -> Dict:
+        offset = int(variables.get("after") or 0)
+        end = min(offset + int(variables.get("first") or 500), total)
+        return {
+            "edges": [
+                {"node": node(index), "cursor": str(index)}
+                for index in range(offset, end)
+            ],
+            "pageInfo": {
+                "startCursor": str(offset),
+                "endCursor": str(end),
+                "hasNextPage": end < total,
+                "globalCount": total,
+            },
+        }
+
+    return response
+
+
+class FakeOpenCTIServer:
+    """Local GraphQL server answering with canned responses.
+
+    Responses are looked up by root field name (``reportAdd``, ``reports``,
+    ...) in :py:attr:`responses`, a callable receiving the query variables
+    and returning the field value. Other fields get a generic entity.
+
+    :param latency: seconds to wait before answering each request
+    :type latency: float
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.responses: Dict[str, Callable[[Dict], object]] = {
+            "about": lambda variables: {"version": "6.7.0"},
+            "me": lambda variables: {
+                "id": str(uuid.uuid4()),
+                "name": "benchmark",
+                "user_email": "benchmark@opencti.io",
+                "capabilities": [{"name": "BYPASS"}],
+            },
+            "settings": lambda variables: {
+                "id": str(uuid.uuid4()),
+                "platform_enterprise_edition": {"license_validated": False},
+            },
+        }
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return "http://127.0.0.1:%d" % self._server.server_address[1]
+
+    def respond(self, query: str, variables: Optional[Dict]) -> Dict:
+        with self._lock:
+            self.requests += 1
+        match = ROOT_FIELD.search(query)
+        field = match.group(1) if match is not None else "data"
+        response = self.responses.get(field, generic_entity)
+        return {"data": {field: response(variables or {})}}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.headers.get("Content-Type", "").startswith("multipart"):
+                    body = MULTIPART_OPERATIONS.search(body).group(1)
+                payload = json.loads(body)
+                if server.latency > 0:
+                    time.sleep(server.latency)
+                content = json.dumps(
+                    server.respond(payload["query"], payload.get("variables"))
+                ).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "FakeOpenCTIServer":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self) -> "FakeOpenCTIServer":
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+class FakeAmqpChannel:
+    """Channel of :py:class:`FakeAmqpConnection`, counting published messages."""
+
+    def __init__(self, connection: "FakeAmqpConnection"):
+        self.connection = connection
+
+    def confirm_delivery(self):
+        pass
+
+    def basic_publish(self, exchange, routing_key, body, properties=None, **kwargs):
+        self.connection.messages += 1
+        self.connection.bytes += len(body)
+
+    def close(self):
+        pass
+
+
+class FakeAmqpConnection:
+    """In-process replacement of ``pika.BlockingConnection``.
+
+    Use an instance as the connection factory, every connection opened
+    through it adds to the same counters::
+
+        amqp = FakeAmqpConnection()
+        with unittest.mock.patch("pika.BlockingConnection", amqp):
+            helper.send_stix2_bundle(bundle)
+        amqp.messages
+    """
+
+    def __init__(self):
+        self.messages = 0
+        self.bytes = 0
+
+    def __call__(self, parameters=None) -> "FakeAmqpConnection":
+        return self
+
+    def channel(self) -> FakeAmqpChannel:
+        return FakeAmqpChannel(self)
+
+    def sleep(self, duration: float):
+        pass
+
+    def close(self):
+        pass
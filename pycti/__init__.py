@@ -1,92 +1,203 @@
 # -*- coding: utf-8 -*-
 __version__ = "6.8.10"
 
-from .api.opencti_api_client import OpenCTIApiClient
-from .api.opencti_api_connector import OpenCTIApiConnector
-from .api.opencti_api_work import OpenCTIApiWork
-from .connector.opencti_connector import ConnectorType, OpenCTIConnector
-from .connector.opencti_connector_helper import (
-    OpenCTIConnectorHelper,
-    get_config_variable,
-)
-from .connector.opencti_metric_handler import OpenCTIMetricHandler
-from .entities.opencti_attack_pattern import AttackPattern
-from .entities.opencti_campaign import Campaign
+import importlib
+from typing import TYPE_CHECKING
+
+# Registers the OpenCTI custom STIX objects and observables in stix2, which
+# connectors rely on as soon as pycti is imported
+from .utils import constants as _constants  # noqa: F401
+
+if TYPE_CHECKING:
+    from .api.opencti_api_client import OpenCTIApiClient
+    from .api.opencti_api_connector import OpenCTIApiConnector
+    from .api.opencti_api_work import OpenCTIApiWork
+    from .connector.opencti_connector import ConnectorType, OpenCTIConnector
+    from .connector.opencti_connector_helper import (
+        OpenCTIConnectorHelper,
+        get_config_variable,
+    )
+    from .connector.opencti_metric_handler import OpenCTIMetricHandler
+    from .entities.opencti_attack_pattern import AttackPattern
+    from .entities.opencti_campaign import Campaign
+
+    # Administrative entities
+    from .entities.opencti_capability import Capability
+    from .entities.opencti_case_incident import CaseIncident
+    from .entities.opencti_case_rfi import CaseRfi
+    from .entities.opencti_case_rft import CaseRft
+    from .entities.opencti_channel import Channel
+    from .entities.opencti_course_of_action import CourseOfAction
+    from .entities.opencti_data_component import DataComponent
+    from .entities.opencti_data_source import DataSource
+    from .entities.opencti_external_reference import ExternalReference
+    from .entities.opencti_feedback import Feedback
+    from .entities.opencti_group import Group
+    from .entities.opencti_grouping import Grouping
+    from .entities.opencti_identity import Identity
+    from .entities.opencti_incident import Incident
+    from .entities.opencti_indicator import Indicator
+    from .entities.opencti_infrastructure import Infrastructure
+    from .entities.opencti_intrusion_set import IntrusionSet
+    from .entities.opencti_kill_chain_phase import KillChainPhase
+    from .entities.opencti_label import Label
+    from .entities.opencti_location import Location
+    from .entities.opencti_malware import Malware
+    from .entities.opencti_malware_analysis import MalwareAnalysis
+    from .entities.opencti_marking_definition import MarkingDefinition
+    from .entities.opencti_note import Note
+    from .entities.opencti_observed_data import ObservedData
+    from .entities.opencti_opinion import Opinion
+    from .entities.opencti_report import Report
+    from .entities.opencti_role import Role
+    from .entities.opencti_settings import Settings
+    from .entities.opencti_stix_core_relationship import StixCoreRelationship
+    from .entities.opencti_stix_cyber_observable import StixCyberObservable
+    from .entities.opencti_stix_domain_object import StixDomainObject
+    from .entities.opencti_stix_nested_ref_relationship import StixNestedRefRelationship
+    from .entities.opencti_stix_object_or_stix_relationship import (
+        StixObjectOrStixRelationship,
+    )
+    from .entities.opencti_stix_sighting_relationship import StixSightingRelationship
+    from .entities.opencti_task import Task
+    from .entities.opencti_threat_actor import ThreatActor
+    from .entities.opencti_threat_actor_group import ThreatActorGroup
+    from .entities.opencti_threat_actor_individual import ThreatActorIndividual
+    from .entities.opencti_tool import Tool
+    from .entities.opencti_user import User
+    from .entities.opencti_vulnerability import Vulnerability
+    from .utils.constants import (
+        CustomObjectCaseIncident,
+        CustomObjectChannel,
+        CustomObjectTask,
+        CustomObservableBankAccount,
+        CustomObservableCredential,
+        CustomObservableCryptocurrencyWallet,
+        CustomObservableCryptographicKey,
+        CustomObservableHostname,
+        CustomObservableMediaContent,
+        CustomObservablePaymentCard,
+        CustomObservablePersona,
+        CustomObservablePhoneNumber,
+        CustomObservableText,
+        CustomObservableTrackingNumber,
+        CustomObservableUserAgent,
+        MultipleRefRelationship,
+        StixCyberObservableTypes,
+        StixMetaTypes,
+    )
+    from .utils.opencti_stix2 import OpenCTIStix2
+    from .utils.opencti_stix2_export_session import OpenCTIStix2ExportSession
+    from .utils.opencti_stix2_extensions import (
+        STIX_EXT_MITRE,
+        STIX_EXT_OCTI,
+        STIX_EXT_OCTI_SCO,
+    )
+    from .utils.opencti_stix2_import_stats import OpenCTIStix2ImportStats
+    from .utils.opencti_stix2_splitter import OpenCTIStix2Splitter
+    from .utils.opencti_stix2_update import OpenCTIStix2Update
+    from .utils.opencti_stix2_utils import OpenCTIStix2Utils
+
+# Public names and the module defining them. Modules are imported on first
+# access (PEP 562) so that "import pycti" does not load the connector stack
+# (FastAPI, uvicorn, pika, prometheus...) or the STIX2 library up front.
+_LAZY_ATTRIBUTES = {
+    "OpenCTIApiClient": ".api.opencti_api_client",
+    "OpenCTIApiConnector": ".api.opencti_api_connector",
+    "OpenCTIApiWork": ".api.opencti_api_work",
+    "ConnectorType": ".connector.opencti_connector",
+    "OpenCTIConnector": ".connector.opencti_connector",
+    "OpenCTIConnectorHelper": ".connector.opencti_connector_helper",
+    "get_config_variable": ".connector.opencti_connector_helper",
+    "OpenCTIMetricHandler": ".connector.opencti_metric_handler",
+    "AttackPattern": ".entities.opencti_attack_pattern",
+    "Campaign": ".entities.opencti_campaign",
+    "Capability": ".entities.opencti_capability",
+    "CaseIncident": ".entities.opencti_case_incident",
+    "CaseRfi": ".entities.opencti_case_rfi",
+    "CaseRft": ".entities.opencti_case_rft",
+    "Channel": ".entities.opencti_channel",
+    "CourseOfAction": ".entities.opencti_course_of_action",
+    "DataComponent": ".entities.opencti_data_component",
+    "DataSource": ".entities.opencti_data_source",
+    "ExternalReference": ".entities.opencti_external_reference",
+    "Feedback": ".entities.opencti_feedback",
+    "Group": ".entities.opencti_group",
+    "Grouping": ".entities.opencti_grouping",
+    "Identity": ".entities.opencti_identity",
+    "Incident": ".entities.opencti_incident",
+    "Indicator": ".entities.opencti_indicator",
+    "Infrastructure": ".entities.opencti_infrastructure",
+    "IntrusionSet": ".entities.opencti_intrusion_set",
+    "KillChainPhase": ".entities.opencti_kill_chain_phase",
+    "Label": ".entities.opencti_label",
+    "Location": ".entities.opencti_location",
+    "Malware": ".entities.opencti_malware",
+    "MalwareAnalysis": ".entities.opencti_malware_analysis",
+    "MarkingDefinition": ".entities.opencti_marking_definition",
+    "Note": ".entities.opencti_note",
+    "ObservedData": ".entities.opencti_observed_data",
+    "Opinion": ".entities.opencti_opinion",
+    "Report": ".entities.opencti_report",
+    "Role": ".entities.opencti_role",
+    "Settings": ".entities.opencti_settings",
+    "StixCoreRelationship": ".entities.opencti_stix_core_relationship",
+    "StixCyberObservable": ".entities.opencti_stix_cyber_observable",
+    "StixDomainObject": ".entities.opencti_stix_domain_object",
+    "StixNestedRefRelationship": ".entities.opencti_stix_nested_ref_relationship",
+    "StixObjectOrStixRelationship": ".entities.opencti_stix_object_or_stix_relationship",
+    "StixSightingRelationship": ".entities.opencti_stix_sighting_relationship",
+    "Task": ".entities.opencti_task",
+    "ThreatActor": ".entities.opencti_threat_actor",
+    "ThreatActorGroup": ".entities.opencti_threat_actor_group",
+    "ThreatActorIndividual": ".entities.opencti_threat_actor_individual",
+    "Tool": ".entities.opencti_tool",
+    "User": ".entities.opencti_user",
+    "Vulnerability": ".entities.opencti_vulnerability",
+    "CustomObjectCaseIncident": ".utils.constants",
+    "CustomObjectChannel": ".utils.constants",
+    "CustomObjectTask": ".utils.constants",
+    "CustomObservableBankAccount": ".utils.constants",
+    "CustomObservableCredential": ".utils.constants",
+    "CustomObservableCryptocurrencyWallet": ".utils.constants",
+    "CustomObservableCryptographicKey": ".utils.constants",
+    "CustomObservableHostname": ".utils.constants",
+    "CustomObservableMediaContent": ".utils.constants",
+    "CustomObservablePaymentCard": ".utils.constants",
+    "CustomObservablePersona": ".utils.constants",
+    "CustomObservablePhoneNumber": ".utils.constants",
+    "CustomObservableText": ".utils.constants",
+    "CustomObservableTrackingNumber": ".utils.constants",
+    "CustomObservableUserAgent": ".utils.constants",
+    "MultipleRefRelationship": ".utils.constants",
+    "StixCyberObservableTypes": ".utils.constants",
+    "StixMetaTypes": ".utils.constants",
+    "STIX_EXT_MITRE": ".utils.opencti_stix2_extensions",
+    "STIX_EXT_OCTI": ".utils.opencti_stix2_extensions",
+    "STIX_EXT_OCTI_SCO": ".utils.opencti_stix2_extensions",
+    "OpenCTIStix2": ".utils.opencti_stix2",
+    "OpenCTIStix2ExportSession": ".utils.opencti_stix2_export_session",
+    "OpenCTIStix2ImportStats": ".utils.opencti_stix2_import_stats",
+    "OpenCTIStix2Splitter": ".utils.opencti_stix2_splitter",
+    "OpenCTIStix2Update": ".utils.opencti_stix2_update",
+    "OpenCTIStix2Utils": ".utils.opencti_stix2_utils",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(
+            "module " + repr(__name__) + " has no attribute " + repr(name)
+        )
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
 
-# Administrative entities
-from .entities.opencti_capability import Capability
-from .entities.opencti_case_incident import CaseIncident
-from .entities.opencti_case_rfi import CaseRfi
-from .entities.opencti_case_rft import CaseRft
-from .entities.opencti_channel import Channel
-from .entities.opencti_course_of_action import CourseOfAction
-from .entities.opencti_data_component import DataComponent
-from .entities.opencti_data_source import DataSource
-from .entities.opencti_external_reference import ExternalReference
-from .entities.opencti_feedback import Feedback
-from .entities.opencti_group import Group
-from .entities.opencti_grouping import Grouping
-from .entities.opencti_identity import Identity
-from .entities.opencti_incident import Incident
-from .entities.opencti_indicator import Indicator
-from .entities.opencti_infrastructure import Infrastructure
-from .entities.opencti_intrusion_set import IntrusionSet
-from .entities.opencti_kill_chain_phase import KillChainPhase
-from .entities.opencti_label import Label
-from .entities.opencti_location import Location
-from .entities.opencti_malware import Malware
-from .entities.opencti_malware_analysis import MalwareAnalysis
-from .entities.opencti_marking_definition import MarkingDefinition
-from .entities.opencti_note import Note
-from .entities.opencti_observed_data import ObservedData
-from .entities.opencti_opinion import Opinion
-from .entities.opencti_report import Report
-from .entities.opencti_role import Role
-from .entities.opencti_settings import Settings
-from .entities.opencti_stix_core_relationship import StixCoreRelationship
-from .entities.opencti_stix_cyber_observable import StixCyberObservable
-from .entities.opencti_stix_domain_object import StixDomainObject
-from .entities.opencti_stix_nested_ref_relationship import StixNestedRefRelationship
-from .entities.opencti_stix_object_or_stix_relationship import (
-    StixObjectOrStixRelationship,
-)
-from .entities.opencti_stix_sighting_relationship import StixSightingRelationship
-from .entities.opencti_task import Task
-from .entities.opencti_threat_actor import ThreatActor
-from .entities.opencti_threat_actor_group import ThreatActorGroup
-from .entities.opencti_threat_actor_individual import ThreatActorIndividual
-from .entities.opencti_tool import Tool
-from .entities.opencti_user import User
-from .entities.opencti_vulnerability import Vulnerability
-from .utils.constants import (
-    CustomObjectCaseIncident,
-    CustomObjectChannel,
-    CustomObjectTask,
-    CustomObservableBankAccount,
-    CustomObservableCredential,
-    CustomObservableCryptocurrencyWallet,
-    CustomObservableCryptographicKey,
-    CustomObservableHostname,
-    CustomObservableMediaContent,
-    CustomObservablePaymentCard,
-    CustomObservablePersona,
-    CustomObservablePhoneNumber,
-    CustomObservableText,
-    CustomObservableTrackingNumber,
-    CustomObservableUserAgent,
-    MultipleRefRelationship,
-    StixCyberObservableTypes,
-    StixMetaTypes,
-)
-from .utils.opencti_stix2 import (
-    STIX_EXT_MITRE,
-    STIX_EXT_OCTI,
-    STIX_EXT_OCTI_SCO,
-    OpenCTIStix2,
-)
-from .utils.opencti_stix2_splitter import OpenCTIStix2Splitter
-from .utils.opencti_stix2_update import OpenCTIStix2Update
-from .utils.opencti_stix2_utils import OpenCTIStix2Utils
 
 __all__ = [
     "AttackPattern",
@@ -123,6 +234,8 @@ __all__ = [
     "OpenCTIConnectorHelper",
     "OpenCTIMetricHandler",
     "OpenCTIStix2",
+    "OpenCTIStix2ExportSession",
+    "OpenCTIStix2ImportStats",
     "OpenCTIStix2Splitter",
     "OpenCTIStix2Update",
     "OpenCTIStix2Utils",
@@ -1,82 +1,17 @@
 # coding: utf-8
 import base64
 import datetime
+import importlib
 import io
 import json
+import threading
 from typing import Dict, Tuple, Union
 
-import magic
 import requests
 
 from pycti import __version__
-from pycti.api.opencti_api_connector import OpenCTIApiConnector
-from pycti.api.opencti_api_draft import OpenCTIApiDraft
-from pycti.api.opencti_api_internal_file import OpenCTIApiInternalFile
-from pycti.api.opencti_api_notification import OpenCTIApiNotification
-from pycti.api.opencti_api_pir import OpenCTIApiPir
-from pycti.api.opencti_api_playbook import OpenCTIApiPlaybook
-from pycti.api.opencti_api_public_dashboard import OpenCTIApiPublicDashboard
-from pycti.api.opencti_api_trash import OpenCTIApiTrash
-from pycti.api.opencti_api_work import OpenCTIApiWork
-from pycti.api.opencti_api_workspace import OpenCTIApiWorkspace
-from pycti.entities.opencti_attack_pattern import AttackPattern
-from pycti.entities.opencti_campaign import Campaign
-from pycti.entities.opencti_capability import Capability
-from pycti.entities.opencti_case_incident import CaseIncident
-from pycti.entities.opencti_case_rfi import CaseRfi
-from pycti.entities.opencti_case_rft import CaseRft
-from pycti.entities.opencti_channel import Channel
-from pycti.entities.opencti_course_of_action import CourseOfAction
-from pycti.entities.opencti_data_component import DataComponent
-from pycti.entities.opencti_data_source import DataSource
-from pycti.entities.opencti_event import Event
-from pycti.entities.opencti_external_reference import ExternalReference
-from pycti.entities.opencti_feedback import Feedback
-from pycti.entities.opencti_group import Group
-from pycti.entities.opencti_grouping import Grouping
-from pycti.entities.opencti_identity import Identity
-from pycti.entities.opencti_incident import Incident
-from pycti.entities.opencti_indicator import Indicator
-from pycti.entities.opencti_infrastructure import Infrastructure
-from pycti.entities.opencti_intrusion_set import IntrusionSet
-from pycti.entities.opencti_kill_chain_phase import KillChainPhase
-from pycti.entities.opencti_label import Label
-from pycti.entities.opencti_language import Language
-from pycti.entities.opencti_location import Location
-from pycti.entities.opencti_malware import Malware
-from pycti.entities.opencti_malware_analysis import MalwareAnalysis
-from pycti.entities.opencti_marking_definition import MarkingDefinition
-from pycti.entities.opencti_narrative import Narrative
-from pycti.entities.opencti_note import Note
-from pycti.entities.opencti_observed_data import ObservedData
-from pycti.entities.opencti_opinion import Opinion
-from pycti.entities.opencti_report import Report
-from pycti.entities.opencti_role import Role
-from pycti.entities.opencti_security_coverage import SecurityCoverage
-from pycti.entities.opencti_settings import Settings
-from pycti.entities.opencti_stix import Stix
-from pycti.entities.opencti_stix_core_object import StixCoreObject
-from pycti.entities.opencti_stix_core_relationship import StixCoreRelationship
-from pycti.entities.opencti_stix_cyber_observable import StixCyberObservable
-from pycti.entities.opencti_stix_domain_object import StixDomainObject
-from pycti.entities.opencti_stix_nested_ref_relationship import (
-    StixNestedRefRelationship,
-)
-from pycti.entities.opencti_stix_object_or_stix_relationship import (
-    StixObjectOrStixRelationship,
-)
-from pycti.entities.opencti_stix_sighting_relationship import StixSightingRelationship
-from pycti.entities.opencti_task import Task
-from pycti.entities.opencti_threat_actor import ThreatActor
-from pycti.entities.opencti_threat_actor_group import ThreatActorGroup
-from pycti.entities.opencti_threat_actor_individual import ThreatActorIndividual
-from pycti.entities.opencti_tool import Tool
-from pycti.entities.opencti_user import User
-from pycti.entities.opencti_vocabulary import Vocabulary
-from pycti.entities.opencti_vulnerability import Vulnerability
+from pycti.utils import opencti_json, opencti_tracing
 from pycti.utils.opencti_logger import logger
-from pycti.utils.opencti_stix2 import OpenCTIStix2
-from pycti.utils.opencti_stix2_utils import OpenCTIStix2Utils
 
 
 def build_request_headers(token: str, custom_headers: str, app_logger):
@@ -105,6 +40,42 @@ class File:
         self.mime = mime
 
 
+class LazyDependency:
+    """Client attribute whose module is imported and class instantiated on
+    first access, then kept on the client instance.
+
+    :param module_name: module defining the class
+    :type module_name: str
+    :param class_name: class instantiated with the client
+    :type class_name: str
+    :param with_file: also give the :py:class:`File` class to the constructor
+    :type with_file: bool
+    """
+
+    _lock = threading.RLock()
+
+    def __init__(self, module_name: str, class_name: str, with_file: bool = False):
+        self.module_name = module_name
+        self.class_name = class_name
+        self.with_file = with_file
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        with self._lock:
+            # Another thread may have built it while waiting for the lock
+            if self.name in instance.__dict__:
+                return instance.__dict__[self.name]
+            cls = getattr(importlib.import_module(self.module_name), self.class_name)
+            value = cls(instance, File) if self.with_file else cls(instance)
+            instance.__dict__[self.name] = value
+        return value
+
+
 class OpenCTIApiClient:
     """Main API client for OpenCTI
 
@@ -134,8 +105,134 @@ class OpenCTIApiClient:
     :type custom_headers: str, optional must in the format header01:value;header02:value
     :param perform_health_check: if client init must check the api access
     :type perform_health_check: bool, optional
+    :param log_rate_limit: if set, log at most this number of identical messages per minute
+    :type log_rate_limit: int, optional
+    :param async_logging: write the logs from a background thread so logging never blocks
+    :type async_logging: bool, optional
     """
 
+    # Define the dependencies
+    work = LazyDependency("pycti.api.opencti_api_work", "OpenCTIApiWork")
+    notification = LazyDependency(
+        "pycti.api.opencti_api_notification", "OpenCTIApiNotification"
+    )
+    trash = LazyDependency("pycti.api.opencti_api_trash", "OpenCTIApiTrash")
+    draft = LazyDependency("pycti.api.opencti_api_draft", "OpenCTIApiDraft")
+    workspace = LazyDependency("pycti.api.opencti_api_workspace", "OpenCTIApiWorkspace")
+    public_dashboard = LazyDependency(
+        "pycti.api.opencti_api_public_dashboard", "OpenCTIApiPublicDashboard"
+    )
+    playbook = LazyDependency("pycti.api.opencti_api_playbook", "OpenCTIApiPlaybook")
+    connector = LazyDependency("pycti.api.opencti_api_connector", "OpenCTIApiConnector")
+    stix2 = LazyDependency("pycti.utils.opencti_stix2", "OpenCTIStix2")
+    pir = LazyDependency("pycti.api.opencti_api_pir", "OpenCTIApiPir")
+    internal_file = LazyDependency(
+        "pycti.api.opencti_api_internal_file", "OpenCTIApiInternalFile"
+    )
+
+    # Define the entities
+    vocabulary = LazyDependency("pycti.entities.opencti_vocabulary", "Vocabulary")
+    label = LazyDependency("pycti.entities.opencti_label", "Label")
+    marking_definition = LazyDependency(
+        "pycti.entities.opencti_marking_definition", "MarkingDefinition"
+    )
+    external_reference = LazyDependency(
+        "pycti.entities.opencti_external_reference", "ExternalReference", with_file=True
+    )
+    kill_chain_phase = LazyDependency(
+        "pycti.entities.opencti_kill_chain_phase", "KillChainPhase"
+    )
+    opencti_stix_object_or_stix_relationship = LazyDependency(
+        "pycti.entities.opencti_stix_object_or_stix_relationship",
+        "StixObjectOrStixRelationship",
+    )
+    stix = LazyDependency("pycti.entities.opencti_stix", "Stix")
+    stix_domain_object = LazyDependency(
+        "pycti.entities.opencti_stix_domain_object", "StixDomainObject", with_file=True
+    )
+    stix_core_object = LazyDependency(
+        "pycti.entities.opencti_stix_core_object", "StixCoreObject", with_file=True
+    )
+    stix_cyber_observable = LazyDependency(
+        "pycti.entities.opencti_stix_cyber_observable",
+        "StixCyberObservable",
+        with_file=True,
+    )
+    stix_core_relationship = LazyDependency(
+        "pycti.entities.opencti_stix_core_relationship", "StixCoreRelationship"
+    )
+    stix_sighting_relationship = LazyDependency(
+        "pycti.entities.opencti_stix_sighting_relationship", "StixSightingRelationship"
+    )
+    stix_nested_ref_relationship = LazyDependency(
+        "pycti.entities.opencti_stix_nested_ref_relationship",
+        "StixNestedRefRelationship",
+    )
+    identity = LazyDependency("pycti.entities.opencti_identity", "Identity")
+    event = LazyDependency("pycti.entities.opencti_event", "Event")
+    location = LazyDependency("pycti.entities.opencti_location", "Location")
+    threat_actor = LazyDependency("pycti.entities.opencti_threat_actor", "ThreatActor")
+    threat_actor_group = LazyDependency(
+        "pycti.entities.opencti_threat_actor_group", "ThreatActorGroup"
+    )
+    threat_actor_individual = LazyDependency(
+        "pycti.entities.opencti_threat_actor_individual", "ThreatActorIndividual"
+    )
+    intrusion_set = LazyDependency(
+        "pycti.entities.opencti_intrusion_set", "IntrusionSet"
+    )
+    infrastructure = LazyDependency(
+        "pycti.entities.opencti_infrastructure", "Infrastructure"
+    )
+    campaign = LazyDependency("pycti.entities.opencti_campaign", "Campaign")
+    case_incident = LazyDependency(
+        "pycti.entities.opencti_case_incident", "CaseIncident"
+    )
+    feedback = LazyDependency("pycti.entities.opencti_feedback", "Feedback")
+    case_rfi = LazyDependency("pycti.entities.opencti_case_rfi", "CaseRfi")
+    case_rft = LazyDependency("pycti.entities.opencti_case_rft", "CaseRft")
+    task = LazyDependency("pycti.entities.opencti_task", "Task")
+    incident = LazyDependency("pycti.entities.opencti_incident", "Incident")
+    malware = LazyDependency("pycti.entities.opencti_malware", "Malware")
+    malware_analysis = LazyDependency(
+        "pycti.entities.opencti_malware_analysis", "MalwareAnalysis"
+    )
+    tool = LazyDependency("pycti.entities.opencti_tool", "Tool")
+    channel = LazyDependency("pycti.entities.opencti_channel", "Channel")
+    narrative = LazyDependency("pycti.entities.opencti_narrative", "Narrative")
+    language = LazyDependency("pycti.entities.opencti_language", "Language")
+    vulnerability = LazyDependency(
+        "pycti.entities.opencti_vulnerability", "Vulnerability"
+    )
+    security_coverage = LazyDependency(
+        "pycti.entities.opencti_security_coverage", "SecurityCoverage"
+    )
+    attack_pattern = LazyDependency(
+        "pycti.entities.opencti_attack_pattern", "AttackPattern"
+    )
+    course_of_action = LazyDependency(
+        "pycti.entities.opencti_course_of_action", "CourseOfAction"
+    )
+    data_component = LazyDependency(
+        "pycti.entities.opencti_data_component", "DataComponent"
+    )
+    data_source = LazyDependency("pycti.entities.opencti_data_source", "DataSource")
+    report = LazyDependency("pycti.entities.opencti_report", "Report")
+    note = LazyDependency("pycti.entities.opencti_note", "Note")
+    observed_data = LazyDependency(
+        "pycti.entities.opencti_observed_data", "ObservedData"
+    )
+    opinion = LazyDependency("pycti.entities.opencti_opinion", "Opinion")
+    grouping = LazyDependency("pycti.entities.opencti_grouping", "Grouping")
+    indicator = LazyDependency("pycti.entities.opencti_indicator", "Indicator")
+
+    # Admin functionality
+    capability = LazyDependency("pycti.entities.opencti_capability", "Capability")
+    role = LazyDependency("pycti.entities.opencti_role", "Role")
+    group = LazyDependency("pycti.entities.opencti_group", "Group")
+    user = LazyDependency("pycti.entities.opencti_user", "User")
+    settings = LazyDependency("pycti.entities.opencti_settings", "Settings")
+
     def __init__(
         self,
         url: str,
@@ -148,6 +245,8 @@ class OpenCTIApiClient:
         cert: Union[str, Tuple[str, str], None] = None,
         custom_headers: str = None,
         perform_health_check: bool = True,
+        log_rate_limit: int = 0,
+        async_logging: bool = False,
     ):
         """Constructor method"""
 
@@ -162,10 +261,15 @@ class OpenCTIApiClient:
             raise ValueError("A TOKEN must be set")
 
         # Configure logger
-        self.logger_class = logger(log_level.upper(), json_logging)
+        self.logger_class = logger(
+            log_level.upper(), json_logging, log_rate_limit, async_logging
+        )
         self.app_logger = self.logger_class("api")
         self.admin_logger = self.logger_class("admin")
 
+        # Entity classes customizing process_multiple_fields, by entity type
+        self._fields_dispatch = {}
+
         # Define API
         self.api_token = token
         self.api_url = url + "/graphql"
@@ -173,76 +277,8 @@ class OpenCTIApiClient:
             token, custom_headers, self.app_logger
         )
         self.session = requests.session()
-        # Define the dependencies
-        self.work = OpenCTIApiWork(self)
-        self.notification = OpenCTIApiNotification(self)
-        self.trash = OpenCTIApiTrash(self)
-        self.draft = OpenCTIApiDraft(self)
-        self.workspace = OpenCTIApiWorkspace(self)
-        self.public_dashboard = OpenCTIApiPublicDashboard(self)
-        self.playbook = OpenCTIApiPlaybook(self)
-        self.connector = OpenCTIApiConnector(self)
-        self.stix2 = OpenCTIStix2(self)
-        self.pir = OpenCTIApiPir(self)
-        self.internal_file = OpenCTIApiInternalFile(self)
-
-        # Define the entities
-        self.vocabulary = Vocabulary(self)
-        self.label = Label(self)
-        self.marking_definition = MarkingDefinition(self)
-        self.external_reference = ExternalReference(self, File)
-        self.kill_chain_phase = KillChainPhase(self)
-        self.opencti_stix_object_or_stix_relationship = StixObjectOrStixRelationship(
-            self
-        )
-        self.stix = Stix(self)
-        self.stix_domain_object = StixDomainObject(self, File)
-        self.stix_core_object = StixCoreObject(self, File)
-        self.stix_cyber_observable = StixCyberObservable(self, File)
-        self.stix_core_relationship = StixCoreRelationship(self)
-        self.stix_sighting_relationship = StixSightingRelationship(self)
-        self.stix_nested_ref_relationship = StixNestedRefRelationship(self)
-        self.identity = Identity(self)
-        self.event = Event(self)
-        self.location = Location(self)
-        self.threat_actor = ThreatActor(self)
-        self.threat_actor_group = ThreatActorGroup(self)
-        self.threat_actor_individual = ThreatActorIndividual(self)
-        self.intrusion_set = IntrusionSet(self)
-        self.infrastructure = Infrastructure(self)
-        self.campaign = Campaign(self)
-        self.case_incident = CaseIncident(self)
-        self.feedback = Feedback(self)
-        self.case_rfi = CaseRfi(self)
-        self.case_rft = CaseRft(self)
-        self.task = Task(self)
-        self.incident = Incident(self)
-        self.malware = Malware(self)
-        self.malware_analysis = MalwareAnalysis(self)
-        self.tool = Tool(self)
-        self.channel = Channel(self)
-        self.narrative = Narrative(self)
-        self.language = Language(self)
-        self.vulnerability = Vulnerability(self)
-        self.security_coverage = SecurityCoverage(self)
-        self.attack_pattern = AttackPattern(self)
-        self.course_of_action = CourseOfAction(self)
-        self.data_component = DataComponent(self)
-        self.data_source = DataSource(self)
-        self.report = Report(self)
-        self.note = Note(self)
-        self.observed_data = ObservedData(self)
-        self.opinion = Opinion(self)
-        self.grouping = Grouping(self)
-        self.indicator = Indicator(self)
-
-        # Admin functionality
-        self.capability = Capability(self)
-        self.role = Role(self)
-        self.group = Group(self)
-        self.user = User(self)
-        self.settings = Settings(self)
-
+        # Set with enable_query_metrics
+        self.query_metrics = None
         # Check if openCTI is available
         if perform_health_check and not self.health_check():
             raise ValueError(
@@ -292,6 +328,36 @@ class OpenCTIApiClient:
         :return: returns the response json content
         :rtype: Any
         """
+        if opencti_tracing.is_enabled():
+            from pycti.api.opencti_api_metrics import operation_name
+
+            with opencti_tracing.span(
+                "opencti.api.query", {"graphql.operation.name": operation_name(query)}
+            ):
+                return self._run_query(query, variables, disable_impersonate)
+        return self._run_query(query, variables, disable_impersonate)
+
+    def _run_query(self, query, variables, disable_impersonate):
+        if self.query_metrics is not None:
+            return self.query_metrics.observe(
+                self, query, variables, disable_impersonate
+            )
+        return self._read_query_response(
+            self._send_query(query, variables, disable_impersonate)
+        )
+
+    def enable_query_metrics(self, metric_handler=None):
+        """Record the latency, payload sizes, retries and errors of the queries
+        by operation name.
+
+        :param metric_handler: also count the queries and errors in this
+            :py:class:`~pycti.connector.opencti_metric_handler.OpenCTIMetricHandler`
+        """
+        from pycti.api.opencti_api_metrics import OpenCTIApiQueryMetrics
+
+        self.query_metrics = OpenCTIApiQueryMetrics(metric_handler)
+
+    def _send_query(self, query, variables=None, disable_impersonate=False):
         variables = variables or {}
         query_var = {}
         files_vars = []
@@ -316,10 +382,13 @@ class OpenCTIApiClient:
         query_headers = self.request_headers.copy()
         if disable_impersonate and "opencti-applicant-id" in query_headers:
             del query_headers["opencti-applicant-id"]
+        opencti_tracing.inject(query_headers)
         # If yes, transform variable (file to null) and create multipart query
         if len(files_vars) > 0:
             multipart_data = {
-                "operations": json.dumps({"query": query, "variables": query_var})
+                "operations": opencti_json.dumps(
+                    {"query": query, "variables": query_var}
+                )
             }
             # Build the multipart map
             map_index = 0
@@ -390,18 +459,21 @@ class OpenCTIApiClient:
             )
         # If no
         else:
+            query_headers["Content-Type"] = "application/json"
             r = self.session.post(
                 self.api_url,
-                json={"query": query, "variables": variables},
+                data=opencti_json.dumps_bytes({"query": query, "variables": variables}),
                 headers=query_headers,
                 verify=self.ssl_verify,
                 cert=self.cert,
                 proxies=self.proxies,
                 timeout=300,
             )
-        # Build response
+        return r
+
+    def _read_query_response(self, r):
         if r.status_code == 200:
-            result = r.json()
+            result = opencti_json.loads(r.content)
             if "errors" in result:
                 main_error = result["errors"][0]
                 error_name = (
@@ -543,38 +615,39 @@ class OpenCTIApiClient:
         :returns: returns either a dict or list with the processes entities
         """
 
-        if with_pagination:
-            result = {"entities": [], "pagination": {}}
-        else:
-            result = []
-        if data is None:
-            return result
-
-        # Data can be multiple in edges or directly.
-        # -- When data is directly a listing
-        if isinstance(data, list):
-            for row in data:
-                if with_pagination:
-                    result["entities"].append(self.process_multiple_fields(row))
-                else:
-                    result.append(self.process_multiple_fields(row))
-            return result
-
-        # -- When data is wrapper in edges
-        for edge in (
-            data["edges"] if "edges" in data and data["edges"] is not None else []
-        ):
-            row = edge["node"]
-            if with_pagination:
-                result["entities"].append(self.process_multiple_fields(row))
-            else:
-                result.append(self.process_multiple_fields(row))
-
+        entities, _ = self._process_rows(data)
+        if not with_pagination:
+            return entities
+        result = {"entities": entities, "pagination": {}}
         # -- Add page info if required
-        if with_pagination and "pageInfo" in data:
+        if isinstance(data, dict) and "pageInfo" in data:
             result["pagination"] = data["pageInfo"]
         return result
 
+    def _process_rows(self, data) -> Tuple[list, list]:
+        """Process a listing and collect the ids of its rows in a single pass.
+
+        :param data: listing returned by the API (list or edges)
+        :return: the processed rows and their ids
+        :rtype: tuple
+        """
+        rows = []
+        ids = []
+        if data is None:
+            return rows, ids
+        # Data can be multiple in edges or directly.
+        # -- When data is wrapper in edges
+        is_edges = not isinstance(data, list)
+        if is_edges:
+            data = data.get("edges") or []
+        process_fields = self.process_multiple_fields
+        for row in data:
+            row = process_fields(row["node"] if is_edges else row)
+            rows.append(row)
+            if isinstance(row, dict) and "id" in row:
+                ids.append(row["id"])
+        return rows, ids
+
     def process_multiple_ids(self, data) -> list:
         """processes data returned by the OpenCTI API with multiple ids
 
@@ -583,14 +656,27 @@ class OpenCTIApiClient:
         """
 
         result = []
-        if data is None:
-            return result
         if isinstance(data, list):
             for d in data:
                 if isinstance(d, dict) and "id" in d:
                     result.append(d["id"])
         return result
 
+    def _fields_handler(self, entity_type: str):
+        """Entity class customizing process_multiple_fields, cached per type.
+
+        :param entity_type: entity type of the node
+        :type entity_type: str
+        :return: the entity class or None
+        """
+        from pycti.utils.opencti_stix2_utils import OpenCTIStix2Utils
+
+        handler = OpenCTIStix2Utils.retrieveClassForMethod(
+            self, {"entity_type": entity_type}, "entity_type", "process_multiple_fields"
+        )
+        self._fields_dispatch[entity_type] = handler
+        return handler
+
     def process_multiple_fields(self, data):
         """processes data returned by the OpenCTI API with multiple fields
 
@@ -600,89 +686,81 @@ class OpenCTIApiClient:
         :rtype: dict
         """
 
-        # Handle process_multiple_fields specific case
-        attribute = OpenCTIStix2Utils.retrieveClassForMethod(
-            self, data, "entity_type", "process_multiple_fields"
-        )
-        if attribute is not None:
-            data = attribute.process_multiple_fields(data)
-
         if data is None:
             return data
-        if "createdBy" in data and data["createdBy"] is not None:
-            data["createdById"] = data["createdBy"]["id"]
-            if "objectMarking" in data["createdBy"]:
-                data["createdBy"]["objectMarking"] = self.process_multiple(
-                    data["createdBy"]["objectMarking"]
-                )
-                data["createdBy"]["objectMarkingIds"] = self.process_multiple_ids(
-                    data["createdBy"]["objectMarking"]
-                )
-            if "objectLabel" in data["createdBy"]:
-                data["createdBy"]["objectLabel"] = self.process_multiple(
-                    data["createdBy"]["objectLabel"]
+        # Handle process_multiple_fields specific case
+        entity_type = data.get("entity_type")
+        if entity_type is not None:
+            handler = self._fields_dispatch.get(entity_type, False)
+            if handler is False:
+                handler = self._fields_handler(entity_type)
+            if handler is not None:
+                data = handler.process_multiple_fields(data)
+                if data is None:
+                    return data
+
+        created_by = data.get("createdBy")
+        if created_by is not None:
+            data["createdById"] = created_by["id"]
+            if "objectMarking" in created_by:
+                created_by["objectMarking"], created_by["objectMarkingIds"] = (
+                    self._process_rows(created_by["objectMarking"])
                 )
-                data["createdBy"]["objectLabelIds"] = self.process_multiple_ids(
-                    data["createdBy"]["objectLabel"]
+            if "objectLabel" in created_by:
+                created_by["objectLabel"], created_by["objectLabelIds"] = (
+                    self._process_rows(created_by["objectLabel"])
                 )
         else:
             data["createdById"] = None
         if "objectMarking" in data:
-            data["objectMarking"] = self.process_multiple(data["objectMarking"])
-            data["objectMarkingIds"] = self.process_multiple_ids(data["objectMarking"])
+            data["objectMarking"], data["objectMarkingIds"] = self._process_rows(
+                data["objectMarking"]
+            )
         if "objectLabel" in data:
-            data["objectLabel"] = self.process_multiple(data["objectLabel"])
-            data["objectLabelIds"] = self.process_multiple_ids(data["objectLabel"])
+            data["objectLabel"], data["objectLabelIds"] = self._process_rows(
+                data["objectLabel"]
+            )
         if "reports" in data:
-            data["reports"] = self.process_multiple(data["reports"])
-            data["reportsIds"] = self.process_multiple_ids(data["reports"])
+            data["reports"], data["reportsIds"] = self._process_rows(data["reports"])
         if "notes" in data:
-            data["notes"] = self.process_multiple(data["notes"])
-            data["notesIds"] = self.process_multiple_ids(data["notes"])
+            data["notes"], data["notesIds"] = self._process_rows(data["notes"])
         if "opinions" in data:
-            data["opinions"] = self.process_multiple(data["opinions"])
-            data["opinionsIds"] = self.process_multiple_ids(data["opinions"])
+            data["opinions"], data["opinionsIds"] = self._process_rows(data["opinions"])
         if "observedData" in data:
-            data["observedData"] = self.process_multiple(data["observedData"])
-            data["observedDataIds"] = self.process_multiple_ids(data["observedData"])
+            data["observedData"], data["observedDataIds"] = self._process_rows(
+                data["observedData"]
+            )
         if "killChainPhases" in data:
-            data["killChainPhases"] = self.process_multiple(data["killChainPhases"])
-            data["killChainPhasesIds"] = self.process_multiple_ids(
+            data["killChainPhases"], data["killChainPhasesIds"] = self._process_rows(
                 data["killChainPhases"]
             )
         if "externalReferences" in data:
-            data["externalReferences"] = self.process_multiple(
-                data["externalReferences"]
-            )
-            data["externalReferencesIds"] = self.process_multiple_ids(
-                data["externalReferences"]
+            data["externalReferences"], data["externalReferencesIds"] = (
+                self._process_rows(data["externalReferences"])
             )
         if "objects" in data:
-            data["objects"] = self.process_multiple(data["objects"])
-            data["objectsIds"] = self.process_multiple_ids(data["objects"])
+            data["objects"], data["objectsIds"] = self._process_rows(data["objects"])
         if "observables" in data:
-            data["observables"] = self.process_multiple(data["observables"])
-            data["observablesIds"] = self.process_multiple_ids(data["observables"])
-        if "stixCoreRelationships" in data:
-            data["stixCoreRelationships"] = self.process_multiple(
-                data["stixCoreRelationships"]
+            data["observables"], data["observablesIds"] = self._process_rows(
+                data["observables"]
             )
-            data["stixCoreRelationshipsIds"] = self.process_multiple_ids(
-                data["stixCoreRelationships"]
+        if "stixCoreRelationships" in data:
+            data["stixCoreRelationships"], data["stixCoreRelationshipsIds"] = (
+                self._process_rows(data["stixCoreRelationships"])
             )
         if "indicators" in data:
-            data["indicators"] = self.process_multiple(data["indicators"])
-            data["indicatorsIds"] = self.process_multiple_ids(data["indicators"])
+            data["indicators"], data["indicatorsIds"] = self._process_rows(
+                data["indicators"]
+            )
         if "importFiles" in data:
-            data["importFiles"] = self.process_multiple(data["importFiles"])
-            data["importFilesIds"] = self.process_multiple_ids(data["importFiles"])
+            data["importFiles"], data["importFilesIds"] = self._process_rows(
+                data["importFiles"]
+            )
         # See aliases of GraphQL query in stix_core_object method
         if "name_alt" in data:
-            data["name"] = data["name_alt"]
-            del data["name_alt"]
+            data["name"] = data.pop("name_alt")
         if "content_alt" in data:
-            data["content"] = data["content_alt"]
-            del data["content_alt"]
+            data["content"] = data.pop("content_alt")
         return data
 
     def upload_file(self, **kwargs):
@@ -712,6 +790,8 @@ class OpenCTIApiClient:
                 if file_name.endswith(".json"):
                     mime_type = "application/json"
                 else:
+                    import magic
+
                     mime_type = magic.from_file(file_name, mime=True)
             query_vars = {"file": (File(file_name, data, mime_type))}
             # optional file markings
@@ -779,6 +859,8 @@ class OpenCTIApiClient:
                 if file_name.endswith(".json"):
                     mime_type = "application/json"
                 else:
+                    import magic
+
                     mime_type = magic.from_file(file_name, mime=True)
             return self.query(
                 query,
@@ -1,5 +1,5 @@
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from pycti.connector.opencti_connector import OpenCTIConnector
 
@@ -89,7 +89,11 @@ class OpenCTIApiConnector:
         return result["data"]["connectorsForWorker"]
 
     def ping(
-        self, connector_id: str, connector_state: Any, connector_info: Dict
+        self,
+        connector_id: str,
+        connector_state: Any,
+        connector_info: Dict,
+        serialized_state: Optional[str] = None,
     ) -> Dict:
         """pings a connector by id and state
 
@@ -99,6 +103,9 @@ class OpenCTIApiConnector:
         :type connector_state:
         :param connector_info: all details connector
         :type connector_info: Dict
+        :param serialized_state: (optional) already serialized state, sent
+            instead of `connector_state`
+        :type serialized_state: str
         :return: the response pingConnector data dict
         :rtype: dict
         """
@@ -123,7 +130,11 @@ class OpenCTIApiConnector:
             query,
             {
                 "id": connector_id,
-                "state": json.dumps(connector_state),
+                "state": (
+                    serialized_state
+                    if serialized_state is not None
+                    else json.dumps(connector_state)
+                ),
                 "connectorInfo": connector_info,
             },
         )
@@ -0,0 +1,140 @@
+# coding: utf-8
+
+import re
+import time
+from typing import Any, Optional
+
+_OPERATION = re.compile(r"\s*(?:query|mutation|subscription)\s+(\w+)")
+
+
+def operation_name(query: str) -> str:
+    """Get the operation name of a GraphQL query.
+
+    :param query: GraphQL query string
+    :type query: str
+    :return: the operation name, ``anonymous`` if the operation has none
+    :rtype: str
+    """
+    match = _OPERATION.match(query)
+    return "anonymous" if match is None else match.group(1)
+
+
+def query_error_type(ex: Exception, response=None) -> str:
+    """Get the class of a query error, used as metric attribute.
+
+    :param ex: the error raised by the query
+    :type ex: Exception
+    :param response: the HTTP response, if any
+    :return: the GraphQL error name, ``HTTP_<status>`` or the exception type
+    :rtype: str
+    """
+    if isinstance(ex, ValueError) and ex.args and isinstance(ex.args[0], dict):
+        return str(ex.args[0].get("name", "GRAPHQL_ERROR"))
+    if response is not None and response.status_code != 200:
+        return "HTTP_" + str(response.status_code)
+    return type(ex).__name__
+
+
+class OpenCTIApiQueryMetrics:
+    """Latency, payload size, retry and error metrics of the GraphQL queries
+
+    Metrics are recorded by operation name with the OpenTelemetry meter of
+    :py:mod:`pycti.utils.opencti_stix2`. Query and error counts are also
+    sent to the ``metric_handler`` if set.
+
+    :param metric_handler: an :py:class:`~pycti.connector.opencti_metric_handler.OpenCTIMetricHandler`
+    """
+
+    def __init__(self, metric_handler=None):
+        from pycti.utils.opencti_stix2 import meter
+
+        self.metric_handler = metric_handler
+        self.duration_histogram = meter.create_histogram(
+            name="opencti_api_query_duration",
+            unit="s",
+            description="duration of the GraphQL queries",
+        )
+        self.request_size_histogram = meter.create_histogram(
+            name="opencti_api_query_request_size",
+            unit="By",
+            description="size of the GraphQL requests",
+        )
+        self.response_size_histogram = meter.create_histogram(
+            name="opencti_api_query_response_size",
+            unit="By",
+            description="size of the GraphQL responses",
+        )
+        self.retry_counter = meter.create_counter(
+            name="opencti_api_query_retry_counter",
+            description="number of GraphQL queries sent as a retry",
+        )
+        self.error_counter = meter.create_counter(
+            name="opencti_api_query_error_counter",
+            description="number of GraphQL queries in error",
+        )
+
+    def observe(
+        self, client, query: str, variables: Optional[dict], disable_impersonate: bool
+    ) -> Any:
+        """Run a query of the client and record its metrics.
+
+        :param client: the :py:class:`~pycti.api.opencti_api_client.OpenCTIApiClient`
+        :param query: GraphQL query string
+        :type query: str
+        :param variables: GraphQL query variables
+        :type variables: dict
+        :param disable_impersonate: removes impersonate header if set to True
+        :type disable_impersonate: bool
+        :return: the query result
+        """
+        operation = operation_name(query)
+        retry_number = client.request_headers.get("opencti-retry-number")
+        response = None
+        error_type = None
+        start = time.perf_counter()
+        try:
+            response = client._send_query(query, variables, disable_impersonate)
+            return client._read_query_response(response)
+        except Exception as ex:
+            error_type = query_error_type(ex, response)
+            raise
+        finally:
+            self.record(
+                operation,
+                time.perf_counter() - start,
+                response,
+                error_type,
+                retry_number not in (None, "", "0"),
+            )
+
+    def record(
+        self,
+        operation: str,
+        duration: float,
+        response=None,
+        error_type: str = None,
+        is_retry: bool = False,
+    ):
+        attributes = {"operation": operation}
+        self.duration_histogram.record(
+            duration,
+            {"operation": operation, "status": error_type or "success"},
+        )
+        if response is not None:
+            body = response.request.body if response.request is not None else None
+            if body is not None:
+                self.request_size_histogram.record(len(body), attributes)
+            self.response_size_histogram.record(len(response.content), attributes)
+        if is_retry:
+            self.retry_counter.add(1, attributes)
+        if error_type is not None:
+            self.error_counter.add(
+                1, {"operation": operation, "error_type": error_type}
+            )
+        if self.metric_handler is not None:
+            self.metric_handler.inc("api_query_count", labels=attributes)
+            if error_type is not None:
+                self.metric_handler.inc(
+                    "api_query_error_count",
+                    labels={"operation": operation, "error_type": error_type},
+                )
@@ -5,6 +5,7 @@ import datetime
 import json
 import os
 import queue
+import random
 import sched
 import signal
 import ssl
@@ -15,25 +16,52 @@ import time
 import uuid
 from enum import Enum
 from queue import Queue
-from typing import Callable, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Union
 
-import pika
-import uvicorn
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
 from filigran_sseclient import SSEClient
-from pika.exceptions import NackError, UnroutableError
-from pydantic import TypeAdapter
 
 from pycti.api.opencti_api_client import OpenCTIApiClient
 from pycti.connector.opencti_connector import OpenCTIConnector
+from pycti.connector.opencti_connector_profiler import (
+    OpenCTIConnectorProfiler,
+    profiled,
+)
 from pycti.connector.opencti_metric_handler import OpenCTIMetricHandler
+from pycti.utils import opencti_json, opencti_memory_profiler, opencti_tracing
 from pycti.utils.opencti_stix2_splitter import OpenCTIStix2Splitter
 
+if TYPE_CHECKING:
+    from fastapi import FastAPI, Request
+
 TRUTHY: List[str] = ["yes", "true", "True"]
 FALSY: List[str] = ["no", "false", "False"]
 
-app = FastAPI()
+# pika, uvicorn, FastAPI and pydantic are imported where they are needed,
+# importing the helper does not load the whole connector stack
+_app: Optional["FastAPI"] = None
+_app_lock = threading.Lock()
+
+
+def get_app() -> "FastAPI":
+    """Get the FastAPI application serving the API listen protocol.
+
+    :return: the application, created on first call
+    :rtype: FastAPI
+    """
+    global _app
+    with _app_lock:
+        if _app is None:
+            from fastapi import FastAPI
+
+            _app = FastAPI()
+        return _app
+
+
+def __getattr__(name):
+    # Module level "app" is kept for compatibility, built on first access
+    if name == "app":
+        return get_app()
+    raise AttributeError("module " + repr(__name__) + " has no attribute " + repr(name))
 
 
 def killProgramHook(etype, value, tb):
@@ -317,19 +345,25 @@ class ListenQueue(threading.Thread):
         :type channel: callable
         :param method: message methods
         :type method: callable
-        :param properties: unused
-        :type properties: str
+        :param properties: AMQP properties of the message, whose headers carry
+            the trace context of the producer when tracing is enabled
+        :type properties: pika.BasicProperties
         :param body: message body (data)
         :type body: str or bytes or bytearray
         """
-        json_data = json.loads(body)
+        json_data = opencti_json.loads(body)
         # Message should be ack before processing as we don't own the processing
         # Not ACK the message here may lead to infinite re-deliver if the connector is broken
         # Also ACK, will not have any impact on the blocking aspect of the following functions
         channel.basic_ack(delivery_tag=method.delivery_tag)
         self.helper.connector_logger.info("Message ack", {"tag": method.delivery_tag})
 
-        self.thread = threading.Thread(target=self._data_handler, args=[json_data])
+        self.helper.metric.inc("in_flight_work")
+        # Link the processing to the trace of the message producer
+        data_handler = opencti_tracing.bind(
+            self._data_handler, opencti_tracing.extract(properties.headers)
+        )
+        self.thread = threading.Thread(target=data_handler, args=[json_data])
         self.thread.start()
         five_minutes = 60 * 5
         time_wait = 0
@@ -344,6 +378,7 @@ class ListenQueue(threading.Thread):
             else:
                 time_wait += 1
             time.sleep(1)
+        self.helper.metric.dec("in_flight_work")
         self.helper.connector_logger.info(
             "Message processed, thread terminated",
             {"tag": method.delivery_tag},
@@ -359,6 +394,7 @@ class ListenQueue(threading.Thread):
         self.helper.api.set_draft_id(draft_id)
         self.helper.api_impersonate.set_draft_id(draft_id)
 
+    @opencti_tracing.traced("opencti.connector.process_message")
     def _data_handler(self, json_data) -> None:
         # Execute the callback
         try:
@@ -366,12 +402,12 @@ class ListenQueue(threading.Thread):
             entity_id = event_data.get("entity_id")
             entity_type = event_data.get("entity_type")
             stix_entity = (
-                json.loads(event_data.get("stix_entity"))
+                opencti_json.loads(event_data.get("stix_entity"))
                 if event_data.get("stix_entity")
                 else None
             )
             stix_objects = (
-                json.loads(event_data.get("stix_objects"))
+                opencti_json.loads(event_data.get("stix_objects"))
                 if event_data.get("stix_objects")
                 else None
             )
@@ -399,7 +435,10 @@ class ListenQueue(threading.Thread):
                 do_read = self.helper.api.stix2.get_reader(
                     entity_type if entity_type is not None else "Stix-Core-Object"
                 )
-                opencti_entity = do_read(id=entity_id, withFiles=True)
+                with opencti_tracing.span(
+                    "opencti.connector.read_entity", {"entity_type": str(entity_type)}
+                ):
+                    opencti_entity = do_read(id=entity_id, withFiles=True)
                 if opencti_entity is None:
                     raise ValueError(
                         "Unable to read/access to the entity, please check that the connector permission"
@@ -416,7 +455,7 @@ class ListenQueue(threading.Thread):
                     data_instance_id = json_data["internal"]["playbook"].get(
                         "data_instance_id"
                     )
-                    previous_bundle = json.dumps((json_data["event"]["bundle"]))
+                    previous_bundle = opencti_json.dumps(json_data["event"]["bundle"])
                     step_id = json_data["internal"]["playbook"]["step_id"]
                     previous_step_id = json_data["internal"]["playbook"][
                         "previous_step_id"
@@ -482,9 +521,12 @@ class ListenQueue(threading.Thread):
                     work_id, "Connector ready to process the operation"
                 )
             # Send the enriched to the callback
-            message = self.callback(event_data)
+            with opencti_tracing.span("opencti.connector.callback"):
+                with self.helper.profiler.profile("callback"):
+                    message = self.callback(event_data)
             if work_id:
-                self.helper.api.work.to_processed(work_id, message)
+                with opencti_tracing.span("opencti.connector.to_processed"):
+                    self.helper.api.work.to_processed(work_id, message)
             self._set_draft_id("")
 
         except Exception as e:  # pylint: disable=broad-except
@@ -502,7 +544,9 @@ class ListenQueue(threading.Thread):
                         "Failing reporting the processing"
                     )
 
-    async def _http_process_callback(self, request: Request):
+    async def _http_process_callback(self, request: "Request"):
+        from fastapi.responses import JSONResponse
+
         # 01. Check the authentication
         authorization: str = request.headers.get("Authorization", "")
         items = authorization.split() if isinstance(authorization, str) else []
@@ -525,6 +569,7 @@ class ListenQueue(threading.Thread):
                 status_code=400,
                 content={"error": "Invalid JSON payload"},
             )
+        self.helper.metric.inc("in_flight_work")
         try:
             self._data_handler(data)
         except Exception as e:
@@ -535,6 +580,8 @@ class ListenQueue(threading.Thread):
                 status_code=500,
                 content={"error": "Error processing message"},
             )
+        finally:
+            self.helper.metric.dec("in_flight_work")
         # all good
         return JSONResponse(
             status_code=202, content={"message": "Message successfully received"}
@@ -542,6 +589,8 @@ class ListenQueue(threading.Thread):
 
     def run(self) -> None:
         if self.listen_protocol == "AMQP":
+            import pika
+
             self.helper.connector_logger.info("Starting ListenQueue thread")
             while not self.exit_event.is_set():
                 try:
@@ -595,10 +644,19 @@ class ListenQueue(threading.Thread):
                     # Wait some time and then retry ListenQueue again.
                     time.sleep(10)
         elif self.listen_protocol == "API":
+            import uvicorn
+            from fastapi import Request
+
             self.helper.connector_logger.info("Starting Listen HTTP thread")
+
+            # FastAPI resolves the request parameter from the annotation
+            async def http_process_callback(request: Request):
+                return await self._http_process_callback(request)
+
+            app = get_app()
             app.add_api_route(
                 self.listen_protocol_api_path,
-                self._http_process_callback,
+                http_process_callback,
                 methods=["POST"],
             )
             config = uvicorn.Config(
@@ -633,6 +691,16 @@ class ListenQueue(threading.Thread):
 
 
 class PingAlive(threading.Thread):
+    """Thread pinging the platform with the connector state and info.
+
+    The state is sent as serialized by the helper and the state returned by
+    the platform is only decoded when it differs from the one sent, which
+    is the case when the state has been remotely reset. The connector info
+    is only logged when it changed. Pings are `interval` seconds apart,
+    plus or minus a random `jitter` so that connectors started together do
+    not ping the platform at the same time.
+    """
+
     def __init__(
         self,
         connector_logger,
@@ -642,6 +710,9 @@ class PingAlive(threading.Thread):
         set_state,
         metric,
         connector_info,
+        get_serialized_state=None,
+        interval: int = 40,
+        jitter: int = 0,
     ) -> None:
         threading.Thread.__init__(self, daemon=True)
         self.connector_logger = connector_logger
@@ -650,44 +721,73 @@ class PingAlive(threading.Thread):
         self.api = api
         self.get_state = get_state
         self.set_state = set_state
+        self.get_serialized_state = get_serialized_state or (
+            lambda: json.dumps(self.get_state())
+        )
         self.exit_event = threading.Event()
         self.metric = metric
         self.connector_info = connector_info
+        self.interval = max(1, interval)
+        self.jitter = max(0, min(jitter, self.interval - 1))
+        self._last_connector_info = None
+
+    def next_wait(self) -> float:
+        """Seconds to wait before the next ping."""
+        if self.jitter == 0:
+            return self.interval
+        return self.interval + random.uniform(-self.jitter, self.jitter)
+
+    def ping_once(self) -> None:
+        sent_state = self.get_serialized_state()
+        connector_info = self.connector_info.all_details
+        if connector_info != self._last_connector_info:
+            self._last_connector_info = connector_info
+            self.connector_logger.debug(
+                "PingAlive ConnectorInfo", {"connector_info": connector_info}
+            )
+        result = self.api.connector.ping(
+            self.connector_id, None, connector_info, serialized_state=sent_state
+        )
+        if result["connector_state"] == sent_state:
+            return
+        # Compare the decoded states, the platform may serialize differently
+        remote_state = (
+            opencti_json.loads(result["connector_state"])
+            if result["connector_state"] is not None
+            and len(result["connector_state"]) > 0
+            else None
+        )
+        try:
+            local_state = opencti_json.loads(sent_state)
+        except ValueError:
+            local_state = None
+        if local_state != remote_state:
+            self.set_state(result["connector_state"])
+            self.connector_logger.info(
+                "Connector state has been remotely reset",
+                {"state": self.get_state()},
+            )
 
     def ping(self) -> None:
         while not self.exit_event.is_set():
             try:
                 self.connector_logger.debug("PingAlive running.")
-                initial_state = self.get_state()
-                connector_info = self.connector_info.all_details
-                self.connector_logger.debug(
-                    "PingAlive ConnectorInfo", {"connector_info": connector_info}
-                )
-                result = self.api.connector.ping(
-                    self.connector_id, initial_state, connector_info
-                )
-                remote_state = (
-                    json.loads(result["connector_state"])
-                    if result["connector_state"] is not None
-                    and len(result["connector_state"]) > 0
-                    else None
-                )
-                if initial_state != remote_state:
-                    self.set_state(result["connector_state"])
-                    self.connector_logger.info(
-                        "Connector state has been remotely reset",
-                        {"state": self.get_state()},
-                    )
-
+                self.ping_once()
                 if self.in_error:
                     self.in_error = False
                     self.connector_logger.info("API Ping back to normal")
                 self.metric.inc("ping_api_count")
+                # Phase timers are not part of the platform connector info
+                phase_timers = self.connector_info.phase_timers
+                if phase_timers:
+                    self.connector_logger.info(
+                        "Connector phase timers", {"phase_timers": phase_timers}
+                    )
             except Exception as e:  # pylint: disable=broad-except
                 self.in_error = True
                 self.metric.inc("ping_api_error")
                 self.connector_logger.error("Error pinging the API", {"reason": str(e)})
-            self.exit_event.wait(40)
+            self.exit_event.wait(self.next_wait())
 
     def run(self) -> None:
         self.connector_logger.info("Starting PingAlive thread")
@@ -857,7 +957,8 @@ class ListenStream(threading.Thread):
                             state["start_from"] = str(msg.id)
                             self.helper.set_state(state)
                     else:
-                        self.callback(msg)
+                        with self.helper.profiler.profile("callback"):
+                            self.callback(msg)
                         state = self.helper.get_state()
                         # state can be None if reset from the UI
                         # In this case, default parameters will be used but SSE Client needs to be restarted
@@ -897,6 +998,8 @@ class ConnectorInfo:
         self._queue_messages_size = queue_messages_size
         self._next_run_datetime = next_run_datetime
         self._last_run_datetime = last_run_datetime
+        self._phase_timers = {}
+        self._phase_timers_lock = threading.Lock()
 
     @property
     def all_details(self):
@@ -992,6 +1095,37 @@ class ConnectorInfo:
         """
         self._last_run_datetime = value
 
+    @property
+    def phase_timers(self) -> Dict:
+        """Get the timers of the connector phases, filled in profiling mode.
+
+        :return: count, total, average, max and last duration in seconds by phase
+        :rtype: dict
+        """
+        with self._phase_timers_lock:
+            return {
+                phase: dict(timer, average=timer["total"] / timer["count"])
+                for phase, timer in self._phase_timers.items()
+            }
+
+    def record_phase(self, phase: str, duration: float):
+        """Record the duration of a run of a connector phase.
+
+        :param phase: name of the phase
+        :type phase: str
+        :param duration: duration of the run in seconds
+        :type duration: float
+        """
+        with self._phase_timers_lock:
+            timer = self._phase_timers.get(phase)
+            if timer is None:
+                timer = {"count": 0, "total": 0.0, "max": 0.0, "last": 0.0}
+                self._phase_timers[phase] = timer
+            timer["count"] += 1
+            timer["total"] += duration
+            timer["max"] = max(timer["max"], duration)
+            timer["last"] = duration
+
 
 class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
     """Python API for OpenCTI connector
@@ -1169,6 +1303,19 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
         self.log_level = get_config_variable(
             "CONNECTOR_LOG_LEVEL", ["connector", "log_level"], config, default="ERROR"
         ).upper()
+        self.log_rate_limit = get_config_variable(
+            "CONNECTOR_LOG_RATE_LIMIT",
+            ["connector", "log_rate_limit"],
+            config,
+            isNumber=True,
+            default=0,
+        )
+        self.log_async = get_config_variable(
+            "CONNECTOR_LOG_ASYNC",
+            ["connector", "log_async"],
+            config,
+            default=False,
+        )
         self.connect_run_and_terminate = get_config_variable(
             "CONNECTOR_RUN_AND_TERMINATE",
             ["connector", "run_and_terminate"],
@@ -1210,6 +1357,60 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
             isNumber=True,
             default=9095,
         )
+        tracing = get_config_variable(
+            "CONNECTOR_TRACING",
+            ["connector", "tracing"],
+            config,
+            default=False,
+        )
+        if tracing:
+            opencti_tracing.enable_tracing()
+        profiling = get_config_variable(
+            "CONNECTOR_PROFILING",
+            ["connector", "profiling"],
+            config,
+            default=False,
+        )
+        profiling_every = get_config_variable(
+            "CONNECTOR_PROFILING_EVERY",
+            ["connector", "profiling_every"],
+            config,
+            isNumber=True,
+            default=100,
+        )
+        profiling_directory = get_config_variable(
+            "CONNECTOR_PROFILING_DIRECTORY",
+            ["connector", "profiling_directory"],
+            config,
+            default=os.path.join(tempfile.gettempdir(), "opencti-connector-profiles"),
+        )
+        memory_profiling = get_config_variable(
+            "CONNECTOR_MEMORY_PROFILING",
+            ["connector", "memory_profiling"],
+            config,
+            default=False,
+        )
+        memory_profiling_top = get_config_variable(
+            "CONNECTOR_MEMORY_PROFILING_TOP",
+            ["connector", "memory_profiling_top"],
+            config,
+            isNumber=True,
+            default=10,
+        )
+        ping_interval = get_config_variable(
+            "CONNECTOR_PING_INTERVAL",
+            ["connector", "ping_interval"],
+            config,
+            isNumber=True,
+            default=40,
+        )
+        ping_jitter = get_config_variable(
+            "CONNECTOR_PING_JITTER",
+            ["connector", "ping_jitter"],
+            config,
+            isNumber=True,
+            default=5,
+        )
         # Initialize ConnectorInfo instance
         self.connector_info = ConnectorInfo()
         # Initialize configuration
@@ -1222,6 +1423,8 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
             json_logging=self.opencti_json_logging,
             custom_headers=self.opencti_custom_headers,
             bundle_send_to_queue=self.bundle_send_to_queue,
+            log_rate_limit=self.log_rate_limit,
+            async_logging=self.log_async,
         )
         # - Impersonate API that will use applicant id
         # Behave like standard api if applicant not found
@@ -1233,6 +1436,8 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
             json_logging=self.opencti_json_logging,
             custom_headers=self.opencti_custom_headers,
             bundle_send_to_queue=self.bundle_send_to_queue,
+            log_rate_limit=self.log_rate_limit,
+            async_logging=self.log_async,
         )
         self.connector_logger = self.api.logger_class(self.connect_name)
         # For retro compatibility
@@ -1249,6 +1454,22 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
             metrics_subsystem,
             metrics_port,
         )
+        self.api.stix2.mapping_cache.metric_handler = self.metric
+        self.api.stix2.mapping_cache_permanent.metric_handler = self.metric
+        if self.metric.activated:
+            self.api.enable_query_metrics(self.metric)
+        if memory_profiling:
+            opencti_memory_profiler.enable_memory_profiling(
+                top=memory_profiling_top, logger=self.connector_logger
+            )
+        self.profiler = OpenCTIConnectorProfiler(
+            self.connector_logger,
+            self.connector_info,
+            self.metric,
+            profiling,
+            profiling_every,
+            profiling_directory,
+        )
         # Register the connector in OpenCTI
         self.connector = OpenCTIConnector(
             connector_id=self.connect_id,
@@ -1350,6 +1571,8 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
                     is_run_and_terminate = True
                 else:
                     # Calculates and validate the duration period in seconds
+                    from pydantic import TypeAdapter
+
                     timedelta_adapter = TypeAdapter(datetime.timedelta)
                     td = timedelta_adapter.validate_python(self.connect_duration_period)
                     duration_period_in_seconds = int(td.total_seconds())
@@ -1366,6 +1589,9 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
                     self.set_state,
                     self.metric,
                     self.connector_info,
+                    get_serialized_state=self._serialized_state,
+                    interval=ping_interval,
+                    jitter=ping_jitter,
                 )
                 self.ping.start()
 
@@ -1465,7 +1691,7 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
         :type state: Dict or None
         """
         if isinstance(state, Dict):
-            self.connector_state = json.dumps(state)
+            self.connector_state = opencti_json.dumps(state)
         else:
             self.connector_state = None
 
@@ -1478,13 +1704,24 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
 
         try:
             if self.connector_state:
-                state = json.loads(self.connector_state)
+                state = opencti_json.loads(self.connector_state)
                 if isinstance(state, Dict) and state:
                     return state
         except:  # pylint: disable=bare-except  # noqa: E722
             pass
         return None
 
+    def _serialized_state(self) -> str:
+        """Get the connector state as sent to the platform, without decoding it.
+
+        :return: the serialized state, "null" if there is none
+        :rtype: str
+        """
+        connector_state = self.connector_state
+        if connector_state:
+            return connector_state
+        return "null"
+
     def force_ping(self):
         """Force a ping to the OpenCTI API to update connector state.
 
@@ -1501,7 +1738,7 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
                 self.connector_id, initial_state, connector_info
             )
             remote_state = (
-                json.loads(result["connector_state"])
+                opencti_json.loads(result["connector_state"])
                 if result["connector_state"] is not None
                 and len(result["connector_state"]) > 0
                 else None
@@ -1579,6 +1816,7 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
 
                 # Convert queue_messages_size to Mo (decimal)
                 queue_messages_size_mo = queue_messages_size_byte / 1000000
+                self.metric.set("queue_messages_size", queue_messages_size_mo)
 
                 self.connector_logger.debug(
                     "[DEBUG] Connector queue details ...",
@@ -1670,6 +1908,8 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
                 duration_period_in_seconds = 0
             else:
                 # Calculates and validate the duration period in seconds
+                from pydantic import TypeAdapter
+
                 timedelta_adapter = TypeAdapter(datetime.timedelta)
                 td = timedelta_adapter.validate_python(duration_period)
                 duration_period_in_seconds = int(td.total_seconds())
@@ -1707,7 +1947,8 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
 
             if not check_connector_buffering:
                 # Start running the connector
-                message_callback()
+                with self.profiler.profile("run"):
+                    message_callback()
                 # Lets you know what is the last run of the connector datetime
                 self.last_run_datetime()
 
@@ -1752,7 +1993,8 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
 
                 if not check_connector_buffering:
                     # Start running the connector
-                    message_callback()
+                    with self.profiler.profile("run"):
+                        message_callback()
 
                 # Lets you know what is the last run of the connector datetime
                 self.last_run_datetime()
@@ -1761,7 +2003,8 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
                 sys.exit(0)
             else:
                 # Start running the connector
-                message_callback()
+                with self.profiler.profile("run"):
+                    message_callback()
                 # Set queue_threshold and queue_messages_size for the first run
                 self.check_connector_buffering()
                 # Lets you know what is the last run of the connector datetime
@@ -1950,6 +2193,8 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
         )
 
     # Push Stix2 helper
+    @opencti_tracing.traced("opencti.connector.send_stix2_bundle")
+    @profiled("send_stix2_bundle")
     def send_stix2_bundle(self, bundle: str, **kwargs) -> list:
         """send a stix2 bundle to the API
 
@@ -1993,7 +2238,7 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
         # In case of enrichment ingestion, ensure the sharing if needed
         if self.enrichment_shared_organizations is not None:
             # Every element of the bundle must be enriched with the same organizations
-            bundle_data = json.loads(bundle)
+            bundle_data = opencti_json.loads(bundle)
             for item in bundle_data["objects"]:
                 if (
                     "extensions" in item
@@ -2026,7 +2271,7 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
                         item["x_opencti_granted_refs"] = (
                             self.enrichment_shared_organizations
                         )
-            bundle = json.dumps(bundle_data)
+            bundle = opencti_json.dumps(bundle_data)
 
         # If execution in playbook, callback the api
         if self.playbook is not None:
@@ -2093,7 +2338,7 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
                     "validate_before_import": self.connect_validate_before_import,
                 },
                 "entities_types": entities_types,
-                "bundle": json.loads(bundle),
+                "bundle": opencti_json.loads(bundle),
                 "update": update,
             }
             # Maintains the list of files under control
@@ -2110,22 +2355,24 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
                         if is_expired_file:
                             os.remove(file_location)
             # Write the bundle to target directory
-            with open(write_file, "w") as f:
-                str_bundle = json.dumps(message_bundle)
-                f.write(str_bundle)
+            with open(write_file, "wb") as f:
+                f.write(opencti_json.dumps_bytes(message_bundle))
             # Rename the file after full write
             final_write_file = os.path.join(bundle_send_to_directory_path, bundle_file)
             os.rename(write_file, final_write_file)
 
-        stix2_splitter = OpenCTIStix2Splitter()
-        (expectations_number, _, bundles) = (
-            stix2_splitter.split_bundle_with_expectations(
-                bundle=bundle,
-                use_json=True,
-                event_version=event_version,
-                cleanup_inconsistent_bundle=cleanup_inconsistent_bundle,
+        with opencti_tracing.span(
+            "opencti.connector.split_bundle"
+        ), opencti_memory_profiler.phase("split"):
+            stix2_splitter = OpenCTIStix2Splitter()
+            (expectations_number, _, bundles) = (
+                stix2_splitter.split_bundle_with_expectations(
+                    bundle=bundle,
+                    use_json=True,
+                    event_version=event_version,
+                    cleanup_inconsistent_bundle=cleanup_inconsistent_bundle,
+                )
             )
-        )
 
         if len(bundles) == 0:
             self.metric.inc("error_count")
@@ -2135,6 +2382,8 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
             if entities_types is None:
                 entities_types = []
             if self.queue_protocol == "amqp":
+                import pika
+
                 if work_id:
                     self.api.work.add_expectations(work_id, expectations_number)
                 pika_credentials = pika.PlainCredentials(
@@ -2178,9 +2427,14 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
                 channel.close()
                 pika_connection.close()
             elif self.queue_protocol == "api":
+                start = time.perf_counter()
                 self.api.send_bundle_to_api(
                     connector_id=self.connector_id, bundle=bundle, work_id=work_id
                 )
+                self.metric.observe("bundle_send_duration", time.perf_counter() - start)
+                if self.metric.activated:
+                    # Bytes, as measured on the AMQP message body
+                    self.metric.observe("bundle_send_size", len(bundle.encode("utf-8")))
                 self.metric.inc("bundle_send")
             else:
                 raise ValueError(
@@ -2203,6 +2457,9 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
         :param draft_id: if draft_id is set, bundle must be set in draft context
         :type draft_id:
         """
+        import pika
+        from pika.exceptions import NackError, UnroutableError
+
         work_id = kwargs.get("work_id", None)
         sequence = kwargs.get("sequence", 0)
         update = kwargs.get("update", False)
@@ -2220,31 +2477,42 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
         # Prepare the message
         # if self.current_work_id is None:
         #    raise ValueError('The job id must be specified')
-        message = {
-            "bundle_type": "QUEUE_BUNDLE",
-            "applicant_id": self.applicant_id,
-            "action_sequence": sequence,
-            "entities_types": entities_types,
-            "content": base64.b64encode(bundle.encode("utf-8", "escape")).decode(
-                "utf-8"
-            ),
-            "update": update,
-            "draft_id": draft_id,
-        }
-        if work_id is not None:
-            message["work_id"] = work_id
+        with opencti_tracing.span("opencti.connector.serialize_bundle"):
+            message = {
+                "bundle_type": "QUEUE_BUNDLE",
+                "applicant_id": self.applicant_id,
+                "action_sequence": sequence,
+                "entities_types": entities_types,
+                "content": base64.b64encode(bundle.encode("utf-8", "escape")).decode(
+                    "utf-8"
+                ),
+                "update": update,
+                "draft_id": draft_id,
+            }
+            if work_id is not None:
+                message["work_id"] = work_id
+            body = opencti_json.dumps_bytes(message)
 
         # Send the message
         try:
-            channel.basic_publish(
-                exchange=self.connector_config["push_exchange"],
-                routing_key=self.connector_config["push_routing"],
-                body=json.dumps(message),
-                properties=pika.BasicProperties(
-                    delivery_mode=2, content_encoding="utf-8"  # make message persistent
-                ),
-            )
+            start = time.perf_counter()
+            with opencti_tracing.span(
+                "opencti.connector.publish_bundle", {"sequence": sequence}
+            ):
+                channel.basic_publish(
+                    exchange=self.connector_config["push_exchange"],
+                    routing_key=self.connector_config["push_routing"],
+                    body=body,
+                    properties=pika.BasicProperties(
+                        delivery_mode=2,  # make message persistent
+                        content_encoding="utf-8",
+                        # Trace context of the workers importing the bundle
+                        headers=opencti_tracing.inject(),
+                    ),
+                )
             self.connector_logger.debug("Bundle has been sent")
+            self.metric.observe("bundle_send_duration", time.perf_counter() - start)
+            self.metric.observe("bundle_send_size", len(body))
             self.metric.inc("bundle_send")
         except (UnroutableError, NackError):
             self.connector_logger.error("Unable to send bundle, retry...")
@@ -2377,7 +2645,7 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
         # Check if item are native STIX 2 lib
         for i in range(len(items)):
             if hasattr(items[i], "serialize"):
-                items[i] = json.loads(items[i].serialize())
+                items[i] = opencti_json.loads(items[i].serialize())
 
         bundle = {
             "type": "bundle",
@@ -2385,7 +2653,7 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
             "spec_version": "2.1",
             "objects": items,
         }
-        return json.dumps(bundle)
+        return opencti_json.dumps(bundle)
 
     @staticmethod
     def check_max_tlp(tlp: str, max_tlp: str) -> bool:
@@ -0,0 +1,148 @@
+import contextlib
+import functools
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict
+
+_NO_PROFILE = contextlib.nullcontext()
+
+
+class OpenCTIConnectorProfiler:
+    """Opt-in profiling of the connector phases
+
+    Every phase run is timed in the ``connector_info`` phase timers, and every
+    ``every``-th run of a phase is profiled with cProfile. Profiles are dumped
+    in ``directory`` as ``<phase>-<date>-<run>.prof`` files, readable with
+    :py:mod:`pstats` or snakeviz, the ``keep`` latest ones of each phase are
+    kept. Runs starting while another one is profiled, nested phases included,
+    are timed but not profiled.
+
+    :param connector_logger: logger of the connector
+    :param connector_info: :py:class:`ConnectorInfo` receiving the phase timers
+    :param metric: :py:class:`OpenCTIMetricHandler` observing the phase durations
+    :param activated: whether the phases are timed and profiled
+    :type activated: bool
+    :param every: profile one run out of `every` of each phase
+    :type every: int
+    :param directory: directory receiving the profiles
+    :type directory: str
+    :param keep: number of profiles kept by phase
+    :type keep: int
+    """
+
+    def __init__(
+        self,
+        connector_logger,
+        connector_info,
+        metric=None,
+        activated: bool = False,
+        every: int = 100,
+        directory: str = None,
+        keep: int = 20,
+    ):
+        self.connector_logger = connector_logger
+        self.connector_info = connector_info
+        self.metric = metric
+        self.activated = activated
+        self.every = max(1, every)
+        self.directory = directory
+        self.keep = keep
+        self._runs: Dict[str, int] = {}
+        self._files: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self._profiling = False
+        if self.activated:
+            os.makedirs(self.directory, exist_ok=True)
+            if self.metric is not None and self.metric.activated:
+                self.metric.register(
+                    "phase_duration",
+                    "histogram",
+                    "Duration of the connector phases",
+                    ["phase"],
+                )
+            self.connector_logger.info(
+                "Profiling connector phases",
+                {"every": self.every, "directory": self.directory},
+            )
+
+    def profile(self, phase: str):
+        """Get a context manager timing, and maybe profiling, a run of `phase`.
+
+        :param phase: name of the phase
+        :type phase: str
+        :return: the context manager, a no-op one if profiling is disabled
+        """
+        if not self.activated:
+            return _NO_PROFILE
+        return self._profile(phase)
+
+    @contextlib.contextmanager
+    def _profile(self, phase: str):
+        profiler = None
+        with self._lock:
+            run = self._runs.get(phase, 0) + 1
+            self._runs[phase] = run
+            # Only one profiler can be active at a time
+            if run % self.every == 0 and not self._profiling:
+                import cProfile
+
+                profiler = cProfile.Profile()
+                self._profiling = True
+        if profiler is not None:
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.connector_info.record_phase(phase, duration)
+            if self.metric is not None:
+                self.metric.observe("phase_duration", duration, {"phase": phase})
+            if profiler is not None:
+                profiler.disable()
+                self._profiling = False
+                self._dump(phase, run, profiler)
+
+    def _dump(self, phase: str, run: int, profiler):
+        file_name = "%s-%s-%d.prof" % (phase, time.strftime("%Y%m%dT%H%M%S"), run)
+        file_path = os.path.join(self.directory, file_name)
+        try:
+            profiler.dump_stats(file_path)
+        except OSError as err:
+            self.connector_logger.error(
+                "Unable to write the profile", {"file": file_path, "reason": str(err)}
+            )
+            return
+        self.connector_logger.info(
+            "Connector phase profiled", {"phase": phase, "file": file_path}
+        )
+        with self._lock:
+            files = self._files.setdefault(phase, deque())
+            files.append(file_path)
+            expired = files.popleft() if len(files) > self.keep else None
+        if expired is not None:
+            with contextlib.suppress(OSError):
+                os.remove(expired)
+
+
+def profiled(phase: str) -> Callable:
+    """Decorator profiling a helper method as a run of `phase`.
+
+    :param phase: name of the phase
+    :type phase: str
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(self, *args, **kwargs):
+            profiler = getattr(self, "profiler", None)
+            if profiler is None or not profiler.activated:
+                return function(self, *args, **kwargs)
+            with profiler.profile(phase):
+                return function(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -1,6 +1,20 @@
-from typing import Type, Union
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Type, Union
 
-from prometheus_client import Counter, Enum, start_http_server
+if TYPE_CHECKING:
+    from prometheus_client import Counter, Enum, Gauge, Histogram
+
+# Buckets of the bundle send histograms
+BUNDLE_SEND_DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+BUNDLE_SEND_SIZE_BUCKETS = (
+    1024,
+    10 * 1024,
+    100 * 1024,
+    1024 * 1024,
+    5 * 1024 * 1024,
+    10 * 1024 * 1024,
+    50 * 1024 * 1024,
+    100 * 1024 * 1024,
+)
 
 
 class OpenCTIMetricHandler:
@@ -28,7 +42,21 @@ class OpenCTIMetricHandler:
         """
         self.activated = activated
         self.connector_logger = connector_logger
+        self.namespace = namespace
+        self.subsystem = subsystem
+        self._metrics = {}
+        # Names already reported as unusable, to log them only once
+        self._reported = set()
         if self.activated:
+            # prometheus_client is only loaded when the metrics are exposed
+            from prometheus_client import (
+                Counter,
+                Enum,
+                Gauge,
+                Histogram,
+                start_http_server,
+            )
+
             self.connector_logger.info("Exposing metrics on port", {"port": port})
             start_http_server(port)
             self._metrics = {
@@ -74,6 +102,64 @@ class OpenCTIMetricHandler:
                     namespace=namespace,
                     subsystem=subsystem,
                 ),
+                "mapping_cache_hits": Counter(
+                    "mapping_cache_hits_total",
+                    "Number of hits in the import mapping caches",
+                    namespace=namespace,
+                    subsystem=subsystem,
+                ),
+                "mapping_cache_misses": Counter(
+                    "mapping_cache_misses_total",
+                    "Number of misses in the import mapping caches",
+                    namespace=namespace,
+                    subsystem=subsystem,
+                ),
+                "mapping_cache_evictions": Counter(
+                    "mapping_cache_evictions_total",
+                    "Number of entries evicted from the import mapping caches",
+                    namespace=namespace,
+                    subsystem=subsystem,
+                ),
+                "api_query_count": Counter(
+                    "api_queries_total",
+                    "Number of GraphQL queries sent to the platform",
+                    ["operation"],
+                    namespace=namespace,
+                    subsystem=subsystem,
+                ),
+                "api_query_error_count": Counter(
+                    "api_query_errors_total",
+                    "Number of GraphQL queries in error",
+                    ["operation", "error_type"],
+                    namespace=namespace,
+                    subsystem=subsystem,
+                ),
+                "bundle_send_duration": Histogram(
+                    "bundle_send_duration_seconds",
+                    "Time spent sending a bundle",
+                    namespace=namespace,
+                    subsystem=subsystem,
+                    buckets=BUNDLE_SEND_DURATION_BUCKETS,
+                ),
+                "bundle_send_size": Histogram(
+                    "bundle_send_size_bytes",
+                    "Size of the sent bundles",
+                    namespace=namespace,
+                    subsystem=subsystem,
+                    buckets=BUNDLE_SEND_SIZE_BUCKETS,
+                ),
+                "queue_messages_size": Gauge(
+                    "queue_messages_size_megabytes",
+                    "Size of the messages waiting in the connector queue",
+                    namespace=namespace,
+                    subsystem=subsystem,
+                ),
+                "in_flight_work": Gauge(
+                    "in_flight_work",
+                    "Number of messages being processed",
+                    namespace=namespace,
+                    subsystem=subsystem,
+                ),
                 "state": Enum(
                     "state",
                     "State of connector",
@@ -83,19 +169,84 @@ class OpenCTIMetricHandler:
                 ),
             }
 
+    def register(
+        self,
+        name: str,
+        metric_type: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        **kwargs,
+    ):
+        """
+        Register a new metric `name` so it can be used like the default ones.
+
+        Parameters
+        ----------
+        name : str
+            Name of the metric in the handler and in prometheus.
+        metric_type : str
+            One of "counter", "gauge", "histogram" or "enum".
+        documentation : str
+            Description of the metric.
+        labelnames : iterable of str, default empty
+            Names of the labels of the metric.
+        **kwargs
+            Other arguments of the prometheus metric (`buckets`, `states`).
+
+        Returns
+        -------
+        Counter, Gauge, Histogram, Enum or None
+            The registered metric, None if the metrics are not activated.
+        """
+        if not self.activated:
+            return None
+        from prometheus_client import Counter, Enum, Gauge, Histogram
+
+        metric_class = {
+            "counter": Counter,
+            "gauge": Gauge,
+            "histogram": Histogram,
+            "enum": Enum,
+        }.get(metric_type)
+        if metric_class is None:
+            raise ValueError("Unknown metric type " + str(metric_type))
+        if name in self._metrics:
+            raise ValueError("Metric " + name + " is already registered")
+        metric = metric_class(
+            name,
+            documentation,
+            list(labelnames),
+            namespace=self.namespace,
+            subsystem=self.subsystem,
+            **kwargs,
+        )
+        self._metrics[name] = metric
+        self._reported.discard(name)
+        return metric
+
+    def _report(self, name: str, message: str, meta: Dict):
+        # Hot path metrics must not flood the logs
+        if name not in self._reported:
+            self._reported.add(name)
+            self.connector_logger.error(message, meta)
+
     def _metric_exists(
-        self, name: str, expected_type: Union[Type[Counter], Type[Enum]]
+        self,
+        name: str,
+        expected_type: Union[
+            Type["Counter"], Type["Enum"], Type["Gauge"], Type["Histogram"]
+        ],
     ) -> bool:
         """
         Check if a metric exists and has the correct type.
 
-        If it does not, log an error and return False.
+        If it does not, log an error once and return False.
 
         Parameters
         ----------
         name : str
             Name of the metric to check.
-        expected_type : Counter or Enum
+        expected_type : Counter, Enum, Gauge or Histogram
             Expected type of the metric.
 
         Returns
@@ -104,30 +255,118 @@ class OpenCTIMetricHandler:
             True if the metric exists and is of the correct type else False.
         """
         if name not in self._metrics:
-            self.connector_logger.error("Metric does not exist.", {"name": name})
+            self._report(name, "Metric does not exist.", {"name": name})
             return False
         if not isinstance(self._metrics[name], expected_type):
-            self.connector_logger.error(
+            self._report(
+                name,
                 "Metric not of expected type",
                 {"name": name, "expected_type": expected_type},
             )
             return False
         return True
 
-    def inc(self, name: str, n: int = 1):
+    def _get(self, name: str, expected_type, labels: Optional[Dict]):
         """
-        Increment the metric (counter) `name` by `n`.
+        Get the metric `name`, or its child for `labels`.
+
+        Returns
+        -------
+        Counter, Gauge, Histogram, Enum or None
+            None if the metric does not exist or does not match the labels.
+        """
+        if not self._metric_exists(name, expected_type):
+            return None
+        metric = self._metrics[name]
+        if labels is None and not metric._labelnames:
+            return metric
+        try:
+            return metric.labels(**(labels or {}))
+        except ValueError as err:
+            self._report(
+                name, "Metric labels mismatch", {"name": name, "reason": str(err)}
+            )
+            return None
+
+    def inc(self, name: str, n: int = 1, labels: Optional[Dict[str, str]] = None):
+        """
+        Increment the metric (counter or gauge) `name` by `n`.
 
         Parameters
         ----------
         name : str
             Name of the metric to increment.
         n : int, default 1
-            Increment the counter by `n`.
+            Increment the metric by `n`.
+        labels : dict, optional
+            Label values, for labeled metrics.
         """
         if self.activated:
-            if self._metric_exists(name, Counter):
-                self._metrics[name].inc(n)
+            from prometheus_client import Counter, Gauge
+
+            metric = self._get(name, (Counter, Gauge), labels)
+            if metric is not None:
+                metric.inc(n)
+
+    def dec(self, name: str, n: int = 1, labels: Optional[Dict[str, str]] = None):
+        """
+        Decrement the metric (gauge) `name` by `n`.
+
+        Parameters
+        ----------
+        name : str
+            Name of the metric to decrement.
+        n : int, default 1
+            Decrement the gauge by `n`.
+        labels : dict, optional
+            Label values, for labeled metrics.
+        """
+        if self.activated:
+            from prometheus_client import Gauge
+
+            metric = self._get(name, Gauge, labels)
+            if metric is not None:
+                metric.dec(n)
+
+    def set(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        """
+        Set the metric (gauge) `name` to `value`.
+
+        Parameters
+        ----------
+        name : str
+            Name of the metric to set.
+        value : float
+            Value of the gauge.
+        labels : dict, optional
+            Label values, for labeled metrics.
+        """
+        if self.activated:
+            from prometheus_client import Gauge
+
+            metric = self._get(name, Gauge, labels)
+            if metric is not None:
+                metric.set(value)
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        """
+        Observe `value` in the metric (histogram) `name`.
+
+        Parameters
+        ----------
+        name : str
+            Name of the metric to observe.
+        value : float
+            Observed value.
+        labels : dict, optional
+            Label values, for labeled metrics.
+        """
+        if self.activated:
+            from prometheus_client import Histogram
+
+            metric = self._get(name, Histogram, labels)
+            if metric is not None:
+                metric.observe(value)
 
     def state(self, state: str, name: str = "state"):
         """
@@ -141,5 +380,8 @@ class OpenCTIMetricHandler:
             Name of the metric to set.
         """
         if self.activated:
-            if self._metric_exists(name, Enum):
-                self._metrics[name].state(state)
+            from prometheus_client import Enum
+
+            metric = self._get(name, Enum, None)
+            if metric is not None:
+                metric.state(state)
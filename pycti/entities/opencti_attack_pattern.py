@@ -1,9 +1,9 @@
 # coding: utf-8
 
 import json
-import uuid
 
-from stix2.canonicalization.Canonicalize import canonicalize
+from pycti.utils.opencti_stix2_extensions import extension_view
+from pycti.utils.opencti_stix2_identifier import generate_standard_id
 
 
 class AttackPattern:
@@ -256,9 +256,7 @@ class AttackPattern:
             data = {"x_mitre_id": x_mitre_id.strip()}
         else:
             data = {"name": name.lower().strip()}
-        data = canonicalize(data, utf8=False)
-        id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-        return "attack-pattern--" + id
+        return generate_standard_id("attack-pattern", data)
 
     @staticmethod
     def generate_id_from_data(data):
@@ -300,7 +298,8 @@ class AttackPattern:
         with_files = kwargs.get("withFiles", False)
 
         self.opencti.app_logger.info(
-            "Listing Attack-Patterns with filters", {"filters": json.dumps(filters)}
+            "Listing Attack-Patterns with filters",
+            lambda: {"filters": json.dumps(filters)},
         )
         query = (
             """
@@ -400,7 +399,7 @@ class AttackPattern:
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(result["data"]["attackPattern"])
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, first=1)
             if len(result) > 0:
                 return result[0]
             else:
@@ -503,17 +502,13 @@ class AttackPattern:
         extras = kwargs.get("extras", {})
         update = kwargs.get("update", False)
         if stix_object is not None:
+            extensions = extension_view(stix_object, extras)
             # Extract external ID
             x_mitre_id = None
             if "x_mitre_id" in stix_object:
                 x_mitre_id = stix_object["x_mitre_id"]
-            elif (
-                self.opencti.get_attribute_in_mitre_extension("id", stix_object)
-                is not None
-            ):
-                x_mitre_id = self.opencti.get_attribute_in_mitre_extension(
-                    "id", stix_object
-                )
+            elif extensions.get_mitre("id") is not None:
+                x_mitre_id = extensions.get_mitre("id")
             elif "external_references" in stix_object:
                 for external_reference in stix_object["external_references"]:
                     if external_reference["source_name"].startswith("mitre-"):
@@ -526,41 +521,24 @@ class AttackPattern:
             # Search in extensions
             if "x_opencti_order" not in stix_object:
                 stix_object["x_opencti_order"] = (
-                    self.opencti.get_attribute_in_extension("order", stix_object)
-                    if self.opencti.get_attribute_in_extension("order", stix_object)
-                    is not None
+                    extensions.get("order")
+                    if extensions.get("order") is not None
                     else 0
                 )
             if "x_mitre_platforms" not in stix_object:
-                stix_object["x_mitre_platforms"] = (
-                    self.opencti.get_attribute_in_mitre_extension(
-                        "platforms", stix_object
-                    )
-                )
+                stix_object["x_mitre_platforms"] = extensions.get_mitre("platforms")
             if "x_mitre_permissions_required" not in stix_object:
-                stix_object["x_mitre_permissions_required"] = (
-                    self.opencti.get_attribute_in_mitre_extension(
-                        "permissions_required", stix_object
-                    )
+                stix_object["x_mitre_permissions_required"] = extensions.get_mitre(
+                    "permissions_required"
                 )
             if "x_mitre_detection" not in stix_object:
-                stix_object["x_mitre_detection"] = (
-                    self.opencti.get_attribute_in_mitre_extension(
-                        "detection", stix_object
-                    )
-                )
+                stix_object["x_mitre_detection"] = extensions.get_mitre("detection")
             if "x_opencti_stix_ids" not in stix_object:
-                stix_object["x_opencti_stix_ids"] = (
-                    self.opencti.get_attribute_in_extension("stix_ids", stix_object)
-                )
+                stix_object["x_opencti_stix_ids"] = extensions.get("stix_ids")
             if "x_opencti_granted_refs" not in stix_object:
-                stix_object["x_opencti_granted_refs"] = (
-                    self.opencti.get_attribute_in_extension("granted_refs", stix_object)
-                )
+                stix_object["x_opencti_granted_refs"] = extensions.get("granted_refs")
             if "x_opencti_workflow_id" not in stix_object:
-                stix_object["x_opencti_workflow_id"] = (
-                    self.opencti.get_attribute_in_extension("workflow_id", stix_object)
-                )
+                stix_object["x_opencti_workflow_id"] = extensions.get("workflow_id")
 
             return self.create(
                 stix_id=stix_object["id"],
@@ -1,9 +1,9 @@
 # coding: utf-8
 
 import json
-import uuid
 
-from stix2.canonicalization.Canonicalize import canonicalize
+from pycti.utils.opencti_stix2_extensions import extension_view
+from pycti.utils.opencti_stix2_identifier import generate_standard_id
 
 
 class Campaign:
@@ -240,9 +240,7 @@ class Campaign:
         """
         name = name.lower().strip()
         data = {"name": name}
-        data = canonicalize(data, utf8=False)
-        id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-        return "campaign--" + id
+        return generate_standard_id("campaign", data)
 
     @staticmethod
     def generate_id_from_data(data):
@@ -283,7 +281,7 @@ class Campaign:
         with_files = kwargs.get("withFiles", False)
 
         self.opencti.app_logger.info(
-            "Listing Campaigns with filters", {"filters": json.dumps(filters)}
+            "Listing Campaigns with filters", lambda: {"filters": json.dumps(filters)}
         )
         query = (
             """
@@ -381,7 +379,7 @@ class Campaign:
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(result["data"]["campaign"])
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, first=1)
             if len(result) > 0:
                 return result[0]
             else:
@@ -478,19 +476,14 @@ class Campaign:
         extras = kwargs.get("extras", {})
         update = kwargs.get("update", False)
         if stix_object is not None:
+            extensions = extension_view(stix_object, extras)
             # Search in extensions
             if "x_opencti_stix_ids" not in stix_object:
-                stix_object["x_opencti_stix_ids"] = (
-                    self.opencti.get_attribute_in_extension("stix_ids", stix_object)
-                )
+                stix_object["x_opencti_stix_ids"] = extensions.get("stix_ids")
             if "x_opencti_granted_refs" not in stix_object:
-                stix_object["x_opencti_granted_refs"] = (
-                    self.opencti.get_attribute_in_extension("granted_refs", stix_object)
-                )
+                stix_object["x_opencti_granted_refs"] = extensions.get("granted_refs")
             if "x_opencti_workflow_id" not in stix_object:
-                stix_object["x_opencti_workflow_id"] = (
-                    self.opencti.get_attribute_in_extension("workflow_id", stix_object)
-                )
+                stix_object["x_opencti_workflow_id"] = extensions.get("workflow_id")
 
             return self.create(
                 stix_id=stix_object["id"],
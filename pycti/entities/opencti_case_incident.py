@@ -1,9 +1,10 @@
 import datetime
 import json
-import uuid
 
 from dateutil.parser import parse
-from stix2.canonicalization.Canonicalize import canonicalize
+
+from pycti.utils.opencti_stix2_extensions import extension_view
+from pycti.utils.opencti_stix2_identifier import generate_standard_id
 
 
 class CaseIncident:
@@ -480,9 +481,7 @@ class CaseIncident:
         if isinstance(created, datetime.datetime):
             created = created.isoformat()
         data = {"name": name, "created": created}
-        data = canonicalize(data, utf8=False)
-        id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-        return "case-incident--" + id
+        return generate_standard_id("case-incident", data)
 
     @staticmethod
     def generate_id_from_data(data):
@@ -511,7 +510,8 @@ class CaseIncident:
         with_files = kwargs.get("withFiles", False)
 
         self.opencti.app_logger.info(
-            "Listing Case Incidents with filters", {"filters": json.dumps(filters)}
+            "Listing Case Incidents with filters",
+            lambda: {"filters": json.dumps(filters)},
         )
         query = (
             """
@@ -609,7 +609,7 @@ class CaseIncident:
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(result["data"]["caseIncident"])
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, first=1)
             if len(result) > 0:
                 return result[0]
             else:
@@ -873,34 +873,23 @@ class CaseIncident:
         extras = kwargs.get("extras", {})
         update = kwargs.get("update", False)
         if stix_object is not None:
+            extensions = extension_view(stix_object, extras)
             # Search in extensions
             if "x_opencti_stix_ids" not in stix_object:
-                stix_object["x_opencti_stix_ids"] = (
-                    self.opencti.get_attribute_in_extension("stix_ids", stix_object)
-                )
+                stix_object["x_opencti_stix_ids"] = extensions.get("stix_ids")
             if "x_opencti_granted_refs" not in stix_object:
-                stix_object["x_opencti_granted_refs"] = (
-                    self.opencti.get_attribute_in_extension("granted_refs", stix_object)
-                )
+                stix_object["x_opencti_granted_refs"] = extensions.get("granted_refs")
             if "x_opencti_workflow_id" not in stix_object:
-                stix_object["x_opencti_workflow_id"] = (
-                    self.opencti.get_attribute_in_extension("workflow_id", stix_object)
-                )
+                stix_object["x_opencti_workflow_id"] = extensions.get("workflow_id")
             if "x_opencti_content" not in stix_object or "content" not in stix_object:
-                stix_object["content"] = self.opencti.get_attribute_in_extension(
-                    "content", stix_object
-                )
+                stix_object["content"] = extensions.get("content")
             if "x_opencti_content" in stix_object:
                 stix_object["content"] = stix_object["x_opencti_content"]
             if "x_opencti_assignee_ids" not in stix_object:
-                stix_object["x_opencti_assignee_ids"] = (
-                    self.opencti.get_attribute_in_extension("assignee_ids", stix_object)
-                )
+                stix_object["x_opencti_assignee_ids"] = extensions.get("assignee_ids")
             if "x_opencti_participant_ids" not in stix_object:
-                stix_object["x_opencti_participant_ids"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "participant_ids", stix_object
-                    )
+                stix_object["x_opencti_participant_ids"] = extensions.get(
+                    "participant_ids"
                 )
             return self.create(
                 stix_id=stix_object["id"],
@@ -1,9 +1,9 @@
 # coding: utf-8
 
 import json
-import uuid
 
-from stix2.canonicalization.Canonicalize import canonicalize
+from pycti.utils.opencti_stix2_extensions import extension_view
+from pycti.utils.opencti_stix2_identifier import generate_standard_id
 
 
 class CourseOfAction:
@@ -223,9 +223,7 @@ class CourseOfAction:
             data = {"x_mitre_id": x_mitre_id}
         else:
             data = {"name": name.lower().strip()}
-        data = canonicalize(data, utf8=False)
-        id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-        return "course-of-action--" + id
+        return generate_standard_id("course-of-action", data)
 
     @staticmethod
     def generate_id_from_data(data):
@@ -254,7 +252,8 @@ class CourseOfAction:
         with_files = kwargs.get("withFiles", False)
 
         self.opencti.app_logger.info(
-            "Listing Courses-Of-Action with filters", {"filters": json.dumps(filters)}
+            "Listing Courses-Of-Action with filters",
+            lambda: {"filters": json.dumps(filters)},
         )
         query = (
             """
@@ -356,7 +355,7 @@ class CourseOfAction:
                 result["data"]["courseOfAction"]
             )
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, first=1)
             if len(result) > 0:
                 return result[0]
             else:
@@ -451,17 +450,13 @@ class CourseOfAction:
         extras = kwargs.get("extras", {})
         update = kwargs.get("update", False)
         if stix_object is not None:
+            extensions = extension_view(stix_object, extras)
             # Extract external ID
             x_mitre_id = None
             if "x_mitre_id" in stix_object:
                 x_mitre_id = stix_object["x_mitre_id"]
-            elif (
-                self.opencti.get_attribute_in_mitre_extension("id", stix_object)
-                is not None
-            ):
-                x_mitre_id = self.opencti.get_attribute_in_mitre_extension(
-                    "id", stix_object
-                )
+            elif extensions.get_mitre("id") is not None:
+                x_mitre_id = extensions.get_mitre("id")
             elif "external_references" in stix_object:
                 for external_reference in stix_object["external_references"]:
                     if (
@@ -474,21 +469,13 @@ class CourseOfAction:
 
             # Search in extensions
             if "x_opencti_aliases" not in stix_object:
-                stix_object["x_opencti_aliases"] = (
-                    self.opencti.get_attribute_in_extension("aliases", stix_object)
-                )
+                stix_object["x_opencti_aliases"] = extensions.get("aliases")
             if "x_opencti_stix_ids" not in stix_object:
-                stix_object["x_opencti_stix_ids"] = (
-                    self.opencti.get_attribute_in_extension("stix_ids", stix_object)
-                )
+                stix_object["x_opencti_stix_ids"] = extensions.get("stix_ids")
             if "x_opencti_granted_refs" not in stix_object:
-                stix_object["x_opencti_granted_refs"] = (
-                    self.opencti.get_attribute_in_extension("granted_refs", stix_object)
-                )
+                stix_object["x_opencti_granted_refs"] = extensions.get("granted_refs")
             if "x_opencti_workflow_id" not in stix_object:
-                stix_object["x_opencti_workflow_id"] = (
-                    self.opencti.get_attribute_in_extension("workflow_id", stix_object)
-                )
+                stix_object["x_opencti_workflow_id"] = extensions.get("workflow_id")
 
             return self.create(
                 stix_id=stix_object["id"],
@@ -1,9 +1,9 @@
 # coding: utf-8
 
 import json
-import uuid
 
-from stix2.canonicalization.Canonicalize import canonicalize
+from pycti.utils.opencti_stix2_extensions import extension_view
+from pycti.utils.opencti_stix2_identifier import generate_standard_id
 
 
 class DataSource:
@@ -223,9 +223,7 @@ class DataSource:
     def generate_id(name):
         name = name.lower().strip()
         data = {"name": name}
-        data = canonicalize(data, utf8=False)
-        id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-        return "data-source--" + id
+        return generate_standard_id("data-source", data)
 
     @staticmethod
     def generate_id_from_data(data):
@@ -254,7 +252,8 @@ class DataSource:
         with_files = kwargs.get("withFiles", False)
 
         self.opencti.app_logger.info(
-            "Listing Data-Sources with filters", {"filters": json.dumps(filters)}
+            "Listing Data-Sources with filters",
+            lambda: {"filters": json.dumps(filters)},
         )
         query = (
             """
@@ -352,7 +351,7 @@ class DataSource:
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(result["data"]["dataSource"])
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, first=1)
             if len(result) > 0:
                 return result[0]
             else:
@@ -449,6 +448,7 @@ class DataSource:
         update = kwargs.get("update", False)
 
         if stix_object is not None:
+            extensions = extension_view(stix_object, extras)
             # Handle x-mitre-
             if (
                 stix_object["type"] == "x-mitre-data-source"
@@ -465,17 +465,11 @@ class DataSource:
 
             # Search in extensions
             if "x_opencti_stix_ids" not in stix_object:
-                stix_object["x_opencti_stix_ids"] = (
-                    self.opencti.get_attribute_in_extension("stix_ids", stix_object)
-                )
+                stix_object["x_opencti_stix_ids"] = extensions.get("stix_ids")
             if "x_opencti_granted_refs" not in stix_object:
-                stix_object["x_opencti_granted_refs"] = (
-                    self.opencti.get_attribute_in_extension("granted_refs", stix_object)
-                )
+                stix_object["x_opencti_granted_refs"] = extensions.get("granted_refs")
             if "x_opencti_workflow_id" not in stix_object:
-                stix_object["x_opencti_workflow_id"] = (
-                    self.opencti.get_attribute_in_extension("workflow_id", stix_object)
-                )
+                stix_object["x_opencti_workflow_id"] = extensions.get("workflow_id")
 
             return self.opencti.data_source.create(
                 stix_id=stix_object["id"],
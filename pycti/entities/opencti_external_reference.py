@@ -2,10 +2,8 @@
 
 import json
 import os
-import uuid
 
-import magic
-from stix2.canonicalization.Canonicalize import canonicalize
+from pycti.utils.opencti_stix2_identifier import generate_standard_id
 
 
 class ExternalReference:
@@ -72,9 +70,7 @@ class ExternalReference:
             data = {"source_name": source_name, "external_id": external_id}
         else:
             return None
-        data = canonicalize(data, utf8=False)
-        id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-        return "external-reference--" + id
+        return generate_standard_id("external-reference", data)
 
     @staticmethod
     def generate_id_from_data(data):
@@ -103,7 +99,8 @@ class ExternalReference:
         with_files = kwargs.get("withFiles", False)
 
         self.opencti.app_logger.info(
-            "Listing External-Reference with filters", {"filters": json.dumps(filters)}
+            "Listing External-Reference with filters",
+            lambda: {"filters": json.dumps(filters)},
         )
         query = (
             """
@@ -199,7 +196,7 @@ class ExternalReference:
                 result["data"]["externalReference"]
             )
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, first=1)
             if len(result) > 0:
                 return result[0]
             else:
@@ -302,6 +299,8 @@ class ExternalReference:
                 if file_name.endswith(".json"):
                     mime_type = "application/json"
                 else:
+                    import magic
+
                     mime_type = magic.from_file(file_name, mime=True)
             self.opencti.app_logger.info(
                 "Uploading a file in Stix-Domain-Object",
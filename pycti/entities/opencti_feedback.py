@@ -1,8 +1,9 @@
 import json
-import uuid
 
 from dateutil.parser import parse
-from stix2.canonicalization.Canonicalize import canonicalize
+
+from pycti.utils.opencti_stix2_extensions import extension_view
+from pycti.utils.opencti_stix2_identifier import generate_standard_id
 
 
 class Feedback:
@@ -438,9 +439,7 @@ class Feedback:
     def generate_id(name):
         name = name.lower().strip()
         data = {"name": name}
-        data = canonicalize(data, utf8=False)
-        id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-        return "feedback--" + id
+        return generate_standard_id("feedback", data)
 
     @staticmethod
     def generate_id_from_data(data):
@@ -469,7 +468,7 @@ class Feedback:
         with_files = kwargs.get("withFiles", False)
 
         self.opencti.app_logger.info(
-            "Listing Feedbacks with filters", {"filters": json.dumps(filters)}
+            "Listing Feedbacks with filters", lambda: {"filters": json.dumps(filters)}
         )
         query = (
             """
@@ -567,7 +566,7 @@ class Feedback:
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(result["data"]["feedback"])
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, first=1)
             if len(result) > 0:
                 return result[0]
             else:
@@ -715,7 +714,9 @@ class Feedback:
             self.opencti.app_logger.error("[opencti_feedback] Missing parameters: name")
 
     def update_field(self, **kwargs):
-        self.opencti.app_logger.info("Updating Feedback", {"data": json.dumps(kwargs)})
+        self.opencti.app_logger.info(
+            "Updating Feedback", lambda: {"data": json.dumps(kwargs)}
+        )
         id = kwargs.get("id", None)
         input = kwargs.get("input", None)
         if id is not None and input is not None:
@@ -846,19 +847,14 @@ class Feedback:
         extras = kwargs.get("extras", {})
         update = kwargs.get("update", False)
         if stix_object is not None:
+            extensions = extension_view(stix_object, extras)
             # Search in extensions
             if "x_opencti_stix_ids" not in stix_object:
-                stix_object["x_opencti_stix_ids"] = (
-                    self.opencti.get_attribute_in_extension("stix_ids", stix_object)
-                )
+                stix_object["x_opencti_stix_ids"] = extensions.get("stix_ids")
             if "x_opencti_granted_refs" not in stix_object:
-                stix_object["x_opencti_granted_refs"] = (
-                    self.opencti.get_attribute_in_extension("granted_refs", stix_object)
-                )
+                stix_object["x_opencti_granted_refs"] = extensions.get("granted_refs")
             if "x_opencti_workflow_id" not in stix_object:
-                stix_object["x_opencti_workflow_id"] = (
-                    self.opencti.get_attribute_in_extension("workflow_id", stix_object)
-                )
+                stix_object["x_opencti_workflow_id"] = extensions.get("workflow_id")
 
             return self.create(
                 stix_id=stix_object["id"],
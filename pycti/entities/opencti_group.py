@@ -222,7 +222,10 @@ class Group:
             return self.opencti.process_multiple_fields(result["data"]["group"])
         elif filters is not None or search is not None:
             results = self.list(
-                filters=filters, search=search, customAttributes=custom_attributes
+                filters=filters,
+                search=search,
+                first=1,
+                customAttributes=custom_attributes,
             )
             return results[0] if results else None
         else:
@@ -1,11 +1,10 @@
 # coding: utf-8
 
 import json
-import uuid
-
-from stix2.canonicalization.Canonicalize import canonicalize
 
 from pycti.utils.constants import IdentityTypes
+from pycti.utils.opencti_stix2_extensions import extension_view
+from pycti.utils.opencti_stix2_identifier import generate_standard_id
 
 
 class Identity:
@@ -275,9 +274,7 @@ class Identity:
         :rtype: str
         """
         data = {"name": name.lower().strip(), "identity_class": identity_class.lower()}
-        data = canonicalize(data, utf8=False)
-        id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-        return "identity--" + id
+        return generate_standard_id("identity", data)
 
     @staticmethod
     def generate_id_from_data(data):
@@ -320,7 +317,7 @@ class Identity:
         with_files = kwargs.get("withFiles", False)
 
         self.opencti.app_logger.info(
-            "Listing Identities with filters", {"filters": json.dumps(filters)}
+            "Listing Identities with filters", lambda: {"filters": json.dumps(filters)}
         )
         query = (
             """
@@ -419,7 +416,7 @@ class Identity:
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(result["data"]["identity"])
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, first=1)
             if len(result) > 0:
                 return result[0]
             else:
@@ -593,6 +590,7 @@ class Identity:
         extras = kwargs.get("extras", {})
         update = kwargs.get("update", False)
         if stix_object is not None:
+            extensions = extension_view(stix_object, extras)
             type = "Organization"
             if "identity_class" in stix_object:
                 if stix_object["identity_class"] == "individual":
@@ -606,55 +604,33 @@ class Identity:
 
             # Search in extensions
             if "x_opencti_aliases" not in stix_object:
-                stix_object["x_opencti_aliases"] = (
-                    self.opencti.get_attribute_in_extension("aliases", stix_object)
-                )
+                stix_object["x_opencti_aliases"] = extensions.get("aliases")
             if "x_opencti_organization_type" not in stix_object:
-                stix_object["x_opencti_organization_type"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "organization_type", stix_object
-                    )
+                stix_object["x_opencti_organization_type"] = extensions.get(
+                    "organization_type"
                 )
             if "security_platform_type" not in stix_object:
-                stix_object["security_platform_type"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "security_platform_type", stix_object
-                    )
+                stix_object["security_platform_type"] = extensions.get(
+                    "security_platform_type"
                 )
             if "x_opencti_reliability" not in stix_object:
-                stix_object["x_opencti_reliability"] = (
-                    self.opencti.get_attribute_in_extension("reliability", stix_object)
-                )
+                stix_object["x_opencti_reliability"] = extensions.get("reliability")
             if "x_opencti_score" not in stix_object:
-                stix_object["x_opencti_score"] = (
-                    self.opencti.get_attribute_in_extension("score", stix_object)
-                )
+                stix_object["x_opencti_score"] = extensions.get("score")
             if "x_opencti_organization_type" not in stix_object:
-                stix_object["x_opencti_organization_type"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "organization_type", stix_object
-                    )
+                stix_object["x_opencti_organization_type"] = extensions.get(
+                    "organization_type"
                 )
             if "x_opencti_firstname" not in stix_object:
-                stix_object["x_opencti_firstname"] = (
-                    self.opencti.get_attribute_in_extension("firstname", stix_object)
-                )
+                stix_object["x_opencti_firstname"] = extensions.get("firstname")
             if "x_opencti_lastname" not in stix_object:
-                stix_object["x_opencti_lastname"] = (
-                    self.opencti.get_attribute_in_extension("lastname", stix_object)
-                )
+                stix_object["x_opencti_lastname"] = extensions.get("lastname")
             if "x_opencti_stix_ids" not in stix_object:
-                stix_object["x_opencti_stix_ids"] = (
-                    self.opencti.get_attribute_in_extension("stix_ids", stix_object)
-                )
+                stix_object["x_opencti_stix_ids"] = extensions.get("stix_ids")
             if "x_opencti_granted_refs" not in stix_object:
-                stix_object["x_opencti_granted_refs"] = (
-                    self.opencti.get_attribute_in_extension("granted_refs", stix_object)
-                )
+                stix_object["x_opencti_granted_refs"] = extensions.get("granted_refs")
             if "x_opencti_workflow_id" not in stix_object:
-                stix_object["x_opencti_workflow_id"] = (
-                    self.opencti.get_attribute_in_extension("workflow_id", stix_object)
-                )
+                stix_object["x_opencti_workflow_id"] = extensions.get("workflow_id")
 
             return self.create(
                 type=type,
@@ -1,9 +1,9 @@
 # coding: utf-8
 
 import json
-import uuid
 
-from stix2.canonicalization.Canonicalize import canonicalize
+from pycti.utils.opencti_stix2_extensions import extension_view
+from pycti.utils.opencti_stix2_identifier import generate_standard_id
 
 from .indicator.opencti_indicator_properties import (
     INDICATOR_PROPERTIES,
@@ -32,9 +32,7 @@ class Indicator:
         :rtype: str
         """
         data = {"pattern": pattern.strip()}
-        data = canonicalize(data, utf8=False)
-        id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-        return "indicator--" + id
+        return generate_standard_id("indicator", data)
 
     @staticmethod
     def generate_id_from_data(data):
@@ -81,7 +79,7 @@ class Indicator:
         to_stix = kwargs.get("toStix", False)
 
         self.opencti.app_logger.info(
-            "Listing Indicators with filters", {"filters": json.dumps(filters)}
+            "Listing Indicators with filters", lambda: {"filters": json.dumps(filters)}
         )
         query = (
             """
@@ -192,7 +190,9 @@ class Indicator:
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(result["data"]["indicator"])
         elif filters is not None:
-            result = self.list(filters=filters, customAttributes=custom_attributes)
+            result = self.list(
+                filters=filters, first=1, customAttributes=custom_attributes
+            )
             if len(result) > 0:
                 return result[0]
             else:
@@ -420,51 +420,31 @@ class Indicator:
         extras = kwargs.get("extras", {})
         update = kwargs.get("update", False)
         if stix_object is not None:
+            extensions = extension_view(stix_object, extras)
             # Search in extensions
             if "x_opencti_score" not in stix_object:
-                stix_object["x_opencti_score"] = (
-                    self.opencti.get_attribute_in_extension("score", stix_object)
-                )
+                stix_object["x_opencti_score"] = extensions.get("score")
             if "x_opencti_detection" not in stix_object:
-                stix_object["x_opencti_detection"] = (
-                    self.opencti.get_attribute_in_extension("detection", stix_object)
-                )
+                stix_object["x_opencti_detection"] = extensions.get("detection")
             if (
                 "x_opencti_main_observable_type" not in stix_object
-                and self.opencti.get_attribute_in_extension(
-                    "main_observable_type", stix_object
-                )
-                is not None
+                and extensions.get("main_observable_type") is not None
             ):
-                stix_object["x_opencti_main_observable_type"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "main_observable_type", stix_object
-                    )
+                stix_object["x_opencti_main_observable_type"] = extensions.get(
+                    "main_observable_type"
                 )
             if "x_opencti_create_observables" not in stix_object:
-                stix_object["x_opencti_create_observables"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "create_observables", stix_object
-                    )
+                stix_object["x_opencti_create_observables"] = extensions.get(
+                    "create_observables"
                 )
             if "x_opencti_stix_ids" not in stix_object:
-                stix_object["x_opencti_stix_ids"] = (
-                    self.opencti.get_attribute_in_extension("stix_ids", stix_object)
-                )
+                stix_object["x_opencti_stix_ids"] = extensions.get("stix_ids")
             if "x_opencti_granted_refs" not in stix_object:
-                stix_object["x_opencti_granted_refs"] = (
-                    self.opencti.get_attribute_in_extension("granted_refs", stix_object)
-                )
+                stix_object["x_opencti_granted_refs"] = extensions.get("granted_refs")
             if "x_opencti_workflow_id" not in stix_object:
-                stix_object["x_opencti_workflow_id"] = (
-                    self.opencti.get_attribute_in_extension("workflow_id", stix_object)
-                )
+                stix_object["x_opencti_workflow_id"] = extensions.get("workflow_id")
             if "x_mitre_platforms" not in stix_object:
-                stix_object["x_mitre_platforms"] = (
-                    self.opencti.get_attribute_in_mitre_extension(
-                        "platforms", stix_object
-                    )
-                )
+                stix_object["x_mitre_platforms"] = extensions.get_mitre("platforms")
 
             return self.create(
                 stix_id=stix_object["id"],
@@ -1,9 +1,9 @@
 # coding: utf-8
 
 import json
-import uuid
 
-from stix2.canonicalization.Canonicalize import canonicalize
+from pycti.utils.opencti_stix2_extensions import extension_view
+from pycti.utils.opencti_stix2_identifier import generate_standard_id
 
 
 class Infrastructure:
@@ -251,9 +251,7 @@ class Infrastructure:
     def generate_id(name):
         name = name.lower().strip()
         data = {"name": name}
-        data = canonicalize(data, utf8=False)
-        id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-        return "infrastructure--" + id
+        return generate_standard_id("infrastructure", data)
 
     @staticmethod
     def generate_id_from_data(data):
@@ -288,7 +286,8 @@ class Infrastructure:
         with_files = kwargs.get("withFiles", False)
 
         self.opencti.app_logger.info(
-            "Listing Infrastructures with filters", {"filters": json.dumps(filters)}
+            "Listing Infrastructures with filters",
+            lambda: {"filters": json.dumps(filters)},
         )
         query = (
             """
@@ -396,7 +395,9 @@ class Infrastructure:
                 result["data"]["infrastructure"]
             )
         elif filters is not None:
-            result = self.list(filters=filters, customAttributes=custom_attributes)
+            result = self.list(
+                filters=filters, first=1, customAttributes=custom_attributes
+            )
             if len(result) > 0:
                 return result[0]
             else:
@@ -498,19 +499,14 @@ class Infrastructure:
         extras = kwargs.get("extras", {})
         update = kwargs.get("update", False)
         if stix_object is not None:
+            extensions = extension_view(stix_object, extras)
             # Search in extensions
             if "x_opencti_stix_ids" not in stix_object:
-                stix_object["x_opencti_stix_ids"] = (
-                    self.opencti.get_attribute_in_extension("stix_ids", stix_object)
-                )
+                stix_object["x_opencti_stix_ids"] = extensions.get("stix_ids")
             if "x_opencti_granted_refs" not in stix_object:
-                stix_object["x_opencti_granted_refs"] = (
-                    self.opencti.get_attribute_in_extension("granted_refs", stix_object)
-                )
+                stix_object["x_opencti_granted_refs"] = extensions.get("granted_refs")
             if "x_opencti_workflow_id" not in stix_object:
-                stix_object["x_opencti_workflow_id"] = (
-                    self.opencti.get_attribute_in_extension("workflow_id", stix_object)
-                )
+                stix_object["x_opencti_workflow_id"] = extensions.get("workflow_id")
 
             return self.create(
                 stix_id=stix_object["id"],
@@ -58,7 +58,8 @@ class KillChainPhase:
         with_pagination = kwargs.get("withPagination", False)
 
         self.opencti.app_logger.info(
-            "Listing Kill-Chain-Phase with filters", {"filters": json.dumps(filters)}
+            "Listing Kill-Chain-Phase with filters",
+            lambda: {"filters": json.dumps(filters)},
         )
         query = (
             """
@@ -125,7 +126,7 @@ class KillChainPhase:
                 result["data"]["killChainPhase"]
             )
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, first=1)
             if len(result) > 0:
                 return result[0]
             else:
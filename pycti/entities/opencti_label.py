@@ -1,9 +1,8 @@
 # coding: utf-8
 
 import json
-import uuid
 
-from stix2.canonicalization.Canonicalize import canonicalize
+from pycti.utils.opencti_stix2_identifier import generate_standard_id
 
 
 class Label:
@@ -28,9 +27,7 @@ class Label:
     @staticmethod
     def generate_id(value):
         data = {"value": value}
-        data = canonicalize(data, utf8=False)
-        id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-        return "label--" + id
+        return generate_standard_id("label", data)
 
     """
         List Label objects
@@ -53,7 +50,7 @@ class Label:
         with_pagination = kwargs.get("withPagination", False)
 
         self.opencti.app_logger.info(
-            "Listing Labels with filters", {"filters": json.dumps(filters)}
+            "Listing Labels with filters", lambda: {"filters": json.dumps(filters)}
         )
         query = (
             """
@@ -141,7 +138,7 @@ class Label:
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(result["data"]["label"])
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, first=1)
             if len(result) > 0:
                 return result[0]
             else:
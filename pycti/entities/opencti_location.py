@@ -1,9 +1,9 @@
 # coding: utf-8
 
 import json
-import uuid
 
-from stix2.canonicalization.Canonicalize import canonicalize
+from pycti.utils.opencti_stix2_extensions import extension_view
+from pycti.utils.opencti_stix2_identifier import generate_standard_id
 
 
 class Location:
@@ -247,9 +247,7 @@ class Location:
                 "name": name.lower().strip(),
                 "x_opencti_location_type": x_opencti_location_type,
             }
-        data = canonicalize(data, utf8=False)
-        id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-        return "location--" + id
+        return generate_standard_id("location", data)
 
     @staticmethod
     def generate_id_from_data(data):
@@ -284,7 +282,7 @@ class Location:
         with_files = kwargs.get("withFiles", False)
 
         self.opencti.app_logger.info(
-            "Listing Locations with filters", {"filters": json.dumps(filters)}
+            "Listing Locations with filters", lambda: {"filters": json.dumps(filters)}
         )
         query = (
             """
@@ -361,7 +359,7 @@ class Location:
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(result["data"]["location"])
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, first=1)
             if len(result) > 0:
                 return result[0]
             else:
@@ -468,8 +466,8 @@ class Location:
             return
         if "x_opencti_location_type" in stix_object:
             type = stix_object["x_opencti_location_type"]
-        elif self.opencti.get_attribute_in_extension("type", stix_object) is not None:
-            type = self.opencti.get_attribute_in_extension("type", stix_object)
+        elif extensions.get("type") is not None:
+            type = extensions.get("type")
         else:
             if "city" in stix_object:
                 type = "City"
@@ -480,19 +478,14 @@ class Location:
             else:
                 type = "Position"
         if stix_object is not None:
+            extensions = extension_view(stix_object, extras)
             # Search in extensions
             if "x_opencti_aliases" not in stix_object:
-                stix_object["x_opencti_aliases"] = (
-                    self.opencti.get_attribute_in_extension("aliases", stix_object)
-                )
+                stix_object["x_opencti_aliases"] = extensions.get("aliases")
             if "x_opencti_stix_ids" not in stix_object:
-                stix_object["x_opencti_stix_ids"] = (
-                    self.opencti.get_attribute_in_extension("stix_ids", stix_object)
-                )
+                stix_object["x_opencti_stix_ids"] = extensions.get("stix_ids")
             if "x_opencti_workflow_id" not in stix_object:
-                stix_object["x_opencti_workflow_id"] = (
-                    self.opencti.get_attribute_in_extension("workflow_id", stix_object)
-                )
+                stix_object["x_opencti_workflow_id"] = extensions.get("workflow_id")
 
             return self.create(
                 type=type,
@@ -1,9 +1,9 @@
 # coding: utf-8
 
 import json
-import uuid
 
-from stix2.canonicalization.Canonicalize import canonicalize
+from pycti.utils.opencti_stix2_extensions import extension_view
+from pycti.utils.opencti_stix2_identifier import generate_standard_id
 
 
 class MarkingDefinition:
@@ -47,9 +47,7 @@ class MarkingDefinition:
                 return "marking-definition--5e57c739-391a-4eb3-b6be-7d15ca92d5ed"
         # Generate IDs
         data = {"definition_type": definition_type, "definition": definition}
-        data = canonicalize(data, utf8=False)
-        id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-        return "marking-definition--" + id
+        return generate_standard_id("marking-definition", data)
 
     @staticmethod
     def generate_id_from_data(data):
@@ -76,7 +74,8 @@ class MarkingDefinition:
         with_pagination = kwargs.get("withPagination", False)
 
         self.opencti.app_logger.info(
-            "Listing Marking-Definitions with filters", {"filters": json.dumps(filters)}
+            "Listing Marking-Definitions with filters",
+            lambda: {"filters": json.dumps(filters)},
         )
         query = (
             """
@@ -143,7 +142,7 @@ class MarkingDefinition:
                 result["data"]["markingDefinition"]
             )
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, first=1)
             if len(result) > 0:
                 return result[0]
             else:
@@ -260,6 +259,7 @@ class MarkingDefinition:
         stix_object = kwargs.get("stixObject", None)
         update = kwargs.get("update", False)
         if stix_object is not None:
+            extensions = extension_view(stix_object, extras)
             if (
                 "x_opencti_definition_type" in stix_object
                 and "x_opencti_definition" in stix_object
@@ -311,20 +311,13 @@ class MarkingDefinition:
             # Search in extensions
             if (
                 "x_opencti_order" not in stix_object
-                and self.opencti.get_attribute_in_extension("order", stix_object)
-                is not None
+                and extensions.get("order") is not None
             ):
-                stix_object["x_opencti_order"] = (
-                    self.opencti.get_attribute_in_extension("order", stix_object)
-                )
+                stix_object["x_opencti_order"] = extensions.get("order")
             if "x_opencti_color" not in stix_object:
-                stix_object["x_opencti_color"] = (
-                    self.opencti.get_attribute_in_extension("color", stix_object)
-                )
+                stix_object["x_opencti_color"] = extensions.get("color")
             if "x_opencti_stix_ids" not in stix_object:
-                stix_object["x_opencti_stix_ids"] = (
-                    self.opencti.get_attribute_in_extension("stix_ids", stix_object)
-                )
+                stix_object["x_opencti_stix_ids"] = extensions.get("stix_ids")
 
             return self.opencti.marking_definition.create(
                 stix_id=stix_object["id"],
@@ -1,9 +1,9 @@
 # coding: utf-8
 import datetime
 import json
-import uuid
 
-from stix2.canonicalization.Canonicalize import canonicalize
+from pycti.utils.opencti_stix2_extensions import extension_view
+from pycti.utils.opencti_stix2_identifier import generate_standard_id
 
 
 class Opinion:
@@ -237,9 +237,7 @@ class Opinion:
             data = {"opinion": opinion.strip(), "created": created}
         else:
             data = {"opinion": opinion.strip()}
-        data = canonicalize(data, utf8=False)
-        id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-        return "opinion--" + id
+        return generate_standard_id("opinion", data)
 
     @staticmethod
     def generate_id_from_data(data):
@@ -267,7 +265,7 @@ class Opinion:
         with_pagination = kwargs.get("withPagination", False)
 
         self.opencti.app_logger.info(
-            "Listing Opinions with filters", {"filters": json.dumps(filters)}
+            "Listing Opinions with filters", lambda: {"filters": json.dumps(filters)}
         )
         query = (
             """
@@ -360,7 +358,7 @@ class Opinion:
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(result["data"]["opinion"])
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, first=1)
             if len(result) > 0:
                 return result[0]
             else:
@@ -580,15 +578,12 @@ class Opinion:
         extras = kwargs.get("extras", {})
         update = kwargs.get("update", False)
         if stix_object is not None:
+            extensions = extension_view(stix_object, extras)
             # Search in extensions
             if "x_opencti_stix_ids" not in stix_object:
-                stix_object["x_opencti_stix_ids"] = (
-                    self.opencti.get_attribute_in_extension("stix_ids", stix_object)
-                )
+                stix_object["x_opencti_stix_ids"] = extensions.get("stix_ids")
             if "x_opencti_granted_refs" not in stix_object:
-                stix_object["x_opencti_granted_refs"] = (
-                    self.opencti.get_attribute_in_extension("granted_refs", stix_object)
-                )
+                stix_object["x_opencti_granted_refs"] = extensions.get("granted_refs")
 
             return self.create(
                 stix_id=stix_object["id"],
@@ -1,9 +1,9 @@
 # coding: utf-8
 
 import json
-import uuid
 
-from stix2.canonicalization.Canonicalize import canonicalize
+from pycti.utils.opencti_stix2_extensions import extension_view
+from pycti.utils.opencti_stix2_identifier import generate_standard_id
 
 
 class SecurityCoverage:
@@ -40,9 +40,7 @@ class SecurityCoverage:
     @staticmethod
     def generate_id(covered_ref):
         data = {"covered_ref": covered_ref.lower().strip()}
-        data = canonicalize(data, utf8=False)
-        id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-        return "security-coverage--" + id
+        return generate_standard_id("security-coverage", data)
 
     @staticmethod
     def generate_id_from_data(data):
@@ -70,7 +68,8 @@ class SecurityCoverage:
         with_pagination = kwargs.get("withPagination", False)
 
         self.opencti.app_logger.info(
-            "Listing SecurityCoverage with filters", {"filters": json.dumps(filters)}
+            "Listing SecurityCoverage with filters",
+            lambda: {"filters": json.dumps(filters)},
         )
         query = (
             """
@@ -170,7 +169,7 @@ class SecurityCoverage:
                 result["data"]["securityCoverage"]
             )
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, first=1)
             if len(result) > 0:
                 return result[0]
             else:
@@ -256,15 +255,12 @@ class SecurityCoverage:
         stix_object = kwargs.get("stixObject", None)
         extras = kwargs.get("extras", {})
         if stix_object is not None:
+            extensions = extension_view(stix_object, extras)
             # Search in extensions
             if "x_opencti_stix_ids" not in stix_object:
-                stix_object["x_opencti_stix_ids"] = (
-                    self.opencti.get_attribute_in_extension("stix_ids", stix_object)
-                )
+                stix_object["x_opencti_stix_ids"] = extensions.get("stix_ids")
             if "x_opencti_granted_refs" not in stix_object:
-                stix_object["x_opencti_granted_refs"] = (
-                    self.opencti.get_attribute_in_extension("granted_refs", stix_object)
-                )
+                stix_object["x_opencti_granted_refs"] = extensions.get("granted_refs")
 
             raw_coverages = stix_object["coverage"] if "coverage" in stix_object else []
             coverage_information = list(
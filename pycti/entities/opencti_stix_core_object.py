@@ -1,6 +1,11 @@
 # coding: utf-8
 import json
 
+from pycti.utils.opencti_projection import (
+    STIX_CORE_OBJECT_PROJECTIONS,
+    resolve_projection,
+)
+
 
 class StixCoreObject:
     """Main StixCoreObject class for OpenCTI
@@ -1413,6 +1418,7 @@ class StixCoreObject:
         :param search: the search keyword
         :param first: return the first n rows from the after ID (or the beginning if not set)
         :param after: ID of the first row for pagination
+        :param fields: list of fields or projection level (minimal, standard, full)
         :return List of Stix-Core-Object objects
     """
 
@@ -1424,13 +1430,18 @@ class StixCoreObject:
         after = kwargs.get("after", None)
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
-        custom_attributes = kwargs.get("customAttributes", None)
+        custom_attributes = resolve_projection(
+            kwargs.get("customAttributes", None),
+            kwargs.get("fields", None),
+            STIX_CORE_OBJECT_PROJECTIONS,
+        )
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         with_files = kwargs.get("withFiles", False)
 
         self.opencti.app_logger.info(
-            "Listing Stix-Core-Objects with filters", {"filters": json.dumps(filters)}
+            "Listing Stix-Core-Objects with filters",
+            lambda: {"filters": json.dumps(filters)},
         )
         query = (
             """
@@ -1506,6 +1517,7 @@ class StixCoreObject:
             :param id: the id of the Stix-Core-Object
             :param types: list of Stix Core Entity types
             :param filters: the filters to apply if no id provided
+            :param fields: list of fields or projection level (minimal, standard, full)
             :return Stix-Core-Object object
         """
 
@@ -1513,7 +1525,11 @@ class StixCoreObject:
         id = kwargs.get("id", None)
         types = kwargs.get("types", None)
         filters = kwargs.get("filters", None)
-        custom_attributes = kwargs.get("customAttributes", None)
+        custom_attributes = resolve_projection(
+            kwargs.get("customAttributes", None),
+            kwargs.get("fields", None),
+            STIX_CORE_OBJECT_PROJECTIONS,
+        )
         with_files = kwargs.get("withFiles", False)
         if id is not None:
             self.opencti.app_logger.info("Reading Stix-Core-Object", {"id": id})
@@ -1538,7 +1554,10 @@ class StixCoreObject:
             )
         elif filters is not None:
             result = self.list(
-                types=types, filters=filters, customAttributes=custom_attributes
+                types=types,
+                filters=filters,
+                first=1,
+                customAttributes=custom_attributes,
             )
             if len(result) > 0:
                 return result[0]
@@ -1,9 +1,13 @@
 # coding: utf-8
 
 import datetime
-import uuid
 
-from stix2.canonicalization.Canonicalize import canonicalize
+from pycti.utils.opencti_projection import (
+    STIX_CORE_RELATIONSHIP_PROJECTIONS,
+    resolve_projection,
+)
+from pycti.utils.opencti_stix2_extensions import extension_view
+from pycti.utils.opencti_stix2_identifier import generate_standard_id
 
 
 class StixCoreRelationship:
@@ -373,9 +377,7 @@ class StixCoreRelationship:
                 "source_ref": source_ref,
                 "target_ref": target_ref,
             }
-        data = canonicalize(data, utf8=False)
-        id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-        return "relationship--" + id
+        return generate_standard_id("relationship", data)
 
     """
         List stix_core_relationship objects
@@ -389,6 +391,7 @@ class StixCoreRelationship:
         :param stopTimeStop: the stop_time date stop filter
         :param first: return the first n rows from the after ID (or the beginning if not set)
         :param after: ID of the first row for pagination
+        :param fields: list of fields or projection level (minimal, standard, full)
         :return List of stix_core_relationship objects
     """
 
@@ -419,7 +422,11 @@ class StixCoreRelationship:
         after = kwargs.get("after", None)
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
-        custom_attributes = kwargs.get("customAttributes", None)
+        custom_attributes = resolve_projection(
+            kwargs.get("customAttributes", None),
+            kwargs.get("fields", None),
+            STIX_CORE_RELATIONSHIP_PROJECTIONS,
+        )
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         search = kwargs.get("search", None)
@@ -535,6 +542,7 @@ class StixCoreRelationship:
         :param startTimeStop: the start_time date stop filter
         :param stopTimeStart: the stop_time date start filter
         :param stopTimeStop: the stop_time date stop filter
+        :param fields: list of fields or projection level (minimal, standard, full)
         :return stix_core_relationship object
     """
 
@@ -549,7 +557,11 @@ class StixCoreRelationship:
         stop_time_start = kwargs.get("stopTimeStart", None)
         stop_time_stop = kwargs.get("stopTimeStop", None)
         filters = kwargs.get("filters", None)
-        custom_attributes = kwargs.get("customAttributes", None)
+        custom_attributes = resolve_projection(
+            kwargs.get("customAttributes", None),
+            kwargs.get("fields", None),
+            STIX_CORE_RELATIONSHIP_PROJECTIONS,
+        )
         if id is not None:
             self.opencti.app_logger.info("Reading stix_core_relationship", {"id": id})
             query = (
@@ -572,7 +584,9 @@ class StixCoreRelationship:
                 result["data"]["stixCoreRelationship"]
             )
         elif filters is not None:
-            result = self.list(filters=filters, customAttributes=custom_attributes)
+            result = self.list(
+                filters=filters, first=1, customAttributes=custom_attributes
+            )
             if len(result) > 0:
                 return result[0]
             else:
@@ -580,6 +594,7 @@ class StixCoreRelationship:
         elif from_id is not None and to_id is not None:
             result = self.list(
                 fromOrToId=from_or_to_id,
+                first=1,
                 fromId=from_id,
                 toId=to_id,
                 relationship_type=relationship_type,
@@ -1159,23 +1174,14 @@ class StixCoreRelationship:
         update = kwargs.get("update", False)
         default_date = kwargs.get("defaultDate", False)
         if stix_relation is not None:
+            extensions = extension_view(stix_relation, extras)
             # Search in extensions
             if "x_opencti_stix_ids" not in stix_relation:
-                stix_relation["x_opencti_stix_ids"] = (
-                    self.opencti.get_attribute_in_extension("stix_ids", stix_relation)
-                )
+                stix_relation["x_opencti_stix_ids"] = extensions.get("stix_ids")
             if "x_opencti_granted_refs" not in stix_relation:
-                stix_relation["x_opencti_granted_refs"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "granted_refs", stix_relation
-                    )
-                )
+                stix_relation["x_opencti_granted_refs"] = extensions.get("granted_refs")
             if "x_opencti_workflow_id" not in stix_relation:
-                stix_relation["x_opencti_workflow_id"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "workflow_id", stix_relation
-                    )
-                )
+                stix_relation["x_opencti_workflow_id"] = extensions.get("workflow_id")
 
             raw_coverages = (
                 stix_relation["coverage"] if "coverage" in stix_relation else []
@@ -4,7 +4,10 @@ import base64
 import json
 import os
 
-import magic
+from pycti.utils.opencti_projection import (
+    STIX_CORE_OBJECT_PROJECTIONS,
+    resolve_projection,
+)
 
 from .indicator.opencti_indicator_properties import INDICATOR_PROPERTIES
 from .stix_cyber_observable.opencti_stix_cyber_observable_deprecated import (
@@ -41,6 +44,7 @@ class StixCyberObservable(StixCyberObservableDeprecatedMixin):
         :param search: the search keyword
         :param first: return the first n rows from the after ID (or the beginning if not set)
         :param after: ID of the first row
+        :param fields: list of fields or projection level (minimal, standard, full)
         :return List of StixCyberObservable objects
     """
 
@@ -52,14 +56,18 @@ class StixCyberObservable(StixCyberObservableDeprecatedMixin):
         after = kwargs.get("after", None)
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
-        custom_attributes = kwargs.get("customAttributes", None)
+        custom_attributes = resolve_projection(
+            kwargs.get("customAttributes", None),
+            kwargs.get("fields", None),
+            STIX_CORE_OBJECT_PROJECTIONS,
+        )
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         with_files = kwargs.get("withFiles", False)
 
         self.opencti.app_logger.info(
             "Listing StixCyberObservables with filters",
-            {"filters": json.dumps(filters)},
+            lambda: {"filters": json.dumps(filters)},
         )
         query = (
             """
@@ -136,13 +144,18 @@ class StixCyberObservable(StixCyberObservableDeprecatedMixin):
 
         :param id: the id of the StixCyberObservable
         :param filters: the filters to apply if no id provided
+        :param fields: list of fields or projection level (minimal, standard, full)
         :return StixCyberObservable object
     """
 
     def read(self, **kwargs):
         id = kwargs.get("id", None)
         filters = kwargs.get("filters", None)
-        custom_attributes = kwargs.get("customAttributes", None)
+        custom_attributes = resolve_projection(
+            kwargs.get("customAttributes", None),
+            kwargs.get("fields", None),
+            STIX_CORE_OBJECT_PROJECTIONS,
+        )
         with_files = kwargs.get("withFiles", False)
         if id is not None:
             self.opencti.app_logger.info("Reading StixCyberObservable", {"id": id})
@@ -166,7 +179,9 @@ class StixCyberObservable(StixCyberObservableDeprecatedMixin):
                 result["data"]["stixCyberObservable"]
             )
         elif filters is not None:
-            result = self.list(filters=filters, customAttributes=custom_attributes)
+            result = self.list(
+                filters=filters, first=1, customAttributes=custom_attributes
+            )
             if len(result) > 0:
                 return result[0]
             else:
@@ -212,6 +227,8 @@ class StixCyberObservable(StixCyberObservableDeprecatedMixin):
                 if file_name.endswith(".json"):
                     mime_type = "application/json"
                 else:
+                    import magic
+
                     mime_type = magic.from_file(file_name, mime=True)
             self.opencti.app_logger.info(
                 "Uploading a file in Stix-Cyber-Observable",
@@ -1306,6 +1323,8 @@ class StixCyberObservable(StixCyberObservableDeprecatedMixin):
                 if file_name.endswith(".json"):
                     mime_type = "application/json"
                 else:
+                    import magic
+
                     mime_type = magic.from_file(file_name, mime=True)
 
             result = self.opencti.query(
@@ -2,8 +2,12 @@
 
 import json
 import os
+import re
 
-import magic
+from pycti.utils.opencti_projection import (
+    STIX_CORE_OBJECT_PROJECTIONS,
+    resolve_projection,
+)
 
 
 class StixDomainObject:
@@ -1103,6 +1107,7 @@ class StixDomainObject:
         :param search: the search keyword
         :param first: return the first n rows from the after ID (or the beginning if not set)
         :param after: ID of the first row for pagination
+        :param fields: list of fields or projection level (minimal, standard, full)
         :return List of Stix-Domain-Object objects
     """
 
@@ -1114,13 +1119,18 @@ class StixDomainObject:
         after = kwargs.get("after", None)
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
-        custom_attributes = kwargs.get("customAttributes", None)
+        custom_attributes = resolve_projection(
+            kwargs.get("customAttributes", None),
+            kwargs.get("fields", None),
+            STIX_CORE_OBJECT_PROJECTIONS,
+        )
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         with_files = kwargs.get("withFiles", False)
 
         self.opencti.app_logger.info(
-            "Listing Stix-Domain-Objects with filters", {"filters": json.dumps(filters)}
+            "Listing Stix-Domain-Objects with filters",
+            lambda: {"filters": json.dumps(filters)},
         )
         query = (
             """
@@ -1198,6 +1208,7 @@ class StixDomainObject:
         :param id: the id of the Stix-Domain-Object
         :param types: list of Stix Domain Entity types
         :param filters: the filters to apply if no id provided
+        :param fields: list of fields or projection level (minimal, standard, full)
         :return Stix-Domain-Object object
     """
 
@@ -1205,7 +1216,11 @@ class StixDomainObject:
         id = kwargs.get("id", None)
         types = kwargs.get("types", None)
         filters = kwargs.get("filters", None)
-        custom_attributes = kwargs.get("customAttributes", None)
+        custom_attributes = resolve_projection(
+            kwargs.get("customAttributes", None),
+            kwargs.get("fields", None),
+            STIX_CORE_OBJECT_PROJECTIONS,
+        )
         with_files = kwargs.get("withFiles", False)
         if id is not None:
             self.opencti.app_logger.info("Reading Stix-Domain-Object", {"id": id})
@@ -1230,7 +1245,10 @@ class StixDomainObject:
             )
         elif filters is not None:
             result = self.list(
-                types=types, filters=filters, customAttributes=custom_attributes
+                types=types,
+                filters=filters,
+                first=1,
+                customAttributes=custom_attributes,
             )
             if len(result) > 0:
                 return result[0]
@@ -1257,43 +1275,197 @@ class StixDomainObject:
         name = kwargs.get("name", None)
         aliases = kwargs.get("aliases", [])
         field_name = kwargs.get("fieldName", "aliases")
-        custom_attributes = kwargs.get("customAttributes", None)
+        custom_attributes = resolve_projection(
+            kwargs.get("customAttributes", None),
+            kwargs.get("fields", None),
+            STIX_CORE_OBJECT_PROJECTIONS,
+        )
         object_result = None
         if stix_id is not None:
             object_result = self.read(id=stix_id, customAttributes=custom_attributes)
         if object_result is None and name is not None:
             # TODO: Change this logic and move it to the API.
+            if not self._selects_match_fields(custom_attributes, field_name):
+                return self._get_by_name_sequentially(
+                    types, name, aliases, field_name, custom_attributes
+                )
+            by_name, by_alias = self._resolve_names(
+                [name], aliases, types, field_name, custom_attributes, 100
+            )
+            # The name is matched on the name then on the aliases field, the
+            # aliases on the aliases field only
+            for candidate, resolved in [(name, by_name), (name, by_alias)] + [
+                (alias, by_alias) for alias in aliases
+            ]:
+                if candidate in resolved:
+                    object_result = resolved[candidate]
+                    break
+        return object_result
+
+    def _get_by_name_sequentially(
+        self, types, name, aliases, field_name, custom_attributes
+    ):
+        for key, value in [("name", name), (field_name, name)] + [
+            (field_name, alias) for alias in aliases
+        ]:
             object_result = self.read(
                 types=types,
                 filters={
                     "mode": "and",
-                    "filters": [{"key": "name", "values": [name]}],
+                    "filters": [{"key": key, "values": [value]}],
                     "filterGroups": [],
                 },
                 customAttributes=custom_attributes,
             )
-            if object_result is None:
-                object_result = self.read(
-                    types=types,
-                    filters={
-                        "mode": "and",
-                        "filters": [{"key": field_name, "values": [name]}],
-                        "filterGroups": [],
-                    },
-                    customAttributes=custom_attributes,
+            if object_result is not None:
+                return object_result
+        return None
+
+    @staticmethod
+    def _selects_match_fields(custom_attributes, field_name):
+        """Whether the results of a projection can be matched to names.
+
+        :param custom_attributes: the requested projection, None for the
+            default properties which select the names and aliases
+        :param field_name: the aliases field
+        :return: True if the projection selects the name and aliases fields
+        """
+        if custom_attributes is None:
+            return True
+        selected = set(re.findall(r"\w+", custom_attributes))
+        return "name" in selected and field_name in selected
+
+    """
+        Read many Stix-Domain-Object objects in chunked queries
+
+        :param ids: a list of ids (internal id, standard id or STIX ids)
+        :param types: a list of Stix-Domain-Object types
+        :param chunkSize: the number of ids requested per query
+        :return dict of Stix-Domain-Object objects keyed by requested id
+    """
+
+    def read_many(self, **kwargs):
+        ids = kwargs.get("ids", None) or []
+        types = kwargs.get("types", None)
+        custom_attributes = resolve_projection(
+            kwargs.get("customAttributes", None),
+            kwargs.get("fields", None),
+            STIX_CORE_OBJECT_PROJECTIONS,
+        )
+        chunk_size = kwargs.get("chunkSize", 100)
+        requested = list(dict.fromkeys(ids))
+        results = {}
+        for index in range(0, len(requested), chunk_size):
+            chunk = requested[index : index + chunk_size]
+            data = self.list(
+                types=types,
+                filters={
+                    "mode": "and",
+                    "filters": [{"key": "ids", "values": chunk}],
+                    "filterGroups": [],
+                },
+                first=len(chunk),
+                customAttributes=(
+                    custom_attributes
+                    if custom_attributes is not None
+                    else self.properties
                 )
-                if object_result is None:
-                    for alias in aliases:
-                        object_result = self.read(
-                            types=types,
-                            filters={
-                                "mode": "and",
-                                "filters": [{"key": field_name, "values": [alias]}],
-                                "filterGroups": [],
-                            },
-                            customAttributes=custom_attributes,
-                        )
-        return object_result
+                + "\nx_opencti_stix_ids",
+            )
+            chunk_keys = set(chunk)
+            for item in data:
+                keys = [item.get("id"), item.get("standard_id")] + (
+                    item.get("x_opencti_stix_ids") or []
+                )
+                for key in keys:
+                    if key in chunk_keys and key not in results:
+                        results[key] = item
+        return results
+
+    """
+        Resolve many names or aliases to Stix-Domain-Object objects in chunked queries
+
+        Exact name matches win over matches on the aliases field. Results are
+        matched to the names on the name and aliases fields, if the requested
+        projection selects neither, each name is resolved with its own queries.
+
+        :param names: a list of names or aliases
+        :param types: a list of Stix-Domain-Object types
+        :param fieldName: the aliases field to match (aliases or x_opencti_aliases)
+        :param chunkSize: the number of names requested per query
+        :return dict of Stix-Domain-Object objects keyed by requested name
+    """
+
+    def resolve_names(self, **kwargs):
+        names = kwargs.get("names", None) or []
+        types = kwargs.get("types", None)
+        field_name = kwargs.get("fieldName", "aliases")
+        custom_attributes = resolve_projection(
+            kwargs.get("customAttributes", None),
+            kwargs.get("fields", None),
+            STIX_CORE_OBJECT_PROJECTIONS,
+        )
+        chunk_size = kwargs.get("chunkSize", 100)
+        requested = list(dict.fromkeys(names))
+        if not self._selects_match_fields(custom_attributes, field_name):
+            results = {}
+            for name in requested:
+                object_result = self._get_by_name_sequentially(
+                    types, name, [], field_name, custom_attributes
+                )
+                if object_result is not None:
+                    results[name] = object_result
+            return results
+        by_name, by_alias = self._resolve_names(
+            requested, [], types, field_name, custom_attributes, chunk_size
+        )
+        return {
+            name: by_name.get(name, by_alias.get(name))
+            for name in requested
+            if name in by_name or name in by_alias
+        }
+
+    def _resolve_names(
+        self, names, aliases, types, field_name, custom_attributes, chunk_size
+    ):
+        """Match names on the name and aliases fields, and aliases on the
+        aliases field only.
+
+        :return: the objects by name matched on the name field and the objects
+            by name or alias matched on the aliases field
+        :rtype: tuple
+        """
+        names_set = set(names)
+        requested = list(dict.fromkeys(list(names) + list(aliases)))
+        by_name = {}
+        by_alias = {}
+        for index in range(0, len(requested), chunk_size):
+            chunk = requested[index : index + chunk_size]
+            chunk_names = [name for name in chunk if name in names_set]
+            filters = [{"key": field_name, "values": chunk}]
+            if len(chunk_names) > 0:
+                filters.insert(0, {"key": "name", "values": chunk_names})
+            data = self.list(
+                types=types,
+                filters={"mode": "or", "filters": filters, "filterGroups": []},
+                first=500,
+                getAll=True,
+                customAttributes=custom_attributes,
+            )
+            # Name filters are case insensitive on the platform side
+            name_keys = {}
+            for name in chunk_names:
+                name_keys.setdefault(name.lower(), []).append(name)
+            chunk_keys = {}
+            for name in chunk:
+                chunk_keys.setdefault(name.lower(), []).append(name)
+            for item in data:
+                for name in name_keys.get((item.get("name") or "").lower(), []):
+                    by_name.setdefault(name, item)
+                for alias in item.get(field_name) or []:
+                    for name in chunk_keys.get(alias.lower(), []):
+                        by_alias.setdefault(name, item)
+        return by_name, by_alias
 
     """
         Update a Stix-Domain-Object object field
@@ -1394,6 +1566,8 @@ class StixDomainObject:
                 if file_name.endswith(".json"):
                     mime_type = "application/json"
                 else:
+                    import magic
+
                     mime_type = magic.from_file(file_name, mime=True)
             self.opencti.app_logger.info(
                 "Uploading a file in Stix-Domain-Object",
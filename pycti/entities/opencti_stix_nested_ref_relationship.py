@@ -207,7 +207,9 @@ class StixNestedRefRelationship:
                 result["data"]["stixRefRelationship"]
             )
         elif filters is not None:
-            result = self.list(filters=filters, customAttributes=custom_attributes)
+            result = self.list(
+                filters=filters, first=1, customAttributes=custom_attributes
+            )
             if len(result) > 0:
                 return result[0]
             else:
@@ -215,6 +217,7 @@ class StixNestedRefRelationship:
         else:
             result = self.list(
                 fromOrToId=from_or_to_id,
+                first=1,
                 fromId=from_id,
                 toId=to_id,
                 relationship_type=relationship_type,
@@ -228,40 +231,45 @@ class StixNestedRefRelationship:
             else:
                 return None
 
-    """
-        Create a stix_observable_relationship object
-
-        :param from_id: id of the source entity
-        :return stix_observable_relationship object
-    """
-
-    def create(self, **kwargs):
-        from_id = kwargs.get("fromId", None)
-        to_id = kwargs.get("toId", None)
+    @staticmethod
+    def prepare_input(**kwargs):
         relationship_type = kwargs.get("relationship_type", None)
-        start_time = kwargs.get("start_time", None)
-        stop_time = kwargs.get("stop_time", None)
-        stix_id = kwargs.get("stix_id", None)
-        created = kwargs.get("created", None)
-        modified = kwargs.get("modified", None)
-        created_by = kwargs.get("createdBy", None)
-        object_marking = kwargs.get("objectMarking", None)
-        x_opencti_stix_ids = kwargs.get("x_opencti_stix_ids", None)
-        update = kwargs.get("update", False)
-
         if relationship_type == "resolves-to":
             relationship_type = "obs_resolves-to"
         elif relationship_type == "belongs-to":
             relationship_type = "obs_belongs-to"
         elif relationship_type == "content":
             relationship_type = "obs_content"
+        return {
+            "fromId": kwargs.get("fromId", None),
+            "toId": kwargs.get("toId", None),
+            "relationship_type": relationship_type,
+            "start_time": kwargs.get("start_time", None),
+            "stop_time": kwargs.get("stop_time", None),
+            "stix_id": kwargs.get("stix_id", None),
+            "created": kwargs.get("created", None),
+            "modified": kwargs.get("modified", None),
+            "createdBy": kwargs.get("createdBy", None),
+            "objectMarking": kwargs.get("objectMarking", None),
+            "x_opencti_stix_ids": kwargs.get("x_opencti_stix_ids", None),
+            "update": kwargs.get("update", False),
+        }
+
+    """
+        Create a stix_observable_relationship object
 
+        :param from_id: id of the source entity
+        :return stix_observable_relationship object
+    """
+
+    def create(self, **kwargs):
+        input = self.prepare_input(**kwargs)
         self.opencti.app_logger.info(
             "Creating stix_observable_relationship",
             {
-                "relationship_type": relationship_type,
-                "from_id": from_id,
-                "to_id": to_id,
+                "relationship_type": input["relationship_type"],
+                "from_id": input["fromId"],
+                "to_id": input["toId"],
             },
         )
         query = """
@@ -274,29 +282,61 @@ class StixNestedRefRelationship:
                     }
                 }
                 """
-        result = self.opencti.query(
-            query,
-            {
-                "input": {
-                    "fromId": from_id,
-                    "toId": to_id,
-                    "relationship_type": relationship_type,
-                    "start_time": start_time,
-                    "stop_time": stop_time,
-                    "stix_id": stix_id,
-                    "created": created,
-                    "modified": modified,
-                    "createdBy": created_by,
-                    "objectMarking": object_marking,
-                    "x_opencti_stix_ids": x_opencti_stix_ids,
-                    "update": update,
-                }
-            },
-        )
+        result = self.opencti.query(query, {"input": input})
         return self.opencti.process_multiple_fields(
             result["data"]["stixRefRelationshipAdd"]
         )
 
+    """
+        Create many stix_observable_relationship objects
+
+        The relationships are sent as aliased mutations, chunkSize per request.
+
+        :param relationships: list of create arguments (fromId, toId, relationship_type...)
+        :param chunkSize: number of relationships per request
+        :return list of stix_observable_relationship objects
+    """
+
+    def create_many(self, **kwargs):
+        relationships = kwargs.get("relationships", None) or []
+        chunk_size = kwargs.get("chunkSize", 50)
+        results = []
+        for index in range(0, len(relationships), chunk_size):
+            chunk = relationships[index : index + chunk_size]
+            self.opencti.app_logger.info(
+                "Creating stix_observable_relationships", {"count": len(chunk)}
+            )
+            variables = {}
+            definitions = []
+            mutations = []
+            for position, relationship in enumerate(chunk):
+                variables["input" + str(position)] = self.prepare_input(**relationship)
+                definitions.append(
+                    "$input" + str(position) + ": StixRefRelationshipAddInput!"
+                )
+                mutations.append(
+                    "rel"
+                    + str(position)
+                    + ": stixRefRelationshipAdd(input: $input"
+                    + str(position)
+                    + ") { id standard_id entity_type parent_types }"
+                )
+            query = (
+                "mutation StixRefRelationshipsAdd("
+                + ", ".join(definitions)
+                + ") { "
+                + " ".join(mutations)
+                + " }"
+            )
+            result = self.opencti.query(query, variables)
+            for position in range(len(chunk)):
+                results.append(
+                    self.opencti.process_multiple_fields(
+                        result["data"]["rel" + str(position)]
+                    )
+                )
+        return results
+
     """
         Update a stix_observable_relationship object field
 
@@ -556,7 +556,7 @@ class StixObjectOrStixRelationship:
                 result["data"]["stixObjectOrStixRelationship"]
             )
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, first=1)
             if len(result) > 0:
                 return result[0]
             else:
@@ -576,7 +576,7 @@ class StixObjectOrStixRelationship:
 
         self.opencti.app_logger.info(
             "Listing StixObjectOrStixRelationships with filters",
-            {"filters": json.dumps(filters)},
+            lambda: {"filters": json.dumps(filters)},
         )
         query = (
             """
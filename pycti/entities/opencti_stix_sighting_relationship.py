@@ -1,9 +1,8 @@
 # coding: utf-8
 
 import datetime
-import uuid
 
-from stix2.canonicalization.Canonicalize import canonicalize
+from pycti.utils.opencti_stix2_identifier import generate_standard_id
 
 
 class StixSightingRelationship:
@@ -309,9 +308,7 @@ class StixSightingRelationship:
                 "sighting_of_ref": sighting_of_ref,
                 "where_sighted_refs": where_sighted_refs,
             }
-        data = canonicalize(data, utf8=False)
-        id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-        return "sighting--" + id
+        return generate_standard_id("sighting", data)
 
     @staticmethod
     def generate_id_from_data(data):
@@ -492,7 +489,7 @@ class StixSightingRelationship:
                 result["data"]["stixSightingRelationship"]
             )
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, first=1)
             if len(result) > 0:
                 return result[0]
             else:
@@ -500,6 +497,7 @@ class StixSightingRelationship:
         elif from_id is not None and to_id is not None:
             result = self.list(
                 fromOrToId=from_or_to_id,
+                first=1,
                 fromId=from_id,
                 toId=to_id,
                 firstSeenStart=first_seen_start,
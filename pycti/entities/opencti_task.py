@@ -1,9 +1,10 @@
 import datetime
 import json
-import uuid
 
 from dateutil.parser import parse
-from stix2.canonicalization.Canonicalize import canonicalize
+
+from pycti.utils.opencti_stix2_extensions import extension_view
+from pycti.utils.opencti_stix2_identifier import generate_standard_id
 
 
 class Task:
@@ -244,9 +245,7 @@ class Task:
         if isinstance(created, datetime.datetime):
             created = created.isoformat()
         data = {"name": name.lower().strip(), "created": created}
-        data = canonicalize(data, utf8=False)
-        id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-        return "task--" + id
+        return generate_standard_id("task", data)
 
     @staticmethod
     def generate_id_from_data(data):
@@ -274,7 +273,7 @@ class Task:
         with_pagination = kwargs.get("withPagination", False)
 
         self.opencti.app_logger.info(
-            "Listing Tasks with filters", {"filters": json.dumps(filters)}
+            "Listing Tasks with filters", lambda: {"filters": json.dumps(filters)}
         )
         query = (
             """
@@ -367,7 +366,7 @@ class Task:
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(result["data"]["task"])
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, first=1)
             if len(result) > 0:
                 return result[0]
             else:
@@ -503,7 +502,9 @@ class Task:
             self.opencti.app_logger.error("[opencti_task] Missing parameters: name")
 
     def update_field(self, **kwargs):
-        self.opencti.app_logger.info("Updating Task", {"data": json.dumps(kwargs)})
+        self.opencti.app_logger.info(
+            "Updating Task", lambda: {"data": json.dumps(kwargs)}
+        )
         id = kwargs.get("id", None)
         input = kwargs.get("input", None)
         if id is not None and input is not None:
@@ -626,28 +627,19 @@ class Task:
         extras = kwargs.get("extras", {})
         update = kwargs.get("update", False)
         if stix_object is not None:
+            extensions = extension_view(stix_object, extras)
             # Search in extensions
             if "x_opencti_stix_ids" not in stix_object:
-                stix_object["x_opencti_stix_ids"] = (
-                    self.opencti.get_attribute_in_extension("stix_ids", stix_object)
-                )
+                stix_object["x_opencti_stix_ids"] = extensions.get("stix_ids")
             if "x_opencti_granted_refs" not in stix_object:
-                stix_object["x_opencti_granted_refs"] = (
-                    self.opencti.get_attribute_in_extension("granted_refs", stix_object)
-                )
+                stix_object["x_opencti_granted_refs"] = extensions.get("granted_refs")
             if "x_opencti_workflow_id" not in stix_object:
-                stix_object["x_opencti_workflow_id"] = (
-                    self.opencti.get_attribute_in_extension("workflow_id", stix_object)
-                )
+                stix_object["x_opencti_workflow_id"] = extensions.get("workflow_id")
             if "x_opencti_assignee_ids" not in stix_object:
-                stix_object["x_opencti_assignee_ids"] = (
-                    self.opencti.get_attribute_in_extension("assignee_ids", stix_object)
-                )
+                stix_object["x_opencti_assignee_ids"] = extensions.get("assignee_ids")
             if "x_opencti_participant_ids" not in stix_object:
-                stix_object["x_opencti_participant_ids"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "participant_ids", stix_object
-                    )
+                stix_object["x_opencti_participant_ids"] = extensions.get(
+                    "participant_ids"
                 )
             return self.create(
                 stix_id=stix_object["id"],
@@ -1,13 +1,12 @@
 # coding: utf-8
 
 import json
-import uuid
 from typing import Union
 
-from stix2.canonicalization.Canonicalize import canonicalize
-
 from pycti.entities.opencti_threat_actor_group import ThreatActorGroup
 from pycti.entities.opencti_threat_actor_individual import ThreatActorIndividual
+from pycti.utils.opencti_stix2_extensions import extension_view
+from pycti.utils.opencti_stix2_identifier import generate_standard_id
 
 
 class ThreatActor:
@@ -144,9 +143,7 @@ class ThreatActor:
     @staticmethod
     def generate_id(name, opencti_type):
         data = {"name": name.lower().strip(), "opencti_type": opencti_type}
-        data = canonicalize(data, utf8=False)
-        id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-        return "threat-actor--" + id
+        return generate_standard_id("threat-actor", data)
 
     def generate_id_from_data(self, data):
         data_type = "Threat-Actor-Group"
@@ -182,7 +179,8 @@ class ThreatActor:
         with_pagination = kwargs.get("withPagination", False)
 
         self.opencti.app_logger.info(
-            "Listing Threat-Actors with filters", {"filters": json.dumps(filters)}
+            "Listing Threat-Actors with filters",
+            lambda: {"filters": json.dumps(filters)},
         )
         query = (
             """
@@ -280,7 +278,7 @@ class ThreatActor:
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(result["data"]["threatActor"])
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, first=1)
             if len(result) > 0:
                 return result[0]
             else:
@@ -305,10 +303,11 @@ class ThreatActor:
 
     def import_from_stix2(self, **kwargs):
         stix_object = kwargs.get("stixObject", None)
+        extensions = extension_view(stix_object, kwargs.get("extras"))
         if "x_opencti_type" in stix_object:
             type = stix_object["x_opencti_type"].lower()
-        elif self.opencti.get_attribute_in_extension("type", stix_object) is not None:
-            type = self.opencti.get_attribute_in_extension("type", stix_object).lower()
+        elif extensions.get("type") is not None:
+            type = extensions.get("type").lower()
         elif (
             "resource_level" in stix_object
             and stix_object["resource_level"].lower() == "individual"
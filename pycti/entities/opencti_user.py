@@ -331,6 +331,7 @@ class User:
             results = self.list(
                 filters=filters,
                 search=search,
+                first=1,
                 include_sessions=include_sessions,
                 customAttributes=custom_attributes,
             )
@@ -1,7 +1,6 @@
 import json
-import uuid
 
-from stix2.canonicalization.Canonicalize import canonicalize
+from pycti.utils.opencti_stix2_identifier import generate_standard_id
 
 
 class Vocabulary:
@@ -29,9 +28,7 @@ class Vocabulary:
     def generate_id(name, category):
         name = name.lower().strip()
         data = {"name": name, "category": category}
-        data = canonicalize(data, utf8=False)
-        id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-        return "vocabulary--" + id
+        return generate_standard_id("vocabulary", data)
 
     @staticmethod
     def generate_id_from_data(data):
@@ -40,7 +37,8 @@ class Vocabulary:
     def list(self, **kwargs):
         filters = kwargs.get("filters", None)
         self.opencti.app_logger.info(
-            "Listing Vocabularies with filters", {"filters": json.dumps(filters)}
+            "Listing Vocabularies with filters",
+            lambda: {"filters": json.dumps(filters)},
         )
         query = (
             """
@@ -95,17 +93,47 @@ class Vocabulary:
             )
             return None
 
+    def prefetch_category(self, category, cache):
+        """Load every existing vocabulary of a category in the given cache.
+
+        :param category: the vocabulary category key
+        :param cache: the cache to fill (`vocab_<name>` entries)
+        """
+        cache["vocab_category_" + category] = True
+        try:
+            vocabularies = self.list(
+                filters={
+                    "mode": "and",
+                    "filters": [{"key": "category", "values": [category]}],
+                    "filterGroups": [],
+                }
+            )
+        except ValueError:
+            # Prefetch is an optimization, single reads are still available
+            return
+        for vocabulary in vocabularies:
+            cache.setdefault(
+                "vocab_" + vocabulary["name"],
+                {"id": vocabulary["id"], "name": vocabulary["name"]},
+            )
+
     def read_or_create_unchecked_with_cache(self, vocab, cache, field):
+        category = cache["category_" + field["key"]]
+        if "vocab_" + vocab not in cache and "vocab_category_" + category not in cache:
+            self.prefetch_category(category, cache)
         if "vocab_" + vocab in cache:
             vocab_data = cache["vocab_" + vocab]
         else:
             vocab_data = self.read_or_create_unchecked(
                 name=vocab,
                 required=field["required"],
-                category=cache["category_" + field["key"]],
+                category=category,
             )
         if vocab_data is not None:
-            cache["vocab_" + vocab] = vocab_data
+            cache["vocab_" + vocab] = {
+                "id": vocab_data["id"],
+                "name": vocab_data["name"],
+            }
         return vocab_data
 
     def create(self, **kwargs):
@@ -1,9 +1,9 @@
 # coding: utf-8
 
 import json
-import uuid
 
-from stix2.canonicalization.Canonicalize import canonicalize
+from pycti.utils.opencti_stix2_extensions import extension_view
+from pycti.utils.opencti_stix2_identifier import generate_standard_id
 
 
 class Vulnerability:
@@ -181,9 +181,7 @@ class Vulnerability:
     def generate_id(name):
         name = name.lower().strip()
         data = {"name": name}
-        data = canonicalize(data, utf8=False)
-        id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-        return "vulnerability--" + id
+        return generate_standard_id("vulnerability", data)
 
     @staticmethod
     def generate_id_from_data(data):
@@ -211,7 +209,8 @@ class Vulnerability:
         with_pagination = kwargs.get("withPagination", False)
 
         self.opencti.app_logger.info(
-            "Listing Vulnerabilities with filters", {"filters": json.dumps(filters)}
+            "Listing Vulnerabilities with filters",
+            lambda: {"filters": json.dumps(filters)},
         )
         query = (
             """
@@ -307,7 +306,7 @@ class Vulnerability:
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(result["data"]["vulnerability"])
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, first=1)
             if len(result) > 0:
                 return result[0]
             else:
@@ -575,6 +574,7 @@ class Vulnerability:
         update = kwargs.get("update", False)
 
         if stix_object is not None:
+            extensions = extension_view(stix_object, extras)
             # Backward compatibility
             if "x_opencti_base_score" in stix_object:
                 stix_object["x_opencti_cvss_base_score"] = stix_object[
@@ -603,285 +603,191 @@ class Vulnerability:
 
             # Search in extensions
             if "x_opencti_aliases" not in stix_object:
-                stix_object["x_opencti_aliases"] = (
-                    self.opencti.get_attribute_in_extension("aliases", stix_object)
-                )
+                stix_object["x_opencti_aliases"] = extensions.get("aliases")
             # CVSS3
             if "x_opencti_cvss_vector_string" not in stix_object:
-                stix_object["x_opencti_cvss_vector_string"] = (
-                    self.opencti.get_attribute_in_extension("cvss_vector", stix_object)
+                stix_object["x_opencti_cvss_vector_string"] = extensions.get(
+                    "cvss_vector"
                 )
             if "x_opencti_cvss_base_score" not in stix_object:
-                stix_object["x_opencti_cvss_base_score"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_base_score", stix_object
-                    )
+                stix_object["x_opencti_cvss_base_score"] = extensions.get(
+                    "cvss_base_score"
                 )
             if "x_opencti_cvss_base_severity" not in stix_object:
-                stix_object["x_opencti_cvss_base_severity"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_base_severity", stix_object
-                    )
+                stix_object["x_opencti_cvss_base_severity"] = extensions.get(
+                    "cvss_base_severity"
                 )
             if "x_opencti_cvss_attack_vector" not in stix_object:
-                stix_object["x_opencti_cvss_attack_vector"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_attack_vector", stix_object
-                    )
+                stix_object["x_opencti_cvss_attack_vector"] = extensions.get(
+                    "cvss_attack_vector"
                 )
             if "x_opencti_cvss_attack_complexity" not in stix_object:
-                stix_object["x_opencti_cvss_attack_complexity"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_attack_complexity", stix_object
-                    )
+                stix_object["x_opencti_cvss_attack_complexity"] = extensions.get(
+                    "cvss_attack_complexity"
                 )
             if "x_opencti_cvss_privileges_required" not in stix_object:
-                stix_object["x_opencti_cvss_privileges_required"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_privileges_required", stix_object
-                    )
+                stix_object["x_opencti_cvss_privileges_required"] = extensions.get(
+                    "cvss_privileges_required"
                 )
             if "x_opencti_cvss_user_interaction" not in stix_object:
-                stix_object["x_opencti_cvss_user_interaction"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_user_interaction", stix_object
-                    )
+                stix_object["x_opencti_cvss_user_interaction"] = extensions.get(
+                    "cvss_user_interaction"
                 )
             if "x_opencti_cvss_scope" not in stix_object:
-                stix_object["x_opencti_cvss_scope"] = (
-                    self.opencti.get_attribute_in_extension("cvss_scope", stix_object)
-                )
+                stix_object["x_opencti_cvss_scope"] = extensions.get("cvss_scope")
             if "x_opencti_cvss_confidentiality_impact" not in stix_object:
-                stix_object["x_opencti_cvss_confidentiality_impact"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_confidentiality_impact", stix_object
-                    )
+                stix_object["x_opencti_cvss_confidentiality_impact"] = extensions.get(
+                    "cvss_confidentiality_impact"
                 )
             if "x_opencti_cvss_integrity_impact" not in stix_object:
-                stix_object["x_opencti_cvss_integrity_impact"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_integrity_impact", stix_object
-                    )
+                stix_object["x_opencti_cvss_integrity_impact"] = extensions.get(
+                    "cvss_integrity_impact"
                 )
             if "x_opencti_cvss_availability_impact" not in stix_object:
-                stix_object["x_opencti_cvss_availability_impact"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_availability_impact", stix_object
-                    )
+                stix_object["x_opencti_cvss_availability_impact"] = extensions.get(
+                    "cvss_availability_impact"
                 )
             if "x_opencti_cvss_exploit_code_maturity" not in stix_object:
-                stix_object["x_opencti_cvss_exploit_code_maturity"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_exploit_code_maturity", stix_object
-                    )
+                stix_object["x_opencti_cvss_exploit_code_maturity"] = extensions.get(
+                    "cvss_exploit_code_maturity"
                 )
             if "x_opencti_cvss_remediation_level" not in stix_object:
-                stix_object["x_opencti_cvss_remediation_level"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_remediation_level", stix_object
-                    )
+                stix_object["x_opencti_cvss_remediation_level"] = extensions.get(
+                    "cvss_remediation_level"
                 )
             if "x_opencti_cvss_report_confidence" not in stix_object:
-                stix_object["x_opencti_cvss_report_confidence"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_report_confidence", stix_object
-                    )
+                stix_object["x_opencti_cvss_report_confidence"] = extensions.get(
+                    "cvss_report_confidence"
                 )
             if "x_opencti_cvss_temporal_score" not in stix_object:
-                stix_object["x_opencti_cvss_temporal_score"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_temporal_score", stix_object
-                    )
+                stix_object["x_opencti_cvss_temporal_score"] = extensions.get(
+                    "cvss_temporal_score"
                 )
 
             # CVSS2
             if "x_opencti_cvss_v2_vector_string" not in stix_object:
-                stix_object["x_opencti_cvss_v2_vector_string"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v2_vector", stix_object
-                    )
+                stix_object["x_opencti_cvss_v2_vector_string"] = extensions.get(
+                    "cvss_v2_vector"
                 )
             if "x_opencti_cvss_v2_base_score" not in stix_object:
-                stix_object["x_opencti_cvss_v2_base_score"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v2_base_score", stix_object
-                    )
+                stix_object["x_opencti_cvss_v2_base_score"] = extensions.get(
+                    "cvss_v2_base_score"
                 )
             if "x_opencti_cvss_v2_access_vector" not in stix_object:
-                stix_object["x_opencti_cvss_v2_access_vector"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v2_access_vector", stix_object
-                    )
+                stix_object["x_opencti_cvss_v2_access_vector"] = extensions.get(
+                    "cvss_v2_access_vector"
                 )
             if "x_opencti_cvss_v2_access_complexity" not in stix_object:
-                stix_object["x_opencti_cvss_v2_access_complexity"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v2_access_complexity", stix_object
-                    )
+                stix_object["x_opencti_cvss_v2_access_complexity"] = extensions.get(
+                    "cvss_v2_access_complexity"
                 )
             if "x_opencti_cvss_v2_authentication" not in stix_object:
-                stix_object["x_opencti_cvss_v2_authentication"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v2_authentication", stix_object
-                    )
+                stix_object["x_opencti_cvss_v2_authentication"] = extensions.get(
+                    "cvss_v2_authentication"
                 )
             if "x_opencti_cvss_v2_confidentiality_impact" not in stix_object:
                 stix_object["x_opencti_cvss_v2_confidentiality_impact"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v2_confidentiality_impact", stix_object
-                    )
+                    extensions.get("cvss_v2_confidentiality_impact")
                 )
             if "x_opencti_cvss_v2_integrity_impact" not in stix_object:
-                stix_object["x_opencti_cvss_v2_integrity_impact"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v2_integrity_impact", stix_object
-                    )
+                stix_object["x_opencti_cvss_v2_integrity_impact"] = extensions.get(
+                    "cvss_v2_integrity_impact"
                 )
             if "x_opencti_cvss_v2_availability_impact" not in stix_object:
-                stix_object["x_opencti_cvss_v2_availability_impact"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v2_availability_impact", stix_object
-                    )
+                stix_object["x_opencti_cvss_v2_availability_impact"] = extensions.get(
+                    "cvss_v2_availability_impact"
                 )
             if "x_opencti_cvss_v2_exploitability" not in stix_object:
-                stix_object["x_opencti_cvss_v2_exploitability"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v2_exploitability", stix_object
-                    )
+                stix_object["x_opencti_cvss_v2_exploitability"] = extensions.get(
+                    "cvss_v2_exploitability"
                 )
             if "x_opencti_cvss_v2_remediation_level" not in stix_object:
-                stix_object["x_opencti_cvss_v2_remediation_level"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v2_remediation_level", stix_object
-                    )
+                stix_object["x_opencti_cvss_v2_remediation_level"] = extensions.get(
+                    "cvss_v2_remediation_level"
                 )
             if "x_opencti_cvss_v2_report_confidence" not in stix_object:
-                stix_object["x_opencti_cvss_v2_report_confidence"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v2_report_confidence", stix_object
-                    )
+                stix_object["x_opencti_cvss_v2_report_confidence"] = extensions.get(
+                    "cvss_v2_report_confidence"
                 )
             if "x_opencti_cvss_v2_temporal_score" not in stix_object:
-                stix_object["x_opencti_cvss_v2_temporal_score"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v2_temporal_score", stix_object
-                    )
+                stix_object["x_opencti_cvss_v2_temporal_score"] = extensions.get(
+                    "cvss_v2_temporal_score"
                 )
 
             # CVSS4
             if "x_opencti_cvss_v4_vector_string" not in stix_object:
-                stix_object["x_opencti_cvss_v4_vector_string"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v4_vector", stix_object
-                    )
+                stix_object["x_opencti_cvss_v4_vector_string"] = extensions.get(
+                    "cvss_v4_vector"
                 )
             if "x_opencti_cvss_v4_base_score" not in stix_object:
-                stix_object["x_opencti_cvss_v4_base_score"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v4_base_score", stix_object
-                    )
+                stix_object["x_opencti_cvss_v4_base_score"] = extensions.get(
+                    "cvss_v4_base_score"
                 )
             if "x_opencti_cvss_v4_base_severity" not in stix_object:
-                stix_object["x_opencti_cvss_v4_base_severity"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v4_base_severity", stix_object
-                    )
+                stix_object["x_opencti_cvss_v4_base_severity"] = extensions.get(
+                    "cvss_v4_base_severity"
                 )
             if "x_opencti_cvss_v4_attack_vector" not in stix_object:
-                stix_object["x_opencti_cvss_v4_attack_vector"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v4_attack_vector", stix_object
-                    )
+                stix_object["x_opencti_cvss_v4_attack_vector"] = extensions.get(
+                    "cvss_v4_attack_vector"
                 )
             if "x_opencti_cvss_v4_attack_complexity" not in stix_object:
-                stix_object["x_opencti_cvss_v4_attack_complexity"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v4_attack_complexity", stix_object
-                    )
+                stix_object["x_opencti_cvss_v4_attack_complexity"] = extensions.get(
+                    "cvss_v4_attack_complexity"
                 )
             if "x_opencti_cvss_v4_attack_requirements" not in stix_object:
-                stix_object["x_opencti_cvss_v4_attack_requirements"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v4_attack_requirements", stix_object
-                    )
+                stix_object["x_opencti_cvss_v4_attack_requirements"] = extensions.get(
+                    "cvss_v4_attack_requirements"
                 )
             if "x_opencti_cvss_v4_privileges_required" not in stix_object:
-                stix_object["x_opencti_cvss_v4_privileges_required"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v4_privileges_required", stix_object
-                    )
+                stix_object["x_opencti_cvss_v4_privileges_required"] = extensions.get(
+                    "cvss_v4_privileges_required"
                 )
             if "x_opencti_cvss_v4_user_interaction" not in stix_object:
-                stix_object["x_opencti_cvss_v4_user_interaction"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v4_user_interaction", stix_object
-                    )
+                stix_object["x_opencti_cvss_v4_user_interaction"] = extensions.get(
+                    "cvss_v4_user_interaction"
                 )
             if "x_opencti_cvss_v4_confidentiality_impact_v" not in stix_object:
                 stix_object["x_opencti_cvss_v4_confidentiality_impact_v"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v4_confidentiality_impact_v", stix_object
-                    )
+                    extensions.get("cvss_v4_confidentiality_impact_v")
                 )
             if "x_opencti_cvss_v4_confidentiality_impact_s" not in stix_object:
                 stix_object["x_opencti_cvss_v4_confidentiality_impact_s"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v4_confidentiality_impact_s", stix_object
-                    )
+                    extensions.get("cvss_v4_confidentiality_impact_s")
                 )
             if "x_opencti_cvss_v4_integrity_impact_v" not in stix_object:
-                stix_object["x_opencti_cvss_v4_integrity_impact_v"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v4_integrity_impact_v", stix_object
-                    )
+                stix_object["x_opencti_cvss_v4_integrity_impact_v"] = extensions.get(
+                    "cvss_v4_integrity_impact_v"
                 )
             if "x_opencti_cvss_v4_integrity_impact_s" not in stix_object:
-                stix_object["x_opencti_cvss_v4_integrity_impact_s"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v4_integrity_impact_s", stix_object
-                    )
+                stix_object["x_opencti_cvss_v4_integrity_impact_s"] = extensions.get(
+                    "cvss_v4_integrity_impact_s"
                 )
             if "x_opencti_cvss_v4_availability_impact_v" not in stix_object:
-                stix_object["x_opencti_cvss_v4_availability_impact_v"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v4_availability_impact_v", stix_object
-                    )
+                stix_object["x_opencti_cvss_v4_availability_impact_v"] = extensions.get(
+                    "cvss_v4_availability_impact_v"
                 )
             if "x_opencti_cvss_v4_exploit_maturity" not in stix_object:
-                stix_object["x_opencti_cvss_v4_exploit_maturity"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "cvss_v4_exploit_maturity", stix_object
-                    )
+                stix_object["x_opencti_cvss_v4_exploit_maturity"] = extensions.get(
+                    "cvss_v4_exploit_maturity"
                 )
 
             # Others
             if "x_opencti_cwe" not in stix_object:
-                stix_object["x_opencti_cwe"] = self.opencti.get_attribute_in_extension(
-                    "cwe", stix_object
-                )
+                stix_object["x_opencti_cwe"] = extensions.get("cwe")
             if "x_opencti_cisa_kev" not in stix_object:
-                stix_object["x_opencti_cisa_kev"] = (
-                    self.opencti.get_attribute_in_extension("cisa_kev", stix_object)
-                )
+                stix_object["x_opencti_cisa_kev"] = extensions.get("cisa_kev")
             if "x_opencti_epss_score" not in stix_object:
-                stix_object["x_opencti_epss_score"] = (
-                    self.opencti.get_attribute_in_extension("epss_score", stix_object)
-                )
+                stix_object["x_opencti_epss_score"] = extensions.get("epss_score")
             if "x_opencti_epss_percentile" not in stix_object:
-                stix_object["x_opencti_epss_percentile"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "epss_percentile", stix_object
-                    )
+                stix_object["x_opencti_epss_percentile"] = extensions.get(
+                    "epss_percentile"
                 )
             if "x_opencti_score" not in stix_object:
-                stix_object["x_opencti_score"] = (
-                    self.opencti.get_attribute_in_extension("score", stix_object)
-                )
+                stix_object["x_opencti_score"] = extensions.get("score")
             if "x_opencti_first_seen_active" not in stix_object:
-                stix_object["x_opencti_first_seen_active"] = (
-                    self.opencti.get_attribute_in_extension(
-                        "first_seen_active", stix_object
-                    )
+                stix_object["x_opencti_first_seen_active"] = extensions.get(
+                    "first_seen_active"
                 )
 
             return self.create(
@@ -0,0 +1,181 @@
+"""JSON serialization used on the hot paths of the client and the connectors.
+
+The fastest available backend is used (``orjson``, then ``msgspec``) with the
+standard library as fallback. Fast backends produce compact UTF-8 output
+instead of the ``json.dumps`` default separators and ASCII escaping: decoding
+the result gives back the exact same objects. Anything a fast backend refuses
+(big integers, ``NaN`` literals, non string keys, unsupported types...) is
+handled by the standard library so errors behave as with ``json``. Only
+non-finite floats differ: fast backends write them as ``null``.
+
+The backend can be forced with the ``PYCTI_JSON_BACKEND`` environment variable
+or :py:func:`set_backend` (``auto``, ``orjson``, ``msgspec`` or ``stdlib``).
+"""
+
+import json
+import os
+from typing import Any, List, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+BACKENDS = ("orjson", "msgspec", "stdlib")
+
+_backend = "stdlib"
+
+
+def _unsupported(obj):
+    raise TypeError("Type is not JSON serializable: " + type(obj).__name__)
+
+
+def _stdlib_loads(data: Union[str, bytes, bytearray]) -> Any:
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    return json.dumps(obj)
+
+
+def _orjson_loads(data: Union[str, bytes, bytearray]) -> Any:
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return json.loads(data)
+
+
+def _orjson_dumps_bytes(obj: Any) -> bytes:
+    try:
+        return orjson.dumps(
+            obj,
+            default=_unsupported,
+            option=orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+            | orjson.OPT_PASSTHROUGH_SUBCLASS,
+        )
+    except TypeError:
+        return json.dumps(obj).encode("utf-8")
+
+
+def _orjson_dumps(obj: Any) -> str:
+    return _orjson_dumps_bytes(obj).decode("utf-8")
+
+
+def _msgspec_loads(data: Union[str, bytes, bytearray]) -> Any:
+    try:
+        return msgspec.json.decode(data)
+    except msgspec.DecodeError:
+        return json.loads(data)
+
+
+def _msgspec_dumps_bytes(obj: Any) -> bytes:
+    try:
+        return msgspec.json.encode(obj, enc_hook=_unsupported)
+    except (TypeError, msgspec.EncodeError):
+        return json.dumps(obj).encode("utf-8")
+
+
+def _msgspec_dumps(obj: Any) -> str:
+    return _msgspec_dumps_bytes(obj).decode("utf-8")
+
+
+_loads = _stdlib_loads
+_dumps = _stdlib_dumps
+
+
+def available_backends() -> List[str]:
+    """List the JSON backends installed, fastest first.
+
+    :return: names of the available backends
+    :rtype: list
+    """
+    backends = []
+    if orjson is not None:
+        backends.append("orjson")
+    if msgspec is not None:
+        backends.append("msgspec")
+    backends.append("stdlib")
+    return backends
+
+
+def get_backend() -> str:
+    """Name of the JSON backend in use.
+
+    :return: backend name
+    :rtype: str
+    """
+    return _backend
+
+
+def set_backend(name: str = "auto") -> str:
+    """Select the JSON backend.
+
+    :param name: ``auto`` (fastest available), ``orjson``, ``msgspec`` or ``stdlib``
+    :type name: str
+    :return: backend name in use
+    :rtype: str
+    """
+    global _backend, _loads, _dumps
+    name = (name or "auto").lower()
+    if name == "auto":
+        name = available_backends()[0]
+    if name not in BACKENDS:
+        raise ValueError(
+            "Unknown JSON backend " + name + ", expected one of " + ", ".join(BACKENDS)
+        )
+    if name not in available_backends():
+        raise ValueError("JSON backend " + name + " is not installed")
+    if name == "orjson":
+        _loads, _dumps = _orjson_loads, _orjson_dumps
+    elif name == "msgspec":
+        _loads, _dumps = _msgspec_loads, _msgspec_dumps
+    else:
+        _loads, _dumps = _stdlib_loads, _stdlib_dumps
+    _backend = name
+    return _backend
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """Deserialize a JSON document.
+
+    :param data: JSON document
+    :type data: str or bytes
+    :return: deserialized object
+    """
+    return _loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """Serialize an object to a JSON string.
+
+    :param obj: object to serialize
+    :return: JSON document
+    :rtype: str
+    """
+    return _dumps(obj)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialize an object to UTF-8 encoded JSON (HTTP and AMQP bodies).
+
+    :param obj: object to serialize
+    :return: JSON document
+    :rtype: bytes
+    """
+    if _backend == "orjson":
+        return _orjson_dumps_bytes(obj)
+    if _backend == "msgspec":
+        return _msgspec_dumps_bytes(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+try:
+    set_backend(os.getenv("PYCTI_JSON_BACKEND", "auto"))
+except ValueError:
+    set_backend("auto")
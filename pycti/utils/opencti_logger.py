@@ -1,8 +1,17 @@
+import atexit
 import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
 from datetime import datetime, timezone
 
 from pythonjsonlogger import jsonlogger
 
+# Listener of the queue handler, see logger(async_logging=True)
+_queue_listener = None
+
 
 class CustomJsonFormatter(jsonlogger.JsonFormatter):
     """Custom JSON formatter for structured logging."""
@@ -25,25 +34,106 @@ class CustomJsonFormatter(jsonlogger.JsonFormatter):
             log_record["level"] = record.levelname
 
 
-def logger(level, json_logging=True):
+class RateLimitFilter(logging.Filter):
+    """Drop the messages repeated more than `rate` times in `period` seconds.
+
+    Messages are the same if they have the same logger, level and message.
+    The first message let through after a drop carries the number of dropped
+    messages in its `suppressed` attribute.
+
+    :param rate: number of identical messages let through by period
+    :type rate: int
+    :param period: length of the period in seconds
+    :type period: float
+    """
+
+    max_keys = 10000
+
+    def __init__(self, rate: int, period: float = 60.0):
+        super().__init__()
+        self.rate = rate
+        self.period = period
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        key = (record.name, record.levelno, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.period:
+                if window is not None and window[1] > self.rate:
+                    record.suppressed = window[1] - self.rate
+                if window is None and len(self._windows) >= self.max_keys:
+                    self._windows.clear()
+                self._windows[key] = [now, 1]
+                return True
+            window[1] += 1
+            return window[1] <= self.rate
+
+
+class LogQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler leaving the formatting to the listener thread."""
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _stop_queue_listener():
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(_stop_queue_listener)
+
+
+def logger(level, json_logging=True, rate_limit=0, async_logging=False):
     """Create a logger with JSON or standard formatting.
 
     :param level: Logging level (e.g., logging.INFO, logging.DEBUG)
     :param json_logging: Whether to use JSON formatting for logs
     :type json_logging: bool
+    :param rate_limit: if set, let through at most this number of identical
+        messages per minute
+    :type rate_limit: int
+    :param async_logging: write the logs from a background thread, logging
+        calls only put the records in a queue
+    :type async_logging: bool
     :return: AppLogger class
     :rtype: class
     """
+    global _queue_listener
     # Exceptions
     logging.getLogger("urllib3").setLevel(logging.WARNING)
     logging.getLogger("pika").setLevel(logging.ERROR)
     # Exceptions
-    if json_logging:
+    if json_logging or rate_limit > 0 or async_logging:
+        # The handlers are replaced, flush the ones of the previous queue
+        _stop_queue_listener()
         log_handler = logging.StreamHandler()
         log_handler.setLevel(level)
-        formatter = CustomJsonFormatter("%(timestamp)s %(level)s %(name)s %(message)s")
+        if json_logging:
+            formatter = CustomJsonFormatter(
+                "%(timestamp)s %(level)s %(name)s %(message)s"
+            )
+        else:
+            formatter = logging.Formatter(logging.BASIC_FORMAT)
         log_handler.setFormatter(formatter)
-        logging.basicConfig(handlers=[log_handler], level=level, force=True)
+        handlers = [log_handler]
+        if async_logging:
+            log_queue = queue.SimpleQueue()
+            _queue_listener = logging.handlers.QueueListener(
+                log_queue, log_handler, respect_handler_level=True
+            )
+            _queue_listener.start()
+            handlers = [LogQueueHandler(log_queue)]
+        if rate_limit > 0:
+            handlers[0].addFilter(RateLimitFilter(rate_limit))
+        logging.basicConfig(handlers=handlers, level=level, force=True)
     else:
         logging.basicConfig(level=level)
 
@@ -55,11 +145,14 @@ def logger(level, json_logging=True):
         def prepare_meta(meta=None):
             """Prepare metadata for logging.
 
-            :param meta: Metadata dictionary or None
-            :type meta: dict or None
+            :param meta: Metadata dictionary, a callable returning it (only
+                called if the message is logged) or None
+            :type meta: dict or callable or None
             :return: Formatted metadata or None
             :rtype: dict or None
             """
+            if callable(meta):
+                meta = meta()
             return None if meta is None else {"attributes": meta}
 
         @staticmethod
@@ -78,9 +171,10 @@ def logger(level, json_logging=True):
             :param message: Message to log
             :type message: str
             :param meta: Optional metadata to include
-            :type meta: dict or None
+            :type meta: dict or callable or None
             """
-            self.local_logger.debug(message, extra=AppLogger.prepare_meta(meta))
+            if self.local_logger.isEnabledFor(logging.DEBUG):
+                self.local_logger.debug(message, extra=AppLogger.prepare_meta(meta))
 
         def info(self, message, meta=None):
             """Log an info message.
@@ -88,9 +182,10 @@ def logger(level, json_logging=True):
             :param message: Message to log
             :type message: str
             :param meta: Optional metadata to include
-            :type meta: dict or None
+            :type meta: dict or callable or None
             """
-            self.local_logger.info(message, extra=AppLogger.prepare_meta(meta))
+            if self.local_logger.isEnabledFor(logging.INFO):
+                self.local_logger.info(message, extra=AppLogger.prepare_meta(meta))
 
         def warning(self, message, meta=None):
             """Log a warning message.
@@ -98,21 +193,26 @@ def logger(level, json_logging=True):
             :param message: Message to log
             :type message: str
             :param meta: Optional metadata to include
-            :type meta: dict or None
+            :type meta: dict or callable or None
             """
-            self.local_logger.warning(message, extra=AppLogger.prepare_meta(meta))
+            if self.local_logger.isEnabledFor(logging.WARNING):
+                self.local_logger.warning(message, extra=AppLogger.prepare_meta(meta))
 
         def error(self, message, meta=None):
-            """Log an error message with exception info.
+            """Log an error message, with the exception being handled if any.
 
             :param message: Message to log
             :type message: str
             :param meta: Optional metadata to include
-            :type meta: dict or None
+            :type meta: dict or callable or None
             """
-            # noinspection PyTypeChecker
-            self.local_logger.error(
-                message, exc_info=1, extra=AppLogger.prepare_meta(meta)
-            )
+            if self.local_logger.isEnabledFor(logging.ERROR):
+                # Only attach the exception being handled, if any
+                # noinspection PyTypeChecker
+                self.local_logger.error(
+                    message,
+                    exc_info=sys.exc_info()[0] is not None,
+                    extra=AppLogger.prepare_meta(meta),
+                )
 
     return AppLogger
@@ -0,0 +1,265 @@
+# coding: utf-8
+
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from cachetools import LRUCache, TTLCache
+
+# Namespaces of OpenCTIStix2.mapping_cache: maxsize (None for unbounded) and
+# ttl in seconds (None for no expiration)
+MAPPING_CACHE_NAMESPACES = {
+    "stix_ids": {"maxsize": 50000, "ttl": None},
+    "internal_ids": {"maxsize": 50000, "ttl": None},
+    "labels": {"maxsize": 10000, "ttl": None},
+    "kill_chain_phases": {"maxsize": 5000, "ttl": None},
+    "markings": {"maxsize": 1000, "ttl": None},
+    "authors": {"maxsize": 1000, "ttl": None},
+}
+
+# Namespaces of OpenCTIStix2.mapping_cache_permanent. Vocabularies are
+# bounded as the platform may hold an unlimited number of them.
+PERMANENT_CACHE_NAMESPACES = {
+    "definitions": {"maxsize": None, "ttl": None},
+    "vocabularies": {"maxsize": 20000, "ttl": None},
+}
+
+
+def mapping_cache_namespace(key: str) -> str:
+    """Namespace of a key of the mapping cache.
+
+    :param key: cache key
+    :type key: str
+    :return: namespace name
+    :rtype: str
+    """
+    if key.startswith("label_"):
+        return "labels"
+    if key.startswith("kill_chain_phase_"):
+        return "kill_chain_phases"
+    if key.startswith("marking_"):
+        return "markings"
+    if key.startswith("author_"):
+        return "authors"
+    if "--" in key:
+        return "stix_ids"
+    return "internal_ids"
+
+
+def permanent_cache_namespace(key: str) -> str:
+    """Namespace of a key of the permanent mapping cache.
+
+    :param key: cache key
+    :type key: str
+    :return: namespace name
+    :rtype: str
+    """
+    if key.startswith("vocab_"):
+        return "vocabularies"
+    return "definitions"
+
+
+class MappingEntry(Mapping):
+    """Compact read-only representation of a cached element
+
+    Behaves as the dict it replaces (``entry["id"]``, ``entry.get("type")``...)
+    with the footprint of a slotted object.
+    """
+
+    __slots__ = ("id", "type", "name", "observables")
+
+    def __init__(self, data: Dict):
+        for key, value in data.items():
+            setattr(self, key, value)
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key in self.__slots__ if hasattr(self, key))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return "MappingEntry(" + repr(dict(self)) + ")"
+
+
+def compact(value: Any) -> Any:
+    """Store the dicts holding only entry fields as :py:class:`MappingEntry`.
+
+    :param value: value to cache
+    :return: compact value
+    """
+    if type(value) is dict and value.keys() <= _ENTRY_FIELDS:
+        return MappingEntry(value)
+    return value
+
+
+_ENTRY_FIELDS = frozenset(MappingEntry.__slots__)
+
+
+class _CountingLRUCache(LRUCache):
+    def __init__(self, maxsize, namespace):
+        super().__init__(maxsize)
+        self.namespace = namespace
+
+    def popitem(self):
+        item = super().popitem()
+        self.namespace.record("evictions")
+        return item
+
+
+class _CountingTTLCache(TTLCache):
+    def __init__(self, maxsize, ttl, namespace):
+        super().__init__(maxsize, ttl)
+        self.namespace = namespace
+
+    def popitem(self):
+        item = super().popitem()
+        self.namespace.record("evictions")
+        return item
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        if expired:
+            self.namespace.record("evictions", len(expired))
+        return expired
+
+
+class CacheNamespace:
+    """A bounded part of the mapping cache with its own statistics
+
+    :param name: namespace name
+    :param maxsize: maximum number of entries, None for unbounded
+    :param ttl: time to live of the entries in seconds, None for no expiration
+    :param cache: the :py:class:`OpenCTIMappingCache` owning the namespace
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: Optional[int] = None,
+        ttl: Optional[float] = None,
+        cache: "OpenCTIMappingCache" = None,
+    ):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if ttl is not None:
+            self.data = _CountingTTLCache(maxsize or float("inf"), ttl, self)
+        elif maxsize is not None:
+            self.data = _CountingLRUCache(maxsize, self)
+        else:
+            self.data = {}
+
+    def record(self, event: str, count: int = 1):
+        setattr(self, event, getattr(self, event) + count)
+        if self.cache is not None and self.cache.metric_handler is not None:
+            self.cache.metric_handler.inc("mapping_cache_" + event, count)
+
+    def stats(self) -> Dict:
+        return {
+            "size": len(self.data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class OpenCTIMappingCache(MutableMapping):
+    """Namespaced cache of the elements resolved during imports
+
+    Keys are routed to a namespace (stix ids, labels, kill chain phases...)
+    each with its own size and TTL limits, so long running workers keep a
+    predictable footprint. Dicts holding only ``id``, ``type``, ``name`` and
+    ``observables`` are stored as compact :py:class:`MappingEntry`.
+
+    Hits, misses and evictions are counted per namespace (see
+    :py:meth:`stats`) and sent to the ``metric_handler`` if set.
+
+    :param namespaces: namespace name to ``maxsize`` and ``ttl`` settings
+    :type namespaces: dict
+    :param router: function giving the namespace of a key
+    :type router: callable
+    :param metric_handler: an :py:class:`~pycti.connector.opencti_metric_handler.OpenCTIMetricHandler`
+    """
+
+    def __init__(
+        self,
+        namespaces: Dict[str, Dict] = None,
+        router: Callable[[str], str] = mapping_cache_namespace,
+        metric_handler=None,
+    ):
+        if namespaces is None:
+            namespaces = MAPPING_CACHE_NAMESPACES
+        self.router = router
+        self.metric_handler = metric_handler
+        self.namespaces = {
+            name: CacheNamespace(
+                name, settings.get("maxsize"), settings.get("ttl"), self
+            )
+            for name, settings in namespaces.items()
+        }
+
+    def namespace(self, key: str) -> CacheNamespace:
+        """Get the namespace a key belongs to.
+
+        :param key: cache key
+        :type key: str
+        :return: the namespace
+        :rtype: CacheNamespace
+        """
+        return self.namespaces[self.router(key)]
+
+    def __getitem__(self, key: str) -> Any:
+        namespace = self.namespaces[self.router(key)]
+        try:
+            value = namespace.data[key]
+        except KeyError:
+            namespace.record("misses")
+            raise
+        namespace.record("hits")
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        namespace = self.namespaces[self.router(key)]
+        if key in namespace.data:
+            return True
+        namespace.record("misses")
+        return False
+
+    def __setitem__(self, key: str, value: Any):
+        self.namespaces[self.router(key)].data[key] = compact(value)
+
+    def __delitem__(self, key: str):
+        del self.namespaces[self.router(key)].data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for namespace in self.namespaces.values():
+            yield from list(namespace.data.keys())
+
+    def __len__(self) -> int:
+        return sum(len(namespace.data) for namespace in self.namespaces.values())
+
+    def clear(self):
+        for namespace in self.namespaces.values():
+            namespace.data.clear()
+
+    def stats(self) -> Dict[str, Dict]:
+        """Size and hit, miss and eviction counters of every namespace.
+
+        :return: statistics by namespace name
+        :rtype: dict
+        """
+        return {name: namespace.stats() for name, namespace in self.namespaces.items()}
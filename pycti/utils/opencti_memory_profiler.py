@@ -0,0 +1,160 @@
+# coding: utf-8
+"""Opt-in memory profiling of the split, import and export phases.
+
+Once :py:func:`enable_memory_profiling` has been called, every phase run
+records the traced memory before and after it, the traced peak, the peak
+RSS of the process and the source lines which allocated the most during
+the phase (from :py:mod:`tracemalloc` snapshots). Measures are process
+wide: phases running in other threads at the same time are included.
+Nested phases do not reset the traced peak, their peak is the one since
+the start of the outermost phase.
+"""
+
+import contextlib
+import functools
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+_NO_PHASE = contextlib.nullcontext()
+_lock = threading.Lock()
+_settings = {"enabled": False, "top": 10, "logger": None, "started": False}
+_records: deque = deque(maxlen=100)
+_depth = 0
+
+
+def enable_memory_profiling(enabled: bool = True, top: int = 10, logger=None):
+    """Enable or disable the memory profiling of the phases.
+
+    :param enabled: whether phases are profiled
+    :type enabled: bool
+    :param top: number of allocating source lines reported by phase, 0 to
+        skip the snapshots and only report the totals
+    :type top: int
+    :param logger: logger receiving a message for every phase run
+    """
+    with _lock:
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _settings["started"] = True
+        elif not enabled and _settings["started"]:
+            tracemalloc.stop()
+            _settings["started"] = False
+        _settings.update(enabled=enabled, top=top, logger=logger)
+
+
+def is_enabled() -> bool:
+    """Whether the memory profiling is enabled.
+
+    :rtype: bool
+    """
+    return _settings["enabled"]
+
+
+def peak_rss() -> Optional[int]:
+    """Peak resident set size of the process.
+
+    :return: the peak RSS in bytes, None if the platform does not report it
+    :rtype: int
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def records() -> List[Dict]:
+    """Latest phase records, oldest first.
+
+    :rtype: list
+    """
+    with _lock:
+        return list(_records)
+
+
+def clear_records():
+    with _lock:
+        _records.clear()
+
+
+def phase(name: str):
+    """Get a context manager profiling the memory of its block as `name`.
+
+    :param name: name of the phase
+    :type name: str
+    :return: the context manager, a no-op one if profiling is disabled
+    """
+    if not _settings["enabled"]:
+        return _NO_PHASE
+    return _phase(name)
+
+
+@contextlib.contextmanager
+def _phase(name: str):
+    global _depth
+    top = _settings["top"]
+    with _lock:
+        if _depth == 0:
+            tracemalloc.reset_peak()
+        _depth += 1
+    before = tracemalloc.get_traced_memory()[0]
+    snapshot = tracemalloc.take_snapshot() if top > 0 else None
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        after, peak = tracemalloc.get_traced_memory()
+        record = {
+            "phase": name,
+            "duration": duration,
+            "before": before,
+            "after": after,
+            "peak": peak,
+            "peak_rss": peak_rss(),
+        }
+        if snapshot is not None:
+            differences = tracemalloc.take_snapshot().compare_to(snapshot, "lineno")
+            record["top"] = [
+                {
+                    "location": str(difference.traceback[0]),
+                    "size_diff": difference.size_diff,
+                    "count_diff": difference.count_diff,
+                }
+                for difference in differences[:top]
+            ]
+        with _lock:
+            _depth -= 1
+            _records.append(record)
+        logger = _settings["logger"]
+        if logger is not None:
+            logger.info(
+                "Memory profile of phase",
+                lambda: {key: value for key, value in record.items() if key != "top"},
+            )
+
+
+def profiled(name: str) -> Callable:
+    """Decorator profiling the memory of the decorated function as `name`.
+
+    :param name: name of the phase
+    :type name: str
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _settings["enabled"]:
+                return function(*args, **kwargs)
+            with _phase(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
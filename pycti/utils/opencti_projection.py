@@ -0,0 +1,108 @@
+from typing import Dict, List, Optional, Union
+
+Fields = List[Union[str, Dict[str, "Fields"]]]
+
+MINIMAL_FIELDS = ["id", "standard_id", "entity_type", "parent_types"]
+
+COMMON_FIELDS = [
+    "spec_version",
+    "created_at",
+    "updated_at",
+    {"createdBy": ["id", "standard_id", "entity_type"]},
+    {
+        "objectMarking": [
+            "id",
+            "standard_id",
+            "entity_type",
+            "definition_type",
+            "definition",
+        ]
+    },
+    {"objectLabel": ["id", "value", "color"]},
+]
+
+STIX_CORE_OBJECT_PROJECTIONS = {
+    "minimal": MINIMAL_FIELDS,
+    "standard": MINIMAL_FIELDS + COMMON_FIELDS,
+}
+
+STIX_CORE_RELATIONSHIP_PROJECTIONS = {
+    "minimal": MINIMAL_FIELDS + ["relationship_type"],
+    "standard": MINIMAL_FIELDS
+    + ["relationship_type", "confidence", "start_time", "stop_time"]
+    + COMMON_FIELDS
+    + [
+        {
+            "from": [
+                {"... on BasicObject": ["id", "entity_type", "parent_types"]},
+                {"... on BasicRelationship": ["id", "entity_type", "parent_types"]},
+                {"... on StixObject": ["standard_id"]},
+            ]
+        },
+        {
+            "to": [
+                {"... on BasicObject": ["id", "entity_type", "parent_types"]},
+                {"... on BasicRelationship": ["id", "entity_type", "parent_types"]},
+                {"... on StixObject": ["standard_id"]},
+            ]
+        },
+    ],
+}
+
+
+def build_fragment(fields: Fields) -> str:
+    """Render a list of fields as a GraphQL selection.
+
+    Strings are rendered as is (so inline fragments such as
+    ``"... on Malware { name }"`` are accepted), dicts map a field to its
+    own list of sub fields.
+
+    :param fields: fields to select
+    :type fields: list
+    :return: GraphQL selection
+    :rtype: str
+    """
+    selection = []
+    for field in fields:
+        if isinstance(field, dict):
+            for name, sub_fields in field.items():
+                selection.append(name + " { " + build_fragment(sub_fields) + " }")
+        else:
+            selection.append(field)
+    return "\n".join(selection)
+
+
+def resolve_projection(
+    custom_attributes: Optional[str],
+    fields: Optional[Union[str, Fields]],
+    levels: Dict[str, Fields],
+) -> Optional[str]:
+    """Compute the custom attributes to request for a read or list call.
+
+    Explicit ``customAttributes`` always win. ``fields`` is either a list of
+    fields or the name of a projection level (``minimal``, ``standard`` or
+    ``full``), ``full`` (or None) keeping the entity default fragment.
+
+    :param custom_attributes: custom attributes given by the caller
+    :type custom_attributes: str or None
+    :param fields: list of fields or projection level
+    :type fields: str or list or None
+    :param levels: projection levels available for the entity
+    :type levels: dict
+    :return: custom attributes or None to use the entity default fragment
+    :rtype: str or None
+    """
+    if custom_attributes is not None or fields is None:
+        return custom_attributes
+    if isinstance(fields, str):
+        if fields == "full":
+            return None
+        if fields not in levels:
+            raise ValueError(
+                "Unknown projection level "
+                + fields
+                + ", expected one of "
+                + ", ".join(list(levels.keys()) + ["full"])
+            )
+        fields = levels[fields]
+    return build_fragment(fields)
@@ -1,23 +1,20 @@
 # coding: utf-8
 
-import base64
 import datetime
 import json
 import os
-import random
+import threading
 import time
-import traceback
 import uuid
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-import datefinder
 import dateutil.parser
 import pytz
 from cachetools import LRUCache
 from opentelemetry import metrics
-from requests import RequestException, Timeout
 
 from pycti.entities.opencti_identity import Identity
+from pycti.utils import opencti_json, opencti_memory_profiler, opencti_tracing
 from pycti.utils.constants import (
     IdentityTypes,
     LocationTypes,
@@ -25,6 +22,41 @@ from pycti.utils.constants import (
     StixCyberObservableTypes,
     ThreatActorTypes,
 )
+from pycti.utils.opencti_mapping_cache import (
+    PERMANENT_CACHE_NAMESPACES,
+    OpenCTIMappingCache,
+    permanent_cache_namespace,
+)
+from pycti.utils.opencti_stix2_dates import extract_date
+from pycti.utils.opencti_stix2_export_session import OpenCTIStix2ExportSession
+from pycti.utils.opencti_stix2_extensions import (
+    STIX_EXT_MITRE,
+    STIX_EXT_OCTI,
+    STIX_EXT_OCTI_SCO,
+    StixExtensionView,
+)
+from pycti.utils.opencti_stix2_file_upload import OpenCTIStix2FileUploader
+from pycti.utils.opencti_stix2_identifier import external_reference_generate_id
+from pycti.utils.opencti_stix2_import_stats import (
+    PHASE_EMBEDDED_RESOLUTION,
+    PHASE_FILE_UPLOAD,
+    PHASE_SPLIT,
+    OpenCTIStix2ImportStats,
+    timed_phase,
+)
+from pycti.utils.opencti_stix2_retry import (
+    ERROR_TYPE_BAD_GATEWAY,
+    ERROR_TYPE_CONNECTION,
+    ERROR_TYPE_DRAFT_LOCK,
+    ERROR_TYPE_LOCK,
+    ERROR_TYPE_MISSING_REFERENCE,
+    ERROR_TYPE_TIMEOUT,
+    MAX_PROCESSING_COUNT,
+    PROCESSING_COUNT,
+    OpenCTIStix2RetryScheduler,
+    classify_error,
+    retry_delay,
+)
 from pycti.utils.opencti_stix2_splitter import OpenCTIStix2Splitter
 from pycti.utils.opencti_stix2_update import OpenCTIStix2Update
 from pycti.utils.opencti_stix2_utils import (
@@ -35,23 +67,10 @@ from pycti.utils.opencti_stix2_utils import (
     OpenCTIStix2Utils,
 )
 
-datefinder.ValueError = ValueError, OverflowError
 utc = pytz.UTC
 
 # Spec version
 SPEC_VERSION = "2.1"
-ERROR_TYPE_LOCK = "LOCK_ERROR"
-ERROR_TYPE_MISSING_REFERENCE = "MISSING_REFERENCE_ERROR"
-ERROR_TYPE_BAD_GATEWAY = "Bad Gateway"
-ERROR_TYPE_DRAFT_LOCK = "DRAFT_LOCKED"
-ERROR_TYPE_TIMEOUT = "Request timed out"
-
-# Extensions
-STIX_EXT_OCTI = "extension-definition--ea279b3e-5c71-4632-ac08-831c66a786ba"
-STIX_EXT_OCTI_SCO = "extension-definition--f93e2c80-4231-4f9a-af8b-95c9bd566a82"
-STIX_EXT_MITRE = "extension-definition--322b8f77-262a-4cb8-a915-1e441e00329b"
-PROCESSING_COUNT: int = 4
-MAX_PROCESSING_COUNT: int = 100
 
 meter = metrics.get_meter(__name__)
 bundles_timeout_error_counter = meter.create_counter(
@@ -82,6 +101,15 @@ bundles_success_counter = meter.create_counter(
     name="opencti_bundles_success_counter",
     description="number of bundles successfully processed",
 )
+bundles_retry_counter = meter.create_counter(
+    name="opencti_bundles_retry_counter",
+    description="number of bundle retries, by error type",
+)
+bundles_retry_latency_histogram = meter.create_histogram(
+    name="opencti_bundles_retry_latency",
+    unit="s",
+    description="time between the first attempt and the outcome of retried bundles",
+)
 
 
 class OpenCTIStix2:
@@ -93,11 +121,88 @@ class OpenCTIStix2:
     def __init__(self, opencti):
         self.opencti = opencti
         self.stix2_update = OpenCTIStix2Update(opencti)
-        self.mapping_cache = LRUCache(maxsize=50000)
-        self.mapping_cache_permanent = {}
+        self.worker_logger = opencti.logger_class("worker")
+        self.mapping_cache = OpenCTIMappingCache()
+        self.mapping_cache_permanent = OpenCTIMappingCache(
+            PERMANENT_CACHE_NAMESPACES, permanent_cache_namespace
+        )
+        # External references resolved during import, keyed by standard id.
+        # Set cache_external_references to False to upsert them every time.
+        self.cache_external_references = True
+        self.external_reference_cache = LRUCache(maxsize=50000)
+        # Create the nested refs of an observable in batched requests
+        self.batch_nested_refs = False
+        self.current_export_session = None
+        # Files attached to the imported elements are uploaded in parallel
+        self.file_uploader = OpenCTIStix2FileUploader()
+        # Last extension view built by each thread
+        self._extension_views = threading.local()
+        # Statistics of the import running in each thread
+        self._import_stats = threading.local()
 
     ######### UTILS
     # region utils
+    def upload_file(self, add_file, entity_id: str, file: Dict, **kwargs) -> None:
+        """Upload a base64 encoded file of an imported element.
+
+        The upload is done with :py:attr:`file_uploader`: in parallel when
+        the element is imported by :py:meth:`import_item`, which awaits it at
+        the end of the element import (see :py:meth:`wait_file_uploads`), and
+        synchronously when :py:meth:`import_object` and the other import
+        methods are called directly.
+
+        :param add_file: ``add_file`` method of the element entity
+        :type add_file: callable
+        :param entity_id: id of the element
+        :type entity_id: str
+        :param file: file with ``name``, ``data`` and optional ``mime_type``,
+            ``version``, ``object_marking_refs`` and ``no_trigger_import``
+        :type file: Dict
+        :param kwargs: other ``add_file`` arguments
+        """
+        self.file_uploader.submit(
+            add_file,
+            file["data"],
+            id=entity_id,
+            file_name=file["name"],
+            version=file.get("version", None),
+            fileMarkings=file.get("object_marking_refs", None),
+            mime_type=file.get("mime_type", None),
+            no_trigger_import=file.get("no_trigger_import", False),
+            **kwargs,
+        )
+
+    def extension_view(self, stix_object: Dict) -> StixExtensionView:
+        """Get the flattened extensions of a STIX object.
+
+        The view is built once and reused as long as the same object is
+        imported by the thread.
+
+        :param stix_object: STIX object
+        :type stix_object: Dict
+        :return: the extension view
+        :rtype: StixExtensionView
+        """
+        view = getattr(self._extension_views, "last", None)
+        if view is None or view.stix_object is not stix_object:
+            view = StixExtensionView(stix_object)
+            self._extension_views.last = view
+        return view
+
+    @property
+    def import_stats(self) -> Optional[OpenCTIStix2ImportStats]:
+        """Statistics collected by the import running in the current thread,
+        None if it does not collect any.
+        """
+        return getattr(self._import_stats, "current", None)
+
+    @timed_phase(PHASE_FILE_UPLOAD)
+    def wait_file_uploads(self) -> None:
+        """Wait for the file uploads of the current thread and raise the first
+        upload error, if any.
+        """
+        self.file_uploader.wait()
+
     def unknown_type(self, stix_object: Dict) -> None:
         """Log an error for unknown STIX object types.
 
@@ -213,7 +318,7 @@ class OpenCTIStix2:
             self.opencti.app_logger.error("The bundle file does not exists")
             return None
         with open(os.path.join(file_path), encoding="utf-8") as file:
-            data = json.load(file)
+            data = opencti_json.loads(file.read())
         return self.import_bundle(data, update, types, None)
 
     def import_bundle_from_json(
@@ -223,6 +328,7 @@ class OpenCTIStix2:
         types: List = None,
         work_id: str = None,
         objects_max_refs: int = 0,
+        stats: OpenCTIStix2ImportStats = None,
     ) -> Tuple[list, list]:
         """import a stix2 bundle from JSON data
 
@@ -235,11 +341,13 @@ class OpenCTIStix2:
         :param work_id work_id: str, optional
         :param objects_max_refs: max deps amount of objects, reject object import if larger than configured amount
         :type objects_max_refs: int, optional
+        :param stats: collect the throughput statistics of the import in this object
+        :type stats: OpenCTIStix2ImportStats, optional
         :return: list of imported stix2 objects and a list of stix2 objects with too many deps
         :rtype: Tuple[List,List]
         """
-        data = json.loads(json_data)
-        return self.import_bundle(data, update, types, work_id, objects_max_refs)
+        data = opencti_json.loads(json_data)
+        return self.import_bundle(data, update, types, work_id, objects_max_refs, stats)
 
     def resolve_author(self, title: str) -> Optional[Identity]:
         if "fireeye" in title.lower() or "mandiant" in title.lower():
@@ -283,17 +391,93 @@ class OpenCTIStix2:
         return None
 
     def get_author(self, name: str) -> Identity:
-        if name in self.mapping_cache:
-            return self.mapping_cache[name]
+        if "author_" + name in self.mapping_cache:
+            return self.mapping_cache["author_" + name]
         else:
             author = self.opencti.identity.create(
                 type="Organization",
                 name=name,
                 description="",
             )
-            self.mapping_cache[name] = author
+            self.mapping_cache["author_" + name] = author
             return author
 
+    def get_vocabularies_definition_fields(self) -> Dict:
+        """get the open vocabulary fields, indexed by field key
+
+        Definitions are fetched once and kept in the permanent mapping cache,
+        along with the category of each field (`category_<key>`).
+
+        :return: open vocabulary field definitions by key
+        :rtype: dict
+        """
+        fields = self.mapping_cache_permanent.get("vocabularies_definition_index")
+        if fields is not None:
+            return fields
+        if self.mapping_cache_permanent.get("vocabularies_definition_fields") is None:
+            self.mapping_cache_permanent["vocabularies_definition_fields"] = []
+            query = """
+                    query getVocabCategories {
+                      vocabularyCategories {
+                        key
+                        fields{
+                          key
+                          required
+                        }
+                      }
+                    }
+                """
+            result = self.opencti.query(query)
+            for category in result["data"]["vocabularyCategories"]:
+                for field in category["fields"]:
+                    self.mapping_cache_permanent[
+                        "vocabularies_definition_fields"
+                    ].append(field)
+                    self.mapping_cache_permanent["category_" + field["key"]] = category[
+                        "key"
+                    ]
+        fields = {}
+        for field in self.mapping_cache_permanent["vocabularies_definition_fields"]:
+            fields[field["key"]] = field
+        self.mapping_cache_permanent["vocabularies_definition_index"] = fields
+        return fields
+
+    def resolve_external_reference(self, external_reference: Dict) -> Optional[str]:
+        """upserts a stix2 external reference and returns its internal id
+
+        Distinct references (same standard id, as computed by the splitter) are
+        upserted once and then served from cache, unless
+        `cache_external_references` is disabled.
+
+        :param external_reference: stix2 external reference
+        :type external_reference: dict
+        :return: internal id of the external reference or None if it has no id
+        :rtype: str or None
+        """
+        url = external_reference.get("url")
+        source_name = external_reference.get("source_name")
+        external_id = external_reference.get("external_id")
+        generated_ref_id = external_reference_generate_id(
+            url=url, source_name=source_name, external_id=external_id
+        )
+        if generated_ref_id is None:
+            return None
+        if (
+            self.cache_external_references
+            and generated_ref_id in self.external_reference_cache
+        ):
+            return self.external_reference_cache[generated_ref_id]
+        external_reference_id = self.opencti.external_reference.create(
+            source_name=source_name,
+            url=url,
+            external_id=external_id,
+            description=external_reference.get("description"),
+        )["id"]
+        if self.cache_external_references:
+            self.external_reference_cache[generated_ref_id] = external_reference_id
+        return external_reference_id
+
+    @timed_phase(PHASE_EMBEDDED_RESOLUTION)
     def extract_embedded_relationships(
         self, stix_object: Dict, types: List = None
     ) -> Dict:
@@ -306,6 +490,7 @@ class OpenCTIStix2:
         :return: embedded relationships as dict
         :rtype: dict
         """
+        extensions = self.extension_view(stix_object)
 
         # Created By Ref
         created_by_id = None
@@ -313,13 +498,8 @@ class OpenCTIStix2:
             created_by_id = stix_object["created_by_ref"]
         elif "x_opencti_created_by_ref" in stix_object:
             created_by_id = stix_object["x_opencti_created_by_ref"]
-        elif (
-            self.opencti.get_attribute_in_extension("created_by_ref", stix_object)
-            is not None
-        ):
-            created_by_id = self.opencti.get_attribute_in_extension(
-                "created_by_ref", stix_object
-            )
+        elif extensions.get("created_by_ref") is not None:
+            created_by_id = extensions.get("created_by_ref")
         # Object Marking Refs
         object_marking_ids = (
             stix_object["object_marking_refs"]
@@ -329,69 +509,36 @@ class OpenCTIStix2:
 
         # Open vocabularies
         object_open_vocabularies = {}
-        if self.mapping_cache_permanent.get("vocabularies_definition_fields") is None:
-            self.mapping_cache_permanent["vocabularies_definition_fields"] = []
-            query = """
-                    query getVocabCategories {
-                      vocabularyCategories {
-                        key
-                        fields{
-                          key
-                          required
-                        }
-                      }
-                    }
-                """
-            result = self.opencti.query(query)
-            for category in result["data"]["vocabularyCategories"]:
-                for field in category["fields"]:
-                    self.mapping_cache_permanent[
-                        "vocabularies_definition_fields"
-                    ].append(field)
-                    self.mapping_cache_permanent["category_" + field["key"]] = category[
-                        "key"
-                    ]
-        if any(
-            field["key"] in stix_object
-            for field in self.mapping_cache_permanent["vocabularies_definition_fields"]
-        ):
-            for f in self.mapping_cache_permanent["vocabularies_definition_fields"]:
-                if (
-                    stix_object.get(f["key"]) is None
-                    or len(stix_object.get(f["key"])) == 0
-                ):
-                    continue
-                if isinstance(stix_object.get(f["key"]), list):
-                    object_open_vocabularies[f["key"]] = []
-                    for vocab in stix_object[f["key"]]:
-                        resolved_vocab = (
-                            self.opencti.vocabulary.read_or_create_unchecked_with_cache(
-                                vocab, self.mapping_cache_permanent, field=f
-                            )
-                        )
-                        if resolved_vocab is not None:
-                            object_open_vocabularies[f["key"]].append(
-                                resolved_vocab["name"]
-                            )
-                else:
+        vocabularies_fields = self.get_vocabularies_definition_fields()
+        # Only the vocabulary fields set on the object, in the object order
+        vocabularies_keys = [key for key in stix_object if key in vocabularies_fields]
+        for key in vocabularies_keys:
+            f = vocabularies_fields[key]
+            if stix_object.get(key) is None or len(stix_object.get(key)) == 0:
+                continue
+            if isinstance(stix_object.get(key), list):
+                object_open_vocabularies[key] = []
+                for vocab in stix_object[key]:
                     resolved_vocab = (
                         self.opencti.vocabulary.read_or_create_unchecked_with_cache(
-                            stix_object[f["key"]], self.mapping_cache_permanent, field=f
+                            vocab, self.mapping_cache_permanent, field=f
                         )
                     )
                     if resolved_vocab is not None:
-                        object_open_vocabularies[f["key"]] = resolved_vocab["name"]
+                        object_open_vocabularies[key].append(resolved_vocab["name"])
+            else:
+                resolved_vocab = (
+                    self.opencti.vocabulary.read_or_create_unchecked_with_cache(
+                        stix_object[key], self.mapping_cache_permanent, field=f
+                    )
+                )
+                if resolved_vocab is not None:
+                    object_open_vocabularies[key] = resolved_vocab["name"]
 
         # Object Labels
         object_label_ids = []
-        if (
-            "labels" not in stix_object
-            and self.opencti.get_attribute_in_extension("labels", stix_object)
-            is not None
-        ):
-            stix_object["labels"] = self.opencti.get_attribute_in_extension(
-                "labels", stix_object
-            )
+        if "labels" not in stix_object and extensions.get("labels") is not None:
+            stix_object["labels"] = extensions.get("labels")
         if "labels" in stix_object:
             for label in stix_object["labels"]:
                 if "label_" + label in self.mapping_cache:
@@ -402,7 +549,7 @@ class OpenCTIStix2:
                         value=label
                     )
                 if label_data is not None:
-                    self.mapping_cache["label_" + label] = label_data
+                    self.mapping_cache["label_" + label] = {"id": label_data["id"]}
                     object_label_ids.append(label_data["id"])
         elif "x_opencti_labels" in stix_object:
             for label in stix_object["x_opencti_labels"]:
@@ -414,7 +561,7 @@ class OpenCTIStix2:
                         value=label
                     )
                 if label_data is not None:
-                    self.mapping_cache["label_" + label] = label_data
+                    self.mapping_cache["label_" + label] = {"id": label_data["id"]}
                     object_label_ids.append(label_data["id"])
         elif "x_opencti_tags" in stix_object:
             for tag in stix_object["x_opencti_tags"]:
@@ -428,33 +575,27 @@ class OpenCTIStix2:
                         value=label, color=color
                     )
                 if label_data is not None:
-                    self.mapping_cache["label_" + label] = label_data
+                    self.mapping_cache["label_" + label] = {"id": label_data["id"]}
                     object_label_ids.append(label_data["id"])
         # Kill Chain Phases
         kill_chain_phases_ids = []
         if (
             "kill_chain_phases" not in stix_object
-            and self.opencti.get_attribute_in_extension(
-                "kill_chain_phases", stix_object
-            )
-            is not None
+            and extensions.get("kill_chain_phases") is not None
         ):
-            stix_object["kill_chain_phases"] = self.opencti.get_attribute_in_extension(
-                "kill_chain_phases", stix_object
-            )
+            stix_object["kill_chain_phases"] = extensions.get("kill_chain_phases")
         if (
             "kill_chain_phases" in stix_object
             and stix_object["kill_chain_phases"] is not None
         ):
             for kill_chain_phase in stix_object["kill_chain_phases"]:
-                if (
-                    kill_chain_phase["kill_chain_name"] + kill_chain_phase["phase_name"]
-                    in self.mapping_cache
-                ):
-                    kill_chain_phase = self.mapping_cache[
-                        kill_chain_phase["kill_chain_name"]
-                        + kill_chain_phase["phase_name"]
-                    ]
+                kill_chain_phase_key = (
+                    "kill_chain_phase_"
+                    + kill_chain_phase["kill_chain_name"]
+                    + kill_chain_phase["phase_name"]
+                )
+                if kill_chain_phase_key in self.mapping_cache:
+                    kill_chain_phase = self.mapping_cache[kill_chain_phase_key]
                 else:
                     if (
                         "x_opencti_order" not in kill_chain_phase
@@ -480,10 +621,7 @@ class OpenCTIStix2:
                             kill_chain_phase["id"] if "id" in kill_chain_phase else None
                         ),
                     )
-                    self.mapping_cache[
-                        kill_chain_phase["kill_chain_name"]
-                        + kill_chain_phase["phase_name"]
-                    ] = {
+                    self.mapping_cache[kill_chain_phase_key] = {
                         "id": kill_chain_phase["id"],
                         "type": kill_chain_phase["entity_type"],
                     }
@@ -493,14 +631,13 @@ class OpenCTIStix2:
             and stix_object["x_opencti_kill_chain_phases"] is not None
         ):
             for kill_chain_phase in stix_object["x_opencti_kill_chain_phases"]:
-                if (
-                    kill_chain_phase["kill_chain_name"] + kill_chain_phase["phase_name"]
-                    in self.mapping_cache
-                ):
-                    kill_chain_phase = self.mapping_cache[
-                        kill_chain_phase["kill_chain_name"]
-                        + kill_chain_phase["phase_name"]
-                    ]
+                kill_chain_phase_key = (
+                    "kill_chain_phase_"
+                    + kill_chain_phase["kill_chain_name"]
+                    + kill_chain_phase["phase_name"]
+                )
+                if kill_chain_phase_key in self.mapping_cache:
+                    kill_chain_phase = self.mapping_cache[kill_chain_phase_key]
                 else:
                     if (
                         "x_opencti_order" not in kill_chain_phase
@@ -526,10 +663,7 @@ class OpenCTIStix2:
                             kill_chain_phase["id"] if "id" in kill_chain_phase else None
                         ),
                     )
-                    self.mapping_cache[
-                        kill_chain_phase["kill_chain_name"]
-                        + kill_chain_phase["phase_name"]
-                    ] = {
+                    self.mapping_cache[kill_chain_phase_key] = {
                         "id": kill_chain_phase["id"],
                         "type": kill_chain_phase["entity_type"],
                     }
@@ -543,66 +677,32 @@ class OpenCTIStix2:
         external_references_ids = []
         if (
             "external_references" not in stix_object
-            and self.opencti.get_attribute_in_extension(
-                "external_references", stix_object
-            )
-            is not None
+            and extensions.get("external_references") is not None
         ):
-            stix_object["external_references"] = (
-                self.opencti.get_attribute_in_extension(
-                    "external_references", stix_object
-                )
-            )
+            stix_object["external_references"] = extensions.get("external_references")
         if (
             "external_references" in stix_object
             and stix_object["external_references"] is not None
         ):
             for external_reference in stix_object["external_references"]:
                 try:
-                    url = (
-                        external_reference["url"]
-                        if "url" in external_reference
-                        else None
-                    )
                     source_name = (
                         external_reference["source_name"]
                         if "source_name" in external_reference
                         else None
                     )
-                    external_id = (
-                        external_reference["external_id"]
-                        if "external_id" in external_reference
-                        else None
+                    external_reference_id = self.resolve_external_reference(
+                        external_reference
                     )
-                    generated_ref_id = self.opencti.external_reference.generate_id(
-                        url, source_name, external_id
-                    )
-                    if generated_ref_id is None:
+                    if external_reference_id is None:
                         continue
-                    else:
-                        external_reference_id = self.opencti.external_reference.create(
-                            source_name=source_name,
-                            url=url,
-                            external_id=external_id,
-                            description=(
-                                external_reference["description"]
-                                if "description" in external_reference
-                                else None
-                            ),
-                        )["id"]
                     if "x_opencti_files" in external_reference:
                         for file in external_reference["x_opencti_files"]:
                             if "data" in file:
-                                self.opencti.external_reference.add_file(
-                                    id=external_reference_id,
-                                    file_name=file["name"],
-                                    version=file.get("version", None),
-                                    data=base64.b64decode(file["data"]),
-                                    fileMarkings=file.get("object_marking_refs", None),
-                                    mime_type=file["mime_type"],
-                                    no_trigger_import=file.get(
-                                        "no_trigger_import", False
-                                    ),
+                                self.upload_file(
+                                    self.opencti.external_reference.add_file,
+                                    external_reference_id,
+                                    file,
                                 )
                     if (
                         self.opencti.get_attribute_in_extension(
@@ -614,16 +714,10 @@ class OpenCTIStix2:
                             "files", external_reference
                         ):
                             if "data" in file:
-                                self.opencti.external_reference.add_file(
-                                    id=external_reference_id,
-                                    file_name=file["name"],
-                                    version=file.get("version", None),
-                                    data=base64.b64decode(file["data"]),
-                                    fileMarkings=file.get("object_marking_refs", None),
-                                    mime_type=file["mime_type"],
-                                    no_trigger_import=file.get(
-                                        "no_trigger_import", False
-                                    ),
+                                self.upload_file(
+                                    self.opencti.external_reference.add_file,
+                                    external_reference_id,
+                                    file,
                                 )
                     external_references_ids.append(external_reference_id)
                     if stix_object["type"] in [
@@ -638,33 +732,12 @@ class OpenCTIStix2:
                     ):
                         # Add a corresponding report
                         # Extract date
-                        try:
-                            if "description" in external_reference:
-                                matches = datefinder.find_dates(
-                                    external_reference["description"],
-                                    base_date=datetime.datetime.fromtimestamp(0),
-                                )
-                            else:
-                                matches = datefinder.find_dates(
-                                    source_name,
-                                    base_date=datetime.datetime.fromtimestamp(0),
-                                )
-                        except:
-                            matches = None
-                        published = None
-                        yesterday = datetime.datetime.now() - datetime.timedelta(days=1)
+                        published = extract_date(
+                            external_reference["description"]
+                            if "description" in external_reference
+                            else source_name
+                        )
                         default_date = datetime.datetime.fromtimestamp(1)
-                        if matches is not None:
-                            try:
-                                for match in matches:
-                                    if (
-                                        match.timestamp() < yesterday.timestamp()
-                                        and len(str(match.year)) == 4
-                                    ):
-                                        published = match.strftime("%Y-%m-%dT%H:%M:%SZ")
-                                        break
-                            except:
-                                pass
                         if published is None:
                             published = default_date.strftime("%Y-%m-%dT%H:%M:%SZ")
 
@@ -742,44 +815,18 @@ class OpenCTIStix2:
             and stix_object["x_opencti_external_references"] is not None
         ):
             for external_reference in stix_object["x_opencti_external_references"]:
-                url = external_reference["url"] if "url" in external_reference else None
-                source_name = (
-                    external_reference["source_name"]
-                    if "source_name" in external_reference
-                    else None
+                external_reference_id = self.resolve_external_reference(
+                    external_reference
                 )
-                external_id = (
-                    external_reference["external_id"]
-                    if "external_id" in external_reference
-                    else None
-                )
-                generated_ref_id = self.opencti.external_reference.generate_id(
-                    url, source_name, external_id
-                )
-                if generated_ref_id is None:
+                if external_reference_id is None:
                     continue
-                else:
-                    external_reference_id = self.opencti.external_reference.create(
-                        source_name=source_name,
-                        url=url,
-                        external_id=external_id,
-                        description=(
-                            external_reference["description"]
-                            if "description" in external_reference
-                            else None
-                        ),
-                    )["id"]
                 if "x_opencti_files" in external_reference:
                     for file in external_reference["x_opencti_files"]:
                         if "data" in file:
-                            self.opencti.external_reference.add_file(
-                                id=external_reference_id,
-                                file_name=file["name"],
-                                version=file.get("version", None),
-                                data=base64.b64decode(file["data"]),
-                                fileMarkings=file.get("object_marking_refs", None),
-                                mime_type=file["mime_type"],
-                                no_trigger_import=file.get("no_trigger_import", False),
+                            self.upload_file(
+                                self.opencti.external_reference.add_file,
+                                external_reference_id,
+                                file,
                                 embedded=file.get("embedded", False),
                             )
                 if (
@@ -790,14 +837,10 @@ class OpenCTIStix2:
                         "files", external_reference
                     ):
                         if "data" in file:
-                            self.opencti.external_reference.add_file(
-                                id=external_reference_id,
-                                file_name=file["name"],
-                                version=file.get("version", None),
-                                data=base64.b64decode(file["data"]),
-                                fileMarkings=file.get("object_marking_refs", None),
-                                mime_type=file["mime_type"],
-                                no_trigger_import=file.get("no_trigger_import", False),
+                            self.upload_file(
+                                self.opencti.external_reference.add_file,
+                                external_reference_id,
+                                file,
                                 embedded=file.get("embedded", False),
                             )
                 external_references_ids.append(external_reference_id)
@@ -805,12 +848,9 @@ class OpenCTIStix2:
         granted_refs_ids = []
         if (
             "x_opencti_granted_refs" not in stix_object
-            and self.opencti.get_attribute_in_extension("granted_refs", stix_object)
-            is not None
+            and extensions.get("granted_refs") is not None
         ):
-            granted_refs_ids = self.opencti.get_attribute_in_extension(
-                "granted_refs", stix_object
-            )
+            granted_refs_ids = extensions.get("granted_refs")
         elif (
             "x_opencti_granted_refs" in stix_object
             and stix_object["x_opencti_granted_refs"] is not None
@@ -1004,6 +1044,27 @@ class OpenCTIStix2:
         helper = stix_helpers.get(data["type"])
         return helper.generate_id_from_data(data)
 
+    def generate_ids(self, entity_type: str, records: List[Dict]) -> List[str]:
+        """Generate the standard IDs of several objects of the same type.
+
+        :param entity_type: STIX type of the objects
+        :type entity_type: str
+        :param records: STIX data dictionaries
+        :type records: list
+        :return: Generated standard IDs, in the records order
+        :rtype: list
+        """
+        helper = self.get_stix_helper().get(entity_type)
+        if helper is None:
+            helper = {
+                "external-reference": self.opencti.external_reference,
+                "kill-chain-phase": self.opencti.kill_chain_phase,
+            }.get(entity_type)
+        if helper is None:
+            raise ValueError("No standard ID generation for type " + entity_type)
+        generate_id_from_data = helper.generate_id_from_data
+        return [generate_id_from_data(record) for record in records]
+
     # region import
     def import_object(
         self, stix_object: Dict, update: bool = False, types: List = None
@@ -1024,6 +1085,7 @@ class OpenCTIStix2:
             "Importing an object",
             {"type": stix_object["type"], "id": stix_object["id"]},
         )
+        extensions = self.extension_view(stix_object)
 
         # Extract
         embedded_relationships = self.extract_embedded_relationships(stix_object, types)
@@ -1048,6 +1110,7 @@ class OpenCTIStix2:
             "external_references_ids": external_references_ids,
             "reports": reports,
             "sample_ids": sample_refs_ids,
+            "extensions": extensions,
         }
 
         stix_helper = self.get_stix_helper().get(stix_object["type"])
@@ -1097,32 +1160,19 @@ class OpenCTIStix2:
             if "x_opencti_files" in stix_object:
                 for file in stix_object["x_opencti_files"]:
                     if "data" in file:
-                        self.opencti.stix_domain_object.add_file(
-                            id=stix_object_result["id"],
-                            file_name=file["name"],
-                            version=file.get("version", None),
-                            data=base64.b64decode(file["data"]),
-                            fileMarkings=file.get("object_marking_refs", None),
-                            mime_type=file["mime_type"],
-                            no_trigger_import=file.get("no_trigger_import", False),
+                        self.upload_file(
+                            self.opencti.stix_domain_object.add_file,
+                            stix_object_result["id"],
+                            file,
                             embedded=file.get("embedded", False),
                         )
-            if (
-                self.opencti.get_attribute_in_extension("files", stix_object)
-                is not None
-            ):
-                for file in self.opencti.get_attribute_in_extension(
-                    "files", stix_object
-                ):
+            if extensions.get("files") is not None:
+                for file in extensions.get("files"):
                     if "data" in file:
-                        self.opencti.stix_domain_object.add_file(
-                            id=stix_object_result["id"],
-                            file_name=file["name"],
-                            version=file.get("version", None),
-                            data=base64.b64decode(file["data"]),
-                            fileMarkings=file.get("object_marking_refs", None),
-                            mime_type=file["mime_type"],
-                            no_trigger_import=file.get("no_trigger_import", False),
+                        self.upload_file(
+                            self.opencti.stix_domain_object.add_file,
+                            stix_object_result["id"],
+                            file,
                             embedded=file.get("embedded", False),
                         )
         return stix_object_results
@@ -1130,6 +1180,7 @@ class OpenCTIStix2:
     def import_observable(
         self, stix_object: Dict, update: bool = False, types: List = None
     ) -> None:
+        extensions = self.extension_view(stix_object)
         # Extract
         embedded_relationships = self.extract_embedded_relationships(stix_object, types)
         created_by_id = embedded_relationships["created_by"]
@@ -1155,6 +1206,7 @@ class OpenCTIStix2:
             "external_references_ids": external_references_ids,
             "reports": reports,
             "sample_ids": sample_refs_ids,
+            "extensions": extensions,
         }
         if stix_object["type"] == "simple-observable":
             stix_observable_result = self.opencti.stix_cyber_observable.create(
@@ -1228,32 +1280,19 @@ class OpenCTIStix2:
             if "x_opencti_files" in stix_object:
                 for file in stix_object["x_opencti_files"]:
                     if "data" in file:
-                        self.opencti.stix_cyber_observable.add_file(
-                            id=stix_observable_result["id"],
-                            file_name=file["name"],
-                            version=file.get("version", None),
-                            data=base64.b64decode(file["data"]),
-                            fileMarkings=file.get("object_marking_refs", None),
-                            mime_type=file["mime_type"],
-                            no_trigger_import=file.get("no_trigger_import", False),
+                        self.upload_file(
+                            self.opencti.stix_cyber_observable.add_file,
+                            stix_observable_result["id"],
+                            file,
                             embedded=file.get("embedded", False),
                         )
-            if (
-                self.opencti.get_attribute_in_extension("files", stix_object)
-                is not None
-            ):
-                for file in self.opencti.get_attribute_in_extension(
-                    "files", stix_object
-                ):
+            if extensions.get("files") is not None:
+                for file in extensions.get("files"):
                     if "data" in file:
-                        self.opencti.stix_cyber_observable.add_file(
-                            id=stix_observable_result["id"],
-                            file_name=file["name"],
-                            version=file.get("version", None),
-                            data=base64.b64decode(file["data"]),
-                            fileMarkings=file.get("object_marking_refs", None),
-                            mime_type=file["mime_type"],
-                            no_trigger_import=file.get("no_trigger_import", False),
+                        self.upload_file(
+                            self.opencti.stix_cyber_observable.add_file,
+                            stix_observable_result["id"],
+                            file,
                             embedded=file.get("embedded", False),
                         )
             if "id" in stix_object:
@@ -1266,6 +1305,7 @@ class OpenCTIStix2:
                 "type": stix_observable_result["entity_type"],
             }
             # Iterate over refs to create appropriate relationships
+            nested_refs = []
             for key in stix_object.keys():
                 if key not in [
                     "created_by_ref",
@@ -1283,10 +1323,12 @@ class OpenCTIStix2:
                             relationship_type = "x_opencti_" + relationship_type
                         else:
                             relationship_type = relationship_type.replace("_", "-")
-                        self.opencti.stix_nested_ref_relationship.create(
-                            fromId=stix_observable_result["id"],
-                            toId=stix_object[key],
-                            relationship_type=relationship_type,
+                        nested_refs.append(
+                            {
+                                "fromId": stix_observable_result["id"],
+                                "toId": stix_object[key],
+                                "relationship_type": relationship_type,
+                            }
                         )
                     elif key.endswith("_refs"):
                         relationship_type = key.replace("_refs", "")
@@ -1299,17 +1341,27 @@ class OpenCTIStix2:
                         else:
                             relationship_type = relationship_type.replace("_", "-")
                         for value in stix_object[key]:
-                            self.opencti.stix_nested_ref_relationship.create(
-                                fromId=stix_observable_result["id"],
-                                toId=value,
-                                relationship_type=relationship_type,
+                            nested_refs.append(
+                                {
+                                    "fromId": stix_observable_result["id"],
+                                    "toId": value,
+                                    "relationship_type": relationship_type,
+                                }
                             )
+            if self.batch_nested_refs:
+                self.opencti.stix_nested_ref_relationship.create_many(
+                    relationships=nested_refs
+                )
+            else:
+                for nested_ref in nested_refs:
+                    self.opencti.stix_nested_ref_relationship.create(**nested_ref)
         else:
             return None
 
     def import_relationship(
         self, stix_relation: Dict, update: bool = False, types: List = None
     ) -> None:
+        extensions = self.extension_view(stix_relation)
         # Extract
         embedded_relationships = self.extract_embedded_relationships(
             stix_relation, types
@@ -1337,6 +1389,7 @@ class OpenCTIStix2:
             "external_references_ids": external_references_ids,
             "reports": reports,
             "sample_ids": sample_refs_ids,
+            "extensions": extensions,
         }
 
         # Create the relation
@@ -1345,32 +1398,11 @@ class OpenCTIStix2:
         date = None
         if "external_references" in stix_relation:
             for external_reference in stix_relation["external_references"]:
-                try:
-                    if "description" in external_reference:
-                        matches = datefinder.find_dates(
-                            external_reference["description"],
-                            base_date=datetime.datetime.fromtimestamp(0),
-                        )
-                    else:
-                        matches = datefinder.find_dates(
-                            external_reference["source_name"],
-                            base_date=datetime.datetime.fromtimestamp(0),
-                        )
-                except:
-                    matches = None
-                date = None
-                yesterday = datetime.datetime.now() - datetime.timedelta(days=1)
-                if matches is not None:
-                    try:
-                        for match in matches:
-                            if (
-                                match.timestamp() < yesterday.timestamp()
-                                and len(str(match.year)) == 4
-                            ):
-                                date = match.strftime("%Y-%m-%dT%H:%M:%SZ")
-                                break
-                    except:
-                        date = None
+                date = extract_date(
+                    external_reference["description"]
+                    if "description" in external_reference
+                    else external_reference.get("source_name")
+                )
 
         stix_relation_result = self.opencti.stix_core_relationship.import_from_stix2(
             stixRelation=stix_relation, extras=extras, update=update, defaultDate=date
@@ -1407,6 +1439,7 @@ class OpenCTIStix2:
         update: bool = False,
         types: List = None,
     ) -> None:
+        extensions = self.extension_view(stix_sighting)
         # Extract
         embedded_relationships = self.extract_embedded_relationships(
             stix_sighting, types
@@ -1434,22 +1467,18 @@ class OpenCTIStix2:
             "external_references_ids": external_references_ids,
             "reports": reports,
             "sample_ids": sample_refs_ids,
+            "extensions": extensions,
         }
 
         # Create the sighting
 
         if (
             "x_opencti_negative" not in stix_sighting
-            and self.opencti.get_attribute_in_extension("negative", stix_sighting)
-            is not None
+            and extensions.get("negative") is not None
         ):
-            stix_sighting["x_opencti_negative"] = (
-                self.opencti.get_attribute_in_extension("negative", stix_sighting)
-            )
+            stix_sighting["x_opencti_negative"] = extensions.get("negative")
         if "x_opencti_workflow_id" not in stix_sighting:
-            stix_sighting["x_opencti_workflow_id"] = (
-                self.opencti.get_attribute_in_extension("workflow_id", stix_sighting)
-            )
+            stix_sighting["x_opencti_workflow_id"] = extensions.get("workflow_id")
         stix_sighting_result = self.opencti.stix_sighting_relationship.create(
             fromId=from_id,
             toId=to_id,
@@ -1519,6 +1548,37 @@ class OpenCTIStix2:
     # endregion
 
     # region export
+    def export_session(self, maxsize: int = 10000) -> OpenCTIStix2ExportSession:
+        """Create an export session memoizing converted STIX objects.
+
+        Use it as a context manager around several export calls so that shared
+        identities, markings and related objects are read and converted once.
+
+        :param maxsize: maximum number of converted entries kept in memory
+        :type maxsize: int, optional
+        :return: the export session
+        :rtype: OpenCTIStix2ExportSession
+        """
+        return OpenCTIStix2ExportSession(self, maxsize=maxsize)
+
+    def _export_memoize(self, key, convert):
+        if self.current_export_session is None:
+            return convert()
+        return self.current_export_session.get_or_convert(key, convert)
+
+    def _export_is_accessible(self, id: str, access_filter: Dict = None) -> bool:
+        def check_access():
+            filters = self.prepare_id_filters_export(id=id, access_filter=access_filter)
+            result = self.opencti.opencti_stix_object_or_stix_relationship.list(
+                filters=filters
+            )
+            return len(result) > 0
+
+        return self._export_memoize(
+            ("access", id, OpenCTIStix2ExportSession.access_key(access_filter)),
+            check_access,
+        )
+
     def generate_export(self, entity: Dict, no_custom_attributes: bool = False) -> Dict:
         # Handle model deviation
         original_entity_type = entity["entity_type"]
@@ -1729,6 +1789,27 @@ class OpenCTIStix2:
 
         return {k: v for k, v in entity.items() if self.opencti.not_empty(v)}
 
+    @staticmethod
+    def generate_marking_definition_export(entity_marking_definition: Dict) -> Dict:
+        if entity_marking_definition["definition_type"] == "TLP":
+            created = "2017-01-20T00:00:00.000Z"
+        else:
+            created = entity_marking_definition["created"]
+        return {
+            "type": "marking-definition",
+            "spec_version": SPEC_VERSION,
+            "id": entity_marking_definition["standard_id"],
+            "created": created,
+            "definition_type": entity_marking_definition["definition_type"].lower(),
+            "name": entity_marking_definition["definition"],
+            "definition": {
+                entity_marking_definition["definition_type"]
+                .lower(): entity_marking_definition["definition"]
+                .lower()
+                .replace("tlp:", "")
+            },
+        }
+
     @staticmethod
     def prepare_id_filters_export(
         id: Union[str, List[str]], access_filter: Dict = None
@@ -1781,7 +1862,10 @@ class OpenCTIStix2:
             and "createdBy" in entity
             and entity["createdBy"] is not None
         ):
-            created_by = self.generate_export(entity=entity["createdBy"])
+            created_by = self._export_memoize(
+                ("created_by", entity["createdBy"]["id"]),
+                lambda: self.generate_export(entity=entity["createdBy"]),
+            )
             if entity["type"] in STIX_CYBER_OBSERVABLE_MAPPING:
                 entity["x_opencti_created_by_ref"] = created_by["id"]
             else:
@@ -1807,7 +1891,10 @@ class OpenCTIStix2:
             and "dataSource" in entity
             and entity["dataSource"] is not None
         ):
-            data_source = self.generate_export(entity["dataSource"])
+            data_source = self._export_memoize(
+                ("data_source", entity["dataSource"]["id"]),
+                lambda: self.generate_export(entity["dataSource"]),
+            )
             entity["x_mitre_data_source_ref"] = data_source["id"]
             result.append(data_source)
         if "dataSource" in entity:
@@ -1854,26 +1941,12 @@ class OpenCTIStix2:
         ):
             entity["object_marking_refs"] = []
             for entity_marking_definition in entity["objectMarking"]:
-                if entity_marking_definition["definition_type"] == "TLP":
-                    created = "2017-01-20T00:00:00.000Z"
-                else:
-                    created = entity_marking_definition["created"]
-                marking_definition = {
-                    "type": "marking-definition",
-                    "spec_version": SPEC_VERSION,
-                    "id": entity_marking_definition["standard_id"],
-                    "created": created,
-                    "definition_type": entity_marking_definition[
-                        "definition_type"
-                    ].lower(),
-                    "name": entity_marking_definition["definition"],
-                    "definition": {
-                        entity_marking_definition["definition_type"]
-                        .lower(): entity_marking_definition["definition"]
-                        .lower()
-                        .replace("tlp:", "")
-                    },
-                }
+                marking_definition = self._export_memoize(
+                    ("marking", entity_marking_definition["id"]),
+                    lambda: self.generate_marking_definition_export(
+                        entity_marking_definition
+                    ),
+                )
                 result.append(marking_definition)
                 entity["object_marking_refs"].append(marking_definition["id"])
         if "objectMarking" in entity:
@@ -1958,28 +2031,14 @@ class OpenCTIStix2:
             entity["type"] = "sighting"
             entity["count"] = entity["attribute_count"]
             del entity["attribute_count"]
-            from_to_check = entity["from"]["id"]
-            relationships_from_filter = self.prepare_id_filters_export(
-                id=from_to_check, access_filter=access_filter
-            )
-            x = self.opencti.opencti_stix_object_or_stix_relationship.list(
-                filters=relationships_from_filter
-            )
-            if len(x) > 0:
+            if self._export_is_accessible(entity["from"]["id"], access_filter):
                 entity["sighting_of_ref"] = entity["from"]["standard_id"]
                 # handle from and to separately like Stix Core Relationship and call 2 requests
                 objects_to_get.append(
                     entity["from"]
                 )  # what happen with unauthorized objects ?
 
-            to_to_check = [entity["to"]["id"]]
-            relationships_to_filter = self.prepare_id_filters_export(
-                id=to_to_check, access_filter=access_filter
-            )
-            y = self.opencti.opencti_stix_object_or_stix_relationship.list(
-                filters=relationships_to_filter
-            )
-            if len(y) > 0:
+            if self._export_is_accessible(entity["to"]["id"], access_filter):
                 entity["where_sighted_refs"] = [entity["to"]["standard_id"]]
                 objects_to_get.append(entity["to"])
 
@@ -1989,14 +2048,7 @@ class OpenCTIStix2:
         if "from" in entity or "to" in entity:
             entity["type"] = "relationship"
         if "from" in entity:
-            from_to_check = entity["from"]["id"]
-            relationships_from_filter = self.prepare_id_filters_export(
-                id=from_to_check, access_filter=access_filter
-            )
-            x = self.opencti.opencti_stix_object_or_stix_relationship.list(
-                filters=relationships_from_filter
-            )
-            if len(x) > 0:
+            if self._export_is_accessible(entity["from"]["id"], access_filter):
                 entity["source_ref"] = entity["from"]["standard_id"]
                 # handle from and to separately like Stix Core Relationship and call 2 requests
                 objects_to_get.append(
@@ -2004,14 +2056,7 @@ class OpenCTIStix2:
                 )  # what happen with unauthorized objects ?
             del entity["from"]
         if "to" in entity:
-            to_to_check = [entity["to"]["id"]]
-            relationships_to_filter = self.prepare_id_filters_export(
-                id=to_to_check, access_filter=access_filter
-            )
-            y = self.opencti.opencti_stix_object_or_stix_relationship.list(
-                filters=relationships_to_filter
-            )
-            if len(y) > 0:
+            if self._export_is_accessible(entity["to"]["id"], access_filter):
                 entity["target_ref"] = entity["to"]["standard_id"]
                 objects_to_get.append(entity["to"])
             del entity["to"]
@@ -2191,22 +2236,15 @@ class OpenCTIStix2:
                 del entity["x_opencti_id"]
             # Get extra objects
             for entity_object in objects_to_get:
-                resolve_type = entity_object["entity_type"]
-                if "stix-core-relationship" in entity_object["parent_types"]:
-                    resolve_type = "stix-core-relationship"
-                if "stix-ref-relationship" in entity_object["parent_types"]:
-                    resolve_type = "stix-ref-relationship"
-                do_read = self.get_reader(resolve_type)
-                query_filters = self.prepare_id_filters_export(
-                    entity_object["id"], access_filter
+                stix_entity_object = self._export_memoize(
+                    (
+                        "object",
+                        entity_object["id"],
+                        OpenCTIStix2ExportSession.access_key(access_filter),
+                    ),
+                    lambda: self.prepare_export_object(entity_object, access_filter),
                 )
-                entity_object_data = do_read(filters=query_filters)
-                if entity_object_data is not None:
-                    stix_entity_object = self.prepare_export(
-                        entity=self.generate_export(entity_object_data),
-                        mode="simple",
-                        access_filter=access_filter,
-                    )
+                if stix_entity_object is not None:
                     # Add to result
                     entity_object_bundle = self.filter_objects(
                         uuids, stix_entity_object
@@ -2287,6 +2325,36 @@ class OpenCTIStix2:
         else:
             return []
 
+    def prepare_export_object(
+        self, entity_object: Dict, access_filter: Dict = None
+    ) -> Optional[List]:
+        """Read an object related to an exported entity and convert it to STIX.
+
+        :param entity_object: object with `id`, `entity_type` and `parent_types`
+        :type entity_object: dict
+        :param access_filter: access filter applied to the read
+        :type access_filter: dict, optional
+        :return: list of STIX objects or None if the object is not accessible
+        :rtype: list or None
+        """
+        resolve_type = entity_object["entity_type"]
+        if "stix-core-relationship" in entity_object["parent_types"]:
+            resolve_type = "stix-core-relationship"
+        if "stix-ref-relationship" in entity_object["parent_types"]:
+            resolve_type = "stix-ref-relationship"
+        do_read = self.get_reader(resolve_type)
+        query_filters = self.prepare_id_filters_export(
+            entity_object["id"], access_filter
+        )
+        entity_object_data = do_read(filters=query_filters)
+        if entity_object_data is None:
+            return None
+        return self.prepare_export(
+            entity=self.generate_export(entity_object_data),
+            mode="simple",
+            access_filter=access_filter,
+        )
+
     def get_stix_bundle_or_object_from_entity_id(
         self,
         entity_type: str,
@@ -2424,6 +2492,7 @@ class OpenCTIStix2:
             withFiles=withFiles,
         )
 
+    @opencti_memory_profiler.profiled("export")
     def export_list(
         self,
         entity_type: str,
@@ -2473,6 +2542,7 @@ class OpenCTIStix2:
                     bundle["objects"] = bundle["objects"] + entity_bundle_filtered
         return bundle
 
+    @opencti_memory_profiler.profiled("export")
     def export_selected(
         self,
         entities_list: [dict],
@@ -2523,14 +2593,10 @@ class OpenCTIStix2:
         if field_patch_files is not None:
             for file in field_patch_files["value"]:
                 if "data" in file:
-                    do_add_file(
-                        id=item_id,
-                        file_name=file["name"],
-                        version=file.get("version", None),
-                        data=base64.b64decode(file["data"]),
-                        fileMarkings=file.get("object_marking_refs", None),
-                        mime_type=file.get("mime_type", None),
-                        no_trigger_import=file.get("no_trigger_import", False),
+                    self.upload_file(
+                        do_add_file,
+                        item_id,
+                        file,
                         embedded=file.get("embedded", False),
                     )
 
@@ -2818,6 +2884,7 @@ class OpenCTIStix2:
                 {"operation": operation},
             )
 
+    @opencti_tracing.traced("opencti.stix2.import_item")
     def import_item(
         self,
         item,
@@ -2825,8 +2892,73 @@ class OpenCTIStix2:
         types: List = None,
         processing_count: int = 0,
         work_id: str = None,
-    ):
-        worker_logger = self.opencti.logger_class("worker")
+    ) -> bool:
+        """Import a STIX object, waiting and retrying on recoverable errors.
+
+        :param item: STIX object to import
+        :type item: Dict
+        :param update: whether to update existing data
+        :type update: bool
+        :param types: list of types to import
+        :type types: List
+        :param processing_count: number of attempts already done
+        :type processing_count: int
+        :param work_id: work id to report the expectation to
+        :type work_id: str
+        :return: True if the item has been imported
+        :rtype: bool
+        """
+        first_attempt_at = time.monotonic()
+        while True:
+            success, delay, _, _ = self.attempt_import_item(
+                item, update, types, processing_count, work_id
+            )
+            if delay is None:
+                self.record_retry_latency(
+                    processing_count, time.monotonic() - first_attempt_at, success
+                )
+                return success
+            time.sleep(delay)
+            processing_count += 1
+
+    @staticmethod
+    def record_retry_latency(processing_count: int, latency: float, success: bool):
+        if processing_count > 0:
+            bundles_retry_latency_histogram.record(latency, {"success": success})
+
+    def attempt_import_item(
+        self,
+        item,
+        update: bool = False,
+        types: List = None,
+        processing_count: int = 0,
+        work_id: str = None,
+        defer_missing_references: bool = False,
+    ) -> Tuple[bool, Optional[float], Optional[str], List[str]]:
+        """Make a single import attempt of a STIX object.
+
+        The expectation is reported to the work once the item is imported or
+        definitively failed, not when it has to be retried or deferred.
+
+        :param item: STIX object to import
+        :type item: Dict
+        :param update: whether to update existing data
+        :type update: bool
+        :param types: list of types to import
+        :type types: List
+        :param processing_count: number of attempts already done
+        :type processing_count: int
+        :param work_id: work id to report the expectation to
+        :type work_id: str
+        :param defer_missing_references: return the missing references instead
+            of retrying or failing on a missing reference error
+        :type defer_missing_references: bool
+        :return: success, delay before retrying (None if the item must not be
+            retried), type of the error and ids of the missing references the
+            item has to wait for
+        :rtype: Tuple[bool, Optional[float], Optional[str], List[str]]
+        """
+        worker_logger = self.worker_logger
         # Ultimate protection to avoid infinite retry
         if processing_count > MAX_PROCESSING_COUNT:
             if work_id is not None:
@@ -2840,226 +2972,353 @@ class OpenCTIStix2:
                         ),
                     },
                 )
-                return False
+            return False, None, None, []
         try:
             self.opencti.set_retry_number(processing_count)
-            opencti_operation = self.opencti.get_attribute_in_extension(
-                "opencti_operation", item
-            )
-            if opencti_operation is not None:
-                self.apply_opencti_operation(item, opencti_operation)
-            elif "opencti_operation" in item:
-                self.apply_opencti_operation(item, item["opencti_operation"])
-            elif item["type"] == "relationship":
-                # Import relationship
-                self.import_relationship(item, update, types)
-            elif item["type"] == "sighting":
-                # region Resolve the to
-                to_ids = []
-                if "x_opencti_where_sighted_refs" in item:
-                    for where_sighted_ref in item["x_opencti_where_sighted_refs"]:
-                        to_ids.append(where_sighted_ref)
-                elif "where_sighted_refs" in item:
-                    for where_sighted_ref in item["where_sighted_refs"]:
-                        to_ids.append(where_sighted_ref)
-                # endregion
-                # region Resolve the from
-                from_id = None
-                if "x_opencti_sighting_of_ref" in item:
-                    from_id = item["x_opencti_sighting_of_ref"]
-                elif "sighting_of_ref" in item:
-                    from_id = item["sighting_of_ref"]
-                # endregion
-                # region create the sightings
-                if len(to_ids) > 0:
-                    if from_id:
-                        for to_id in to_ids:
-                            self.import_sighting(item, from_id, to_id, update)
-                    # Import observed_data_refs
-                    if "observed_data_refs" in item:
-                        for observed_data_ref in item["observed_data_refs"]:
+            # Uploads are run in parallel and awaited once the item is imported
+            with self.file_uploader.deferring():
+                extensions = self.extension_view(item)
+                opencti_operation = extensions.get("opencti_operation")
+                if opencti_operation is not None:
+                    self.apply_opencti_operation(item, opencti_operation)
+                elif "opencti_operation" in item:
+                    self.apply_opencti_operation(item, item["opencti_operation"])
+                elif item["type"] == "relationship":
+                    # Import relationship
+                    self.import_relationship(item, update, types)
+                elif item["type"] == "sighting":
+                    # region Resolve the to
+                    to_ids = []
+                    if "x_opencti_where_sighted_refs" in item:
+                        for where_sighted_ref in item["x_opencti_where_sighted_refs"]:
+                            to_ids.append(where_sighted_ref)
+                    elif "where_sighted_refs" in item:
+                        for where_sighted_ref in item["where_sighted_refs"]:
+                            to_ids.append(where_sighted_ref)
+                    # endregion
+                    # region Resolve the from
+                    from_id = None
+                    if "x_opencti_sighting_of_ref" in item:
+                        from_id = item["x_opencti_sighting_of_ref"]
+                    elif "sighting_of_ref" in item:
+                        from_id = item["sighting_of_ref"]
+                    # endregion
+                    # region create the sightings
+                    if len(to_ids) > 0:
+                        if from_id:
                             for to_id in to_ids:
-                                self.import_sighting(
-                                    item, observed_data_ref, to_id, update
-                                )
-                # endregion
-            elif item["type"] == "label":
-                stix_ids = self.opencti.get_attribute_in_extension("stix_ids", item)
-                self.opencti.label.create(
-                    stix_id=item["id"],
-                    value=item["value"],
-                    color=item["color"],
-                    x_opencti_stix_ids=stix_ids,
-                    update=update,
-                )
-            elif item["type"] == "vocabulary":
-                stix_ids = self.opencti.get_attribute_in_extension("stix_ids", item)
-                self.opencti.vocabulary.create(
-                    stix_id=item["id"],
-                    name=item["name"],
-                    category=item["category"],
-                    description=(
-                        item["description"] if "description" in item else None
-                    ),
-                    aliases=item["aliases"] if "aliases" in item else None,
-                    x_opencti_stix_ids=stix_ids,
-                    update=update,
-                )
-            elif item["type"] == "external-reference":
-                stix_ids = self.opencti.get_attribute_in_extension("stix_ids", item)
-                self.opencti.external_reference.create(
-                    stix_id=item["id"],
-                    source_name=(
-                        item["source_name"] if "source_name" in item else None
-                    ),
-                    url=item["url"] if "url" in item else None,
-                    external_id=(
-                        item["external_id"] if "external_id" in item else None
-                    ),
-                    description=(
-                        item["description"] if "description" in item else None
-                    ),
-                    x_opencti_stix_ids=stix_ids,
-                    update=update,
-                )
-            elif item["type"] == "kill-chain-phase":
-                stix_ids = self.opencti.get_attribute_in_extension("stix_ids", item)
-                self.opencti.kill_chain_phase.create(
-                    stix_id=item["id"],
-                    kill_chain_name=item["kill_chain_name"],
-                    phase_name=item["phase_name"],
-                    x_opencti_order=item["order"] if "order" in item else 0,
-                    x_opencti_stix_ids=stix_ids,
-                    update=update,
-                )
-            elif StixCyberObservableTypes.has_value(item["type"]):
-                if types is None or len(types) == 0:
-                    self.import_observable(item, update, types)
-                elif item["type"] in types or "observable" in types:
-                    self.import_observable(item, update, types)
-            else:
-                # Check the scope
-                if (
-                    item["type"] == "marking-definition"
-                    or types is None
-                    or len(types) == 0
-                ):
-                    self.import_object(item, update, types)
-                # Handle identity & location if part of the scope
-                elif item["type"] in types:
-                    self.import_object(item, update, types)
+                                self.import_sighting(item, from_id, to_id, update)
+                        # Import observed_data_refs
+                        if "observed_data_refs" in item:
+                            for observed_data_ref in item["observed_data_refs"]:
+                                for to_id in to_ids:
+                                    self.import_sighting(
+                                        item, observed_data_ref, to_id, update
+                                    )
+                    # endregion
+                elif item["type"] == "label":
+                    stix_ids = extensions.get("stix_ids")
+                    self.opencti.label.create(
+                        stix_id=item["id"],
+                        value=item["value"],
+                        color=item["color"],
+                        x_opencti_stix_ids=stix_ids,
+                        update=update,
+                    )
+                elif item["type"] == "vocabulary":
+                    stix_ids = extensions.get("stix_ids")
+                    self.opencti.vocabulary.create(
+                        stix_id=item["id"],
+                        name=item["name"],
+                        category=item["category"],
+                        description=(
+                            item["description"] if "description" in item else None
+                        ),
+                        aliases=item["aliases"] if "aliases" in item else None,
+                        x_opencti_stix_ids=stix_ids,
+                        update=update,
+                    )
+                elif item["type"] == "external-reference":
+                    stix_ids = extensions.get("stix_ids")
+                    self.opencti.external_reference.create(
+                        stix_id=item["id"],
+                        source_name=(
+                            item["source_name"] if "source_name" in item else None
+                        ),
+                        url=item["url"] if "url" in item else None,
+                        external_id=(
+                            item["external_id"] if "external_id" in item else None
+                        ),
+                        description=(
+                            item["description"] if "description" in item else None
+                        ),
+                        x_opencti_stix_ids=stix_ids,
+                        update=update,
+                    )
+                elif item["type"] == "kill-chain-phase":
+                    stix_ids = extensions.get("stix_ids")
+                    self.opencti.kill_chain_phase.create(
+                        stix_id=item["id"],
+                        kill_chain_name=item["kill_chain_name"],
+                        phase_name=item["phase_name"],
+                        x_opencti_order=item["order"] if "order" in item else 0,
+                        x_opencti_stix_ids=stix_ids,
+                        update=update,
+                    )
+                elif StixCyberObservableTypes.has_value(item["type"]):
+                    if types is None or len(types) == 0:
+                        self.import_observable(item, update, types)
+                    elif item["type"] in types or "observable" in types:
+                        self.import_observable(item, update, types)
                 else:
-                    # Specific OpenCTI scopes
-                    if item["type"] == "identity":
-                        if "identity_class" in item:
-                            if ("class" in types or "sector" in types) and item[
-                                "identity_class"
-                            ] == "class":
-                                self.import_object(item, update, types)
-                            elif item["identity_class"] in types:
-                                self.import_object(item, update, types)
-                    elif item["type"] == "location":
-                        if "x_opencti_location_type" in item:
-                            if item["x_opencti_location_type"].lower() in types:
-                                self.import_object(item, update, types)
-                        elif (
-                            self.opencti.get_attribute_in_extension(
-                                "location_type", item
-                            )
-                            is not None
-                        ):
-                            if (
-                                self.opencti.get_attribute_in_extension(
-                                    "location_type", item
-                                ).lower()
-                                in types
-                            ):
-                                self.import_object(item, update, types)
+                    # Check the scope
+                    if (
+                        item["type"] == "marking-definition"
+                        or types is None
+                        or len(types) == 0
+                    ):
+                        self.import_object(item, update, types)
+                    # Handle identity & location if part of the scope
+                    elif item["type"] in types:
+                        self.import_object(item, update, types)
+                    else:
+                        # Specific OpenCTI scopes
+                        if item["type"] == "identity":
+                            if "identity_class" in item:
+                                if ("class" in types or "sector" in types) and item[
+                                    "identity_class"
+                                ] == "class":
+                                    self.import_object(item, update, types)
+                                elif item["identity_class"] in types:
+                                    self.import_object(item, update, types)
+                        elif item["type"] == "location":
+                            if "x_opencti_location_type" in item:
+                                if item["x_opencti_location_type"].lower() in types:
+                                    self.import_object(item, update, types)
+                            elif extensions.get("location_type") is not None:
+                                if extensions.get("location_type").lower() in types:
+                                    self.import_object(item, update, types)
+            # Upload errors are handled as the item errors
+            self.wait_file_uploads()
             if work_id is not None:
                 self.opencti.work.report_expectation(work_id, None)
             bundles_success_counter.add(1)
-            return True
-        except (RequestException, Timeout):
-            bundles_timeout_error_counter.add(1)
-            worker_logger.warning("A connection error or timeout occurred")
-            # Platform is under heavy load: wait for unlock & retry almost indefinitely.
-            sleep_jitter = round(random.uniform(10, 30), 2)
-            time.sleep(sleep_jitter)
-            return self.import_item(item, update, types, processing_count + 1, work_id)
+            return True, None, None, []
         except Exception as ex:  # pylint: disable=broad-except
-            error = str(ex)
-            error_msg = traceback.format_exc()
-            in_retry = processing_count < PROCESSING_COUNT
-            # Platform is under heavy load, wait for unlock & retry indefinitely.
-            if ERROR_TYPE_LOCK in error_msg:
-                bundles_lock_error_counter.add(1)
-                sleep_jitter = round(random.uniform(1, 3), 2)
-                time.sleep(sleep_jitter)
-                return self.import_item(
-                    item, update, types, processing_count + 1, work_id
-                )
-            # Platform detects a missing reference and have to retry
-            elif ERROR_TYPE_MISSING_REFERENCE in error_msg and in_retry:
-                bundles_missing_reference_error_counter.add(1)
-                sleep_jitter = round(random.uniform(1, 3), 2)
-                time.sleep(sleep_jitter)
-                return self.import_item(
-                    item, update, types, processing_count + 1, work_id
-                )
-            # A bad gateway error occurs
-            elif ERROR_TYPE_BAD_GATEWAY in error_msg:
-                worker_logger.error(
-                    "Message reprocess for bad gateway",
-                    {"count": processing_count},
-                )
-                bundles_bad_gateway_error_counter.add(1)
-                time.sleep(60)
-                return self.import_item(
-                    item, update, types, processing_count + 1, work_id
-                )
-            # Request timeout error occurs
-            elif ERROR_TYPE_TIMEOUT in error_msg:
-                worker_logger.error(
-                    "Message reprocess for request timed out",
-                    {"count": processing_count},
-                )
-                bundles_timed_out_error_counter.add(1)
-                time.sleep(60)
-                return self.import_item(
-                    item, update, types, processing_count + 1, work_id
-                )
+            # Do not retry the item while its previous uploads are running
+            self.file_uploader.wait(raise_errors=False)
+            error_type = classify_error(ex)
+            # The item will be retried once the missing references are created
+            if defer_missing_references and error_type == ERROR_TYPE_MISSING_REFERENCE:
+                missing_refs = self.missing_reference_ids(ex, item)
+                if len(missing_refs) > 0:
+                    bundles_missing_reference_error_counter.add(1)
+                    bundles_retry_counter.add(1, {"error_type": error_type})
+                    return False, None, error_type, missing_refs
+            delay = retry_delay(error_type, processing_count)
+            if delay is not None:
+                # Platform is under heavy load or a reference is not created yet:
+                # the item has to be retried after a delay
+                if error_type == ERROR_TYPE_CONNECTION:
+                    bundles_timeout_error_counter.add(1)
+                    worker_logger.warning("A connection error or timeout occurred")
+                elif error_type == ERROR_TYPE_LOCK:
+                    bundles_lock_error_counter.add(1)
+                elif error_type == ERROR_TYPE_MISSING_REFERENCE:
+                    bundles_missing_reference_error_counter.add(1)
+                elif error_type == ERROR_TYPE_BAD_GATEWAY:
+                    worker_logger.error(
+                        "Message reprocess for bad gateway",
+                        {"count": processing_count},
+                    )
+                    bundles_bad_gateway_error_counter.add(1)
+                elif error_type == ERROR_TYPE_TIMEOUT:
+                    worker_logger.error(
+                        "Message reprocess for request timed out",
+                        {"count": processing_count},
+                    )
+                    bundles_timed_out_error_counter.add(1)
+                bundles_retry_counter.add(1, {"error_type": error_type})
+                return False, delay, error_type, []
+            bundles_technical_error_counter.add(1)
             # A draft lock error occurs
-            elif ERROR_TYPE_DRAFT_LOCK in error_msg:
-                bundles_technical_error_counter.add(1)
+            if error_type == ERROR_TYPE_DRAFT_LOCK:
                 if work_id is not None:
                     self.opencti.work.api.set_draft_id("")
                     self.opencti.work.report_expectation(
                         work_id,
                         {
-                            "error": error,
+                            "error": str(ex),
                             "source": "Draft in read only",
                         },
                     )
-                return False
             # Platform does not know what to do and raises an error:
             # That also works for missing reference with too much execution
-            else:
-                bundles_technical_error_counter.add(1)
-                if work_id is not None:
-                    item_str = json.dumps(item)
-                    self.opencti.work.report_expectation(
+            elif work_id is not None:
+                item_str = json.dumps(item)
+                self.opencti.work.report_expectation(
+                    work_id,
+                    {
+                        "error": str(ex),
+                        "source": (
+                            item_str if len(item_str) < 50000 else "Bundle too large"
+                        ),
+                    },
+                )
+            return False, None, error_type, []
+
+    def missing_reference_ids(self, ex: BaseException, item: Dict) -> List[str]:
+        """Find the references an item is waiting for after a missing
+        reference error.
+
+        The ids sent back by the platform are used when available, otherwise
+        the references of the item not created yet (not in the mapping cache).
+
+        :param ex: missing reference error
+        :type ex: BaseException
+        :param item: STIX object that failed
+        :type item: Dict
+        :return: ids of the missing references
+        :rtype: List[str]
+        """
+        while ex is not None:
+            if len(ex.args) > 0 and isinstance(ex.args[0], dict):
+                unresolved_ids = ex.args[0].get("unresolvedIds")
+                if unresolved_ids:
+                    return [
+                        ref_id
+                        for ref_id in unresolved_ids
+                        if ref_id not in self.mapping_cache
+                    ]
+            ex = ex.__cause__ or ex.__context__
+        ref_ids = []
+        for key, value in item.items():
+            if key.endswith("_ref") and isinstance(value, str):
+                ref_ids.append(value)
+            elif key.endswith("_refs") and isinstance(value, list):
+                ref_ids.extend(ref for ref in value if isinstance(ref, str))
+        return [ref_id for ref_id in ref_ids if ref_id not in self.mapping_cache]
+
+    def import_item_or_schedule(
+        self,
+        scheduler: OpenCTIStix2RetryScheduler,
+        item,
+        update: bool = False,
+        types: List = None,
+        processing_count: int = 0,
+        work_id: str = None,
+        first_attempt_at: float = None,
+        defer_missing_references: bool = True,
+    ) -> bool:
+        """Make an import attempt, parking the item in the scheduler if it
+        has to be retried. Once imported, the items deferred until its
+        creation are retried.
+
+        :return: True if the item has been imported
+        :rtype: bool
+        """
+        success = self._import_item_or_park(
+            scheduler,
+            item,
+            update,
+            types,
+            processing_count,
+            work_id,
+            first_attempt_at,
+            defer_missing_references,
+        )
+        if success:
+            # Retry the deferred items waiting for the created elements
+            created_ids = [item["id"]]
+            while len(created_ids) > 0:
+                created_id = created_ids.pop()
+                if created_id not in self.mapping_cache:
+                    continue
+                for entry in scheduler.resolve(created_id):
+                    if self._import_item_or_park(
+                        scheduler,
+                        entry.item,
+                        update,
+                        types,
+                        entry.processing_count,
                         work_id,
-                        {
-                            "error": error,
-                            "source": (
-                                item_str
-                                if len(item_str) < 50000
-                                else "Bundle too large"
-                            ),
-                        },
-                    )
-                return False
+                        entry.first_attempt_at,
+                        True,
+                    ):
+                        created_ids.append(entry.item["id"])
+        return success
+
+    def _import_item_or_park(
+        self,
+        scheduler: OpenCTIStix2RetryScheduler,
+        item,
+        update: bool,
+        types: List,
+        processing_count: int,
+        work_id: str,
+        first_attempt_at: Optional[float],
+        defer_missing_references: bool,
+    ) -> bool:
+        if first_attempt_at is None:
+            first_attempt_at = scheduler.clock()
+        start = time.perf_counter()
+        success, delay, error_type, missing_refs = self.attempt_import_item(
+            item, update, types, processing_count, work_id, defer_missing_references
+        )
+        retried = len(missing_refs) > 0 or delay is not None
+        if len(missing_refs) > 0:
+            error_type = ERROR_TYPE_MISSING_REFERENCE
+            scheduler.defer(item, processing_count + 1, missing_refs, first_attempt_at)
+        elif delay is not None:
+            scheduler.schedule(
+                item, processing_count + 1, error_type, delay, first_attempt_at
+            )
+        else:
+            self.record_retry_latency(
+                processing_count, scheduler.clock() - first_attempt_at, success
+            )
+        stats = self.import_stats
+        if stats is not None:
+            stats.record_attempt(
+                item,
+                time.perf_counter() - start,
+                success,
+                processing_count,
+                retried,
+                error_type,
+            )
+        return success
+
+    def import_scheduled_items(
+        self,
+        scheduler: OpenCTIStix2RetryScheduler,
+        update: bool = False,
+        types: List = None,
+        work_id: str = None,
+        wait: bool = False,
+    ):
+        """Retry the items of the scheduler whose delay has expired.
 
+        :param wait: wait for the next item to be ready if none is
+        :type wait: bool
+        """
+        scheduler.wait_if_paused()
+        entries = scheduler.wait_next() if wait else scheduler.pop_ready()
+        for entry in entries:
+            # Items retried on a missing reference could not be deferred
+            self.import_item_or_schedule(
+                scheduler,
+                entry.item,
+                update,
+                types,
+                entry.processing_count,
+                work_id,
+                entry.first_attempt_at,
+                entry.error_type != ERROR_TYPE_MISSING_REFERENCE,
+            )
+
+    @opencti_tracing.traced("opencti.stix2.import_bundle")
+    @opencti_memory_profiler.profiled("import")
     def import_bundle(
         self,
         stix_bundle: Dict,
@@ -3067,61 +3326,126 @@ class OpenCTIStix2:
         types: List = None,
         work_id: str = None,
         objects_max_refs: int = 0,
+        stats: OpenCTIStix2ImportStats = None,
     ) -> Tuple[list, list]:
+        """import a stix2 bundle
+
+        :param stix_bundle: STIX bundle
+        :type stix_bundle: Dict
+        :param update: whether to updated data in the database, defaults to False
+        :type update: bool, optional
+        :param types: list of stix2 types, defaults to None
+        :type types: list, optional
+        :param work_id: work id to report the expectations to
+        :type work_id: str, optional
+        :param objects_max_refs: max deps amount of objects, reject object import if larger than configured amount
+        :type objects_max_refs: int, optional
+        :param stats: collect the throughput statistics of the import in this object
+        :type stats: OpenCTIStix2ImportStats, optional
+        :return: list of imported stix2 objects and a list of stix2 objects with too many deps
+        :rtype: Tuple[List,List]
+        """
         # Check if the bundle is correctly formatted
         if "type" not in stix_bundle or stix_bundle["type"] != "bundle":
             raise ValueError("JSON data type is not a STIX2 bundle")
         if "objects" not in stix_bundle or len(stix_bundle["objects"]) == 0:
             raise ValueError("JSON data objects is empty")
-        event_version = (
-            stix_bundle["x_opencti_event_version"]
-            if "x_opencti_event_version" in stix_bundle
-            else None
-        )
-
-        stix2_splitter = OpenCTIStix2Splitter()
-        _, incompatible_elements, bundles = (
-            stix2_splitter.split_bundle_with_expectations(
-                stix_bundle, False, event_version
+        if stats is not None:
+            stats.start(
+                len(stix_bundle["objects"]),
+                {
+                    "mapping_cache": self.mapping_cache,
+                    "mapping_cache_permanent": self.mapping_cache_permanent,
+                },
+            )
+        self._import_stats.current = stats
+        try:
+            event_version = (
+                stix_bundle["x_opencti_event_version"]
+                if "x_opencti_event_version" in stix_bundle
+                else None
             )
-        )
 
-        # Report every element ignored during bundle splitting
-        if work_id is not None:
-            for incompatible_element in incompatible_elements:
-                self.opencti.work.report_expectation(
-                    work_id,
-                    {
-                        "error": "Incompatible element in bundle",
-                        "source": "Element "
-                        + incompatible_element["id"]
-                        + " is incompatible and couldn't be processed",
-                    },
+            split_start = time.perf_counter()
+            with opencti_memory_profiler.phase("split"):
+                stix2_splitter = OpenCTIStix2Splitter()
+                _, incompatible_elements, bundles = (
+                    stix2_splitter.split_bundle_with_expectations(
+                        stix_bundle, False, event_version
+                    )
                 )
+            if stats is not None:
+                stats.add_phase(PHASE_SPLIT, time.perf_counter() - split_start)
 
-        # Import every element in a specific order
-        imported_elements = []
-        too_large_elements_bundles = []
-        for bundle in bundles:
-            for item in bundle["objects"]:
-                # If item is considered too large, meaning that it has a number of refs higher than inputted objects_max_refs, do not import it
-                nb_refs = OpenCTIStix2Utils.compute_object_refs_number(item)
-                if 0 < objects_max_refs <= nb_refs:
+            # Report every element ignored during bundle splitting
+            if work_id is not None:
+                for incompatible_element in incompatible_elements:
                     self.opencti.work.report_expectation(
                         work_id,
                         {
-                            "error": "Too large element in bundle",
+                            "error": "Incompatible element in bundle",
                             "source": "Element "
-                            + item["id"]
-                            + " is too large and couldn't be processed",
+                            + incompatible_element["id"]
+                            + " is incompatible and couldn't be processed",
                         },
                     )
-                    too_large_elements_bundles.append(item)
+
+            # Import every element in a specific order, items to retry are parked
+            # in the scheduler while the next ones are imported
+            scheduler = OpenCTIStix2RetryScheduler()
+            imported_elements = []
+            too_large_elements_bundles = []
+            for bundle in bundles:
+                for item in bundle["objects"]:
+                    self.import_scheduled_items(scheduler, update, types, work_id)
+                    # If item is considered too large, meaning that it has a number of refs higher than inputted objects_max_refs, do not import it
+                    nb_refs = OpenCTIStix2Utils.compute_object_refs_number(item)
+                    if 0 < objects_max_refs <= nb_refs:
+                        self.opencti.work.report_expectation(
+                            work_id,
+                            {
+                                "error": "Too large element in bundle",
+                                "source": "Element "
+                                + item["id"]
+                                + " is too large and couldn't be processed",
+                            },
+                        )
+                        too_large_elements_bundles.append(item)
+                        if stats is not None:
+                            stats.too_large += 1
+                    else:
+                        self.import_item_or_schedule(
+                            scheduler, item, update, types, 0, work_id
+                        )
+                        imported_elements.append(
+                            {"id": item["id"], "type": item["type"]}
+                        )
+            # Drain the items still waiting for a retry. Once nothing else can
+            # create the references deferred items wait for, they are retried the
+            # usual way and fail after a few attempts.
+            while len(scheduler) > 0 or scheduler.deferred_count > 0:
+                if len(scheduler) > 0:
+                    self.import_scheduled_items(
+                        scheduler, update, types, work_id, wait=True
+                    )
                 else:
-                    self.import_item(item, update, types, 0, work_id)
-                    imported_elements.append({"id": item["id"], "type": item["type"]})
+                    entry = scheduler.pop_deferred()
+                    self.import_item_or_schedule(
+                        scheduler,
+                        entry.item,
+                        update,
+                        types,
+                        entry.processing_count,
+                        work_id,
+                        entry.first_attempt_at,
+                        defer_missing_references=False,
+                    )
 
-        return imported_elements, too_large_elements_bundles
+            return imported_elements, too_large_elements_bundles
+        finally:
+            self._import_stats.current = None
+            if stats is not None:
+                stats.stop()
 
     @staticmethod
     def put_attribute_in_extension(
@@ -0,0 +1,172 @@
+# coding: utf-8
+
+import datetime
+import hashlib
+import re
+import threading
+from typing import Optional
+
+from cachetools import LRUCache
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+_MONTHS = {
+    "jan": 1,
+    "feb": 2,
+    "mar": 3,
+    "apr": 4,
+    "may": 5,
+    "jun": 6,
+    "jul": 7,
+    "aug": 8,
+    "sep": 9,
+    "oct": 10,
+    "nov": 11,
+    "dec": 12,
+}
+_MONTH = (
+    r"(?P<month>jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?"
+    r"|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+)
+_TIME = r"(?:[T ](?P<hour>\d{2}):(?P<minute>\d{2})(?::(?P<second>\d{2}))?)?"
+
+# Formats found in references descriptions, the earliest match in the text
+# wins and the first pattern wins on ties
+DATE_PATTERNS = [
+    # ISO 8601 and the MITRE "2016--12---26" variant
+    re.compile(
+        r"(?<!\d)(?P<year>\d{4})-{1,2}(?P<month_number>\d{1,2})-{1,3}(?P<day>\d{1,2})(?!\d)"
+        + _TIME
+    ),
+    # RFC 2822 and "21 December 2015"
+    re.compile(
+        r"\b(?P<day>\d{1,2})(?:st|nd|rd|th)?\s+"
+        + _MONTH
+        + r",?\s+(?P<year>\d{4})(?!\d)"
+        + r"(?:\s+(?P<hour>\d{2}):(?P<minute>\d{2})(?::(?P<second>\d{2}))?)?",
+        re.IGNORECASE,
+    ),
+    # "December 21, 2015"
+    re.compile(
+        r"\b"
+        + _MONTH
+        + r"\s+(?P<day>\d{1,2})(?:st|nd|rd|th)?,?\s+(?P<year>\d{4})(?!\d)",
+        re.IGNORECASE,
+    ),
+    # "12/21/2015"
+    re.compile(
+        r"(?<![\d/])(?P<month_number>\d{1,2})/(?P<day>\d{1,2})/(?P<year>\d{4})(?!\d)"
+    ),
+    # "2015, February" and "2015, February 3"
+    re.compile(
+        r"(?<!\d)(?P<year>\d{4}),\s+" + _MONTH + r"(?:\s+(?P<day>\d{1,2})(?!\d))?",
+        re.IGNORECASE,
+    ),
+    # "December 2015"
+    re.compile(r"\b" + _MONTH + r",?\s+(?P<year>\d{4})(?!\d)", re.IGNORECASE),
+    # "2021-04" and "2021--04"
+    re.compile(r"(?<!\d)(?P<year>\d{4})-{1,2}(?P<month_number>\d{1,2})(?![\d-])"),
+    # A single year
+    re.compile(r"(?<![\d.])(?P<year>(?:19|20)\d{2})(?![\d.])"),
+]
+
+_DIGIT = re.compile(r"\d")
+
+_cache = LRUCache(maxsize=10000)
+_cache_lock = threading.Lock()
+
+
+def _build_date(match) -> Optional[datetime.datetime]:
+    groups = match.groupdict()
+    if groups.get("month_number") is not None:
+        month = int(groups["month_number"])
+    elif groups.get("month") is not None:
+        month = _MONTHS[groups["month"][:3].lower()]
+    else:
+        month = 1
+    try:
+        return datetime.datetime(
+            int(groups["year"]),
+            month,
+            int(groups.get("day") or 1),
+            int(groups.get("hour") or 0),
+            int(groups.get("minute") or 0),
+            int(groups.get("second") or 0),
+        )
+    except ValueError:
+        return None
+
+
+def _is_valid(date, max_timestamp: float) -> bool:
+    # Dates in the future are most likely a wrong guess
+    return date.timestamp() < max_timestamp and len(str(date.year)) == 4
+
+
+def _fast_extract_date(text: str, max_timestamp: float) -> Optional[str]:
+    best_start = None
+    best_date = None
+    for pattern in DATE_PATTERNS:
+        for match in pattern.finditer(text):
+            if best_start is not None and match.start() >= best_start:
+                break
+            date = _build_date(match)
+            if date is not None and _is_valid(date, max_timestamp):
+                best_start = match.start()
+                best_date = date
+                break
+    return None if best_date is None else best_date.strftime(DATE_FORMAT)
+
+
+def _datefinder():
+    # datefinder takes a while to import and is rarely needed
+    import datefinder
+
+    datefinder.ValueError = ValueError, OverflowError
+    return datefinder
+
+
+def _datefinder_extract_date(text: str, max_timestamp: float) -> Optional[str]:
+    datefinder = _datefinder()
+    try:
+        for match in datefinder.find_dates(
+            text, base_date=datetime.datetime.fromtimestamp(0)
+        ):
+            if _is_valid(match, max_timestamp):
+                return match.strftime(DATE_FORMAT)
+    except Exception:  # pylint: disable=broad-except
+        return None
+    return None
+
+
+def extract_date(text: Optional[str]) -> Optional[str]:
+    """Find the first past date in a text, such as an external reference
+    description.
+
+    Common formats are matched with precompiled patterns, ``datefinder`` is
+    only used for texts containing digits but none of these formats. Results
+    are memoized by text digest.
+
+    :param text: text to search
+    :type text: str
+    :return: date formatted as ``%Y-%m-%dT%H:%M:%SZ`` or None
+    :rtype: str or None
+    """
+    if not isinstance(text, str):
+        return None
+    key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    with _cache_lock:
+        if key in _cache:
+            return _cache[key]
+    max_timestamp = (datetime.datetime.now() - datetime.timedelta(days=1)).timestamp()
+    date = _fast_extract_date(text, max_timestamp)
+    if date is None and _DIGIT.search(text) is not None:
+        date = _datefinder_extract_date(text, max_timestamp)
+    with _cache_lock:
+        _cache[key] = date
+    return date
+
+
+def clear_cache():
+    """Empty the memoized extracted dates."""
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,80 @@
+import json
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from cachetools import LRUCache
+
+
+class OpenCTIStix2ExportSession:
+    """Export session memoizing converted STIX objects
+
+    Identities, markings and related objects are converted once per session
+    and reused by every export call made while the session is active
+    (``get_stix_bundle_or_object_from_entity_id``, ``export_list``,
+    ``export_selected``).
+
+    :param stix2: instance of :py:class:`~pycti.utils.opencti_stix2.OpenCTIStix2`
+    :param maxsize: maximum number of converted entries kept in memory
+    :type maxsize: int, optional
+    """
+
+    def __init__(self, stix2, maxsize: int = 10000):
+        self.stix2 = stix2
+        self.cache = LRUCache(maxsize=maxsize)
+        self.hits = 0
+        self.misses = 0
+        self._previous_session = None
+
+    def __enter__(self):
+        self._previous_session = self.stix2.current_export_session
+        self.stix2.current_export_session = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stix2.current_export_session = self._previous_session
+        self._previous_session = None
+        return False
+
+    @staticmethod
+    def access_key(access_filter: Optional[Dict]) -> Optional[str]:
+        """Build a hashable key for an access filter.
+
+        :param access_filter: access filter used for the export
+        :type access_filter: dict or None
+        :return: canonical JSON representation of the filter
+        :rtype: str or None
+        """
+        if access_filter is None:
+            return None
+        return json.dumps(access_filter, sort_keys=True)
+
+    def get_or_convert(self, key: Hashable, convert: Callable[[], Any]) -> Any:
+        """Return the memoized value of `key`, computing it with `convert` on miss.
+
+        Dict values (and lists of dicts) are shallow copied on the way out so
+        callers can safely rework top level keys of their own copy.
+
+        :param key: cache key (usually the internal id of the entity)
+        :param convert: function producing the converted value
+        :return: converted value
+        """
+        if key in self.cache:
+            self.hits += 1
+            return self._copy(self.cache[key])
+        self.misses += 1
+        value = convert()
+        self.cache[key] = value
+        return self._copy(value)
+
+    def clear(self) -> None:
+        """Drop every memoized object."""
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _copy(value):
+        if isinstance(value, dict):
+            return dict(value)
+        if isinstance(value, list):
+            return [dict(v) if isinstance(v, dict) else v for v in value]
+        return value
@@ -0,0 +1,75 @@
+# coding: utf-8
+
+from typing import Any, Dict
+
+# Extensions
+STIX_EXT_OCTI = "extension-definition--ea279b3e-5c71-4632-ac08-831c66a786ba"
+STIX_EXT_OCTI_SCO = "extension-definition--f93e2c80-4231-4f9a-af8b-95c9bd566a82"
+STIX_EXT_MITRE = "extension-definition--322b8f77-262a-4cb8-a915-1e441e00329b"
+
+_EMPTY: Dict = {}
+
+
+class StixExtensionView:
+    """OpenCTI and MITRE extensions of a STIX object flattened in one pass
+
+    :py:meth:`get` and :py:meth:`get_mitre` give the same results as
+    ``OpenCTIApiClient.get_attribute_in_extension`` and
+    ``OpenCTIApiClient.get_attribute_in_mitre_extension`` without walking the
+    extensions on every call. Extensions are read when the view is built,
+    other attributes are always read from the object.
+
+    :param stix_object: STIX object
+    :type stix_object: dict
+    """
+
+    __slots__ = ("stix_object", "opencti", "mitre")
+
+    def __init__(self, stix_object: Dict):
+        self.stix_object = stix_object
+        extensions = stix_object.get("extensions") or _EMPTY
+        opencti = dict(extensions.get(STIX_EXT_OCTI_SCO) or _EMPTY)
+        # The OpenCTI extension wins over the OpenCTI observable one
+        opencti.update(extensions.get(STIX_EXT_OCTI) or _EMPTY)
+        self.opencti = opencti
+        self.mitre = extensions.get(STIX_EXT_MITRE) or _EMPTY
+
+    def get(self, key: str) -> Any:
+        """Get an attribute from the OpenCTI extensions, or from the object.
+
+        :param key: attribute name
+        :type key: str
+        :return: attribute value or None
+        """
+        if key in self.opencti:
+            return self.opencti[key]
+        if key != "type":
+            return self.stix_object.get(key)
+        return None
+
+    def get_mitre(self, key: str) -> Any:
+        """Get an attribute from the MITRE extension.
+
+        :param key: attribute name
+        :type key: str
+        :return: attribute value or None
+        """
+        return self.mitre.get(key)
+
+
+def extension_view(stix_object: Dict, extras: Dict = None) -> StixExtensionView:
+    """Get the extension view of a STIX object, reusing the one given in the
+    import ``extras`` if it was built for the same object.
+
+    :param stix_object: STIX object
+    :type stix_object: dict
+    :param extras: import extras, may hold the view under ``extensions``
+    :type extras: dict
+    :return: the extension view
+    :rtype: StixExtensionView
+    """
+    if extras is not None:
+        view = extras.get("extensions")
+        if view is not None and view.stix_object is stix_object:
+            return view
+    return StixExtensionView(stix_object)
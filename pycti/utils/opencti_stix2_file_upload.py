@@ -0,0 +1,147 @@
+# coding: utf-8
+
+import base64
+import binascii
+import contextlib
+import re
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+# Files bigger than this are spooled to disk while decoded
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+# Number of base64 characters decoded at once, a multiple of 4
+DECODE_CHUNK_SIZE = 4 * 256 * 1024
+
+_WHITESPACE = re.compile(r"\s")
+
+
+def decode_file_data(
+    data: str, spool_max_size: int = SPOOL_MAX_SIZE
+) -> tempfile.SpooledTemporaryFile:
+    """Decode base64 file content into a spooled temporary file.
+
+    The content is decoded by chunks so the decoded file is never held twice
+    in memory, and is written to disk once bigger than ``spool_max_size``.
+
+    :param data: base64 encoded content
+    :type data: str
+    :param spool_max_size: size in bytes above which the file goes to disk
+    :type spool_max_size: int
+    :return: the decoded file, positioned at its start
+    :rtype: tempfile.SpooledTemporaryFile
+    """
+    spooled = tempfile.SpooledTemporaryFile(max_size=spool_max_size)
+    try:
+        if _WHITESPACE.search(data) is not None:
+            # Line wrapped content, chunks would not be aligned on 4 characters
+            spooled.write(base64.b64decode(data))
+        else:
+            for start in range(0, len(data), DECODE_CHUNK_SIZE):
+                spooled.write(
+                    binascii.a2b_base64(data[start : start + DECODE_CHUNK_SIZE])
+                )
+        spooled.seek(0)
+    except Exception:
+        spooled.close()
+        raise
+    return spooled
+
+
+class OpenCTIStix2FileUploader:
+    """Bounded pool uploading the files attached to imported elements
+
+    Uploads submitted in a :py:meth:`deferring` block run in the pool while
+    the element import goes on and are awaited with :py:meth:`wait` once the
+    element is processed, other uploads are done synchronously. Pending
+    uploads are tracked by thread, so several threads can share the same
+    uploader.
+
+    :param max_workers: maximum number of concurrent uploads, 0 to upload
+        synchronously
+    :type max_workers: int
+    :param spool_max_size: size in bytes above which decoded files go to disk
+    :type spool_max_size: int
+    """
+
+    def __init__(self, max_workers: int = 4, spool_max_size: int = SPOOL_MAX_SIZE):
+        self.max_workers = max_workers
+        self.spool_max_size = spool_max_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def pending(self) -> List[Future]:
+        if not hasattr(self._local, "pending"):
+            self._local.pending = []
+        return self._local.pending
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="file-upload"
+                )
+            return self._executor
+
+    def _upload(self, add_file: Callable, data: str, **kwargs):
+        spooled = decode_file_data(data, self.spool_max_size)
+        try:
+            return add_file(data=spooled, **kwargs)
+        finally:
+            spooled.close()
+
+    @contextlib.contextmanager
+    def deferring(self):
+        """Run the uploads submitted by the current thread in the block in
+        the pool, to be awaited with :py:meth:`wait`.
+        """
+        previous = getattr(self._local, "deferring", False)
+        self._local.deferring = True
+        try:
+            yield
+        finally:
+            self._local.deferring = previous
+
+    def submit(self, add_file: Callable, data: str, **kwargs):
+        """Upload a base64 encoded file with an ``add_file`` entity method.
+
+        :param add_file: ``add_file`` method of the entity
+        :type add_file: callable
+        :param data: base64 encoded content
+        :type data: str
+        :param kwargs: other ``add_file`` arguments (id, file_name...)
+        """
+        if self.max_workers <= 0 or not getattr(self._local, "deferring", False):
+            self._upload(add_file, data, **kwargs)
+            return
+        self.pending.append(
+            self._get_executor().submit(self._upload, add_file, data, **kwargs)
+        )
+
+    def wait(self, raise_errors: bool = True):
+        """Wait for the uploads submitted by the current thread.
+
+        :param raise_errors: raise the first upload error, if any
+        :type raise_errors: bool
+        """
+        pending = self.pending
+        if not pending:
+            return
+        self._local.pending = []
+        error = None
+        for future in pending:
+            exception = future.exception()
+            if exception is not None and error is None:
+                error = exception
+        if error is not None and raise_errors:
+            raise error
+
+    def shutdown(self):
+        """Stop the upload workers once the pending uploads are done."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
@@ -1,7 +1,109 @@
+import functools
+import hashlib
+import json
 import uuid
+from typing import Any, Dict, Iterable, List
 
 from stix2.canonicalization.Canonicalize import canonicalize
 
+OPENCTI_NAMESPACE = uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7")
+
+_NAMESPACE_HASH = hashlib.sha1(OPENCTI_NAMESPACE.bytes)
+_ENCODER = json.JSONEncoder(
+    ensure_ascii=False, sort_keys=True, separators=(",", ":"), check_circular=False
+)
+# Integers and floats JSON encoded the same way as RFC 8785 numbers
+_MAX_SAFE_INTEGER = 2**53
+_MIN_FIXED_FLOAT = 1e-4
+_MAX_FIXED_FLOAT = 1e16
+
+
+def _is_simple_value(value: Any) -> bool:
+    if value is None or isinstance(value, (str, bool)):
+        return True
+    if isinstance(value, int):
+        return -_MAX_SAFE_INTEGER < value < _MAX_SAFE_INTEGER
+    if isinstance(value, float):
+        return (
+            _MIN_FIXED_FLOAT <= abs(value) < _MAX_FIXED_FLOAT and not value.is_integer()
+        )
+    if isinstance(value, list):
+        return all(isinstance(element, str) for element in value)
+    return False
+
+
+def canonicalize_data(data: Dict) -> str:
+    """Canonicalize (RFC 8785) the data used to generate a standard id.
+
+    Flat dicts of strings, booleans, safe numbers and lists of strings (all
+    the standard ids contributing properties) are encoded with the standard
+    json encoder, anything else goes through the stix2 canonicalization.
+
+    :param data: id contributing properties
+    :type data: dict
+    :return: canonical JSON
+    :rtype: str
+    """
+    if type(data) is dict and all(
+        isinstance(key, str) and key.isascii() and _is_simple_value(value)
+        for key, value in data.items()
+    ):
+        return _ENCODER.encode(data)
+    return canonicalize(data, utf8=False)
+
+
+@functools.lru_cache(maxsize=100000)
+def _uuid5(name: str) -> str:
+    # Same as str(uuid.uuid5(OPENCTI_NAMESPACE, name)) without the UUID object
+    digest = _NAMESPACE_HASH.copy()
+    digest.update(name.encode("utf-8"))
+    value = bytearray(digest.digest()[:16])
+    value[6] = (value[6] & 0x0F) | 0x50
+    value[8] = (value[8] & 0x3F) | 0x80
+    hex_value = value.hex()
+    return "-".join(
+        (
+            hex_value[:8],
+            hex_value[8:12],
+            hex_value[12:16],
+            hex_value[16:20],
+            hex_value[20:],
+        )
+    )
+
+
+def generate_standard_id(entity_type: str, data: Dict) -> str:
+    """Generate the standard id of an element from its id contributing
+    properties. Ids are memoized by canonical data.
+
+    :param entity_type: STIX type used as id prefix
+    :type entity_type: str
+    :param data: id contributing properties
+    :type data: dict
+    :return: standard id
+    :rtype: str
+    """
+    return entity_type + "--" + _uuid5(canonicalize_data(data))
+
+
+def generate_standard_ids(entity_type: str, records: Iterable[Dict]) -> List[str]:
+    """Generate the standard ids of several elements of the same type.
+
+    :param entity_type: STIX type used as id prefix
+    :type entity_type: str
+    :param records: id contributing properties of each element
+    :type records: list
+    :return: standard ids, in the records order
+    :rtype: list
+    """
+    prefix = entity_type + "--"
+    return [prefix + _uuid5(canonicalize_data(data)) for data in records]
+
+
+def clear_standard_id_cache():
+    """Empty the memoized standard ids."""
+    _uuid5.cache_clear()
+
 
 def external_reference_generate_id(url=None, source_name=None, external_id=None):
     if url is not None:
@@ -10,13 +112,9 @@ def external_reference_generate_id(url=None, source_name=None, external_id=None)
         data = {"source_name": source_name, "external_id": external_id}
     else:
         return None
-    data = canonicalize(data, utf8=False)
-    id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-    return "external-reference--" + id
+    return generate_standard_id("external-reference", data)
 
 
 def kill_chain_phase_generate_id(phase_name, kill_chain_name):
     data = {"phase_name": phase_name, "kill_chain_name": kill_chain_name}
-    data = canonicalize(data, utf8=False)
-    id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
-    return "kill-chain-phase--" + id
+    return generate_standard_id("kill-chain-phase", data)
@@ -0,0 +1,207 @@
+# coding: utf-8
+
+import contextlib
+import functools
+import heapq
+import itertools
+import time
+from typing import Callable, Dict, List, Optional
+
+# Phases timed during an import, "mutation" is derived from the others
+PHASE_SPLIT = "split"
+PHASE_EMBEDDED_RESOLUTION = "embedded_resolution"
+PHASE_FILE_UPLOAD = "file_upload"
+PHASE_IMPORT = "import"
+
+
+class OpenCTIStix2ImportStats:
+    """Throughput statistics of a bundle import
+
+    Pass an instance to :py:meth:`OpenCTIStix2.import_bundle` to collect the
+    counts by type, the phase timings, the mapping cache hit ratios, the
+    retries and the slowest items of the import. :py:meth:`to_dict` gives a
+    JSON serializable summary.
+
+    The ``mutation`` phase is the import time of the items not spent in the
+    embedded relationships resolution and in the file uploads, which is
+    mostly the time of the create and upsert queries. Cache counters are
+    shared by the imports running in the other threads of the client.
+
+    :param slowest_count: number of slowest item attempts kept
+    :type slowest_count: int
+    """
+
+    def __init__(self, slowest_count: int = 10):
+        self.slowest_count = slowest_count
+        self.objects = 0
+        self.too_large = 0
+        self.imported: Dict[str, int] = {}
+        self.failed: Dict[str, int] = {}
+        self.attempts = 0
+        self.retries: Dict[str, int] = {}
+        self.phases: Dict[str, float] = {}
+        self.cache: Dict[str, Dict[str, int]] = {}
+        self.duration = 0.0
+        self._slowest: List = []
+        self._sequence = itertools.count()
+        self._start = None
+        self._caches = []
+        self._cache_start: Dict[str, Dict[str, int]] = {}
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Time a block as part of the phase `name`.
+
+        :param name: name of the phase
+        :type name: str
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.perf_counter() - start)
+
+    def add_phase(self, name: str, duration: float):
+        self.phases[name] = self.phases.get(name, 0.0) + duration
+
+    def start(self, objects: int, caches: Dict = None):
+        """Start the import of a bundle of `objects` objects.
+
+        :param objects: number of objects of the bundle
+        :type objects: int
+        :param caches: mapping caches whose hit ratios are computed, by name
+        :type caches: dict
+        """
+        self.objects += objects
+        self._caches = list((caches or {}).items())
+        self._cache_start = {
+            name: self._cache_counters(cache) for name, cache in self._caches
+        }
+        self._start = time.perf_counter()
+
+    def stop(self):
+        """Stop the import started with :py:meth:`start`."""
+        if self._start is None:
+            return
+        self.duration += time.perf_counter() - self._start
+        self._start = None
+        for name, cache in self._caches:
+            start = self._cache_start[name]
+            counters = self.cache.setdefault(name, {"hits": 0, "misses": 0})
+            for counter, value in self._cache_counters(cache).items():
+                counters[counter] += value - start[counter]
+
+    @staticmethod
+    def _cache_counters(cache) -> Dict[str, int]:
+        stats = cache.stats().values()
+        return {
+            "hits": sum(namespace["hits"] for namespace in stats),
+            "misses": sum(namespace["misses"] for namespace in stats),
+        }
+
+    def record_attempt(
+        self,
+        item: Dict,
+        duration: float,
+        success: bool,
+        processing_count: int,
+        retried: bool,
+        error_type: Optional[str] = None,
+    ):
+        """Record an import attempt of `item`.
+
+        :param item: the imported STIX object
+        :type item: dict
+        :param duration: duration of the attempt in seconds
+        :type duration: float
+        :param success: whether the item has been imported
+        :type success: bool
+        :param processing_count: number of attempts done before this one
+        :type processing_count: int
+        :param retried: whether the item will be retried
+        :type retried: bool
+        :param error_type: type of the error if the item will be retried
+        :type error_type: str
+        """
+        item_type = item.get("type", "unknown")
+        self.attempts += 1
+        self.add_phase(PHASE_IMPORT, duration)
+        if success:
+            self.imported[item_type] = self.imported.get(item_type, 0) + 1
+        elif retried:
+            error_type = error_type or "UNKNOWN"
+            self.retries[error_type] = self.retries.get(error_type, 0) + 1
+        else:
+            self.failed[item_type] = self.failed.get(item_type, 0) + 1
+        entry = (duration, next(self._sequence), item.get("id"), item_type)
+        if len(self._slowest) < self.slowest_count:
+            heapq.heappush(self._slowest, entry)
+        elif duration > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    @property
+    def slowest(self) -> List[Dict]:
+        """Slowest item attempts, slowest first."""
+        return [
+            {"id": item_id, "type": item_type, "duration": duration}
+            for duration, _, item_id, item_type in sorted(self._slowest, reverse=True)
+        ]
+
+    def to_dict(self) -> Dict:
+        """Summary of the import statistics.
+
+        :return: JSON serializable statistics
+        :rtype: dict
+        """
+        phases = dict(self.phases)
+        phases["mutation"] = max(
+            0.0,
+            phases.get(PHASE_IMPORT, 0.0)
+            - phases.get(PHASE_EMBEDDED_RESOLUTION, 0.0)
+            - phases.get(PHASE_FILE_UPLOAD, 0.0),
+        )
+        imported = sum(self.imported.values())
+        return {
+            "objects": self.objects,
+            "imported": imported,
+            "failed": sum(self.failed.values()),
+            "too_large": self.too_large,
+            "duration": self.duration,
+            "objects_per_second": imported / self.duration if self.duration else 0.0,
+            "attempts": self.attempts,
+            "retries": dict(self.retries),
+            "imported_by_type": dict(self.imported),
+            "failed_by_type": dict(self.failed),
+            "phases": phases,
+            "cache_hit_ratios": {
+                name: (
+                    counters["hits"] / (counters["hits"] + counters["misses"])
+                    if counters["hits"] + counters["misses"] > 0
+                    else None
+                )
+                for name, counters in self.cache.items()
+            },
+            "slowest": self.slowest,
+        }
+
+
+def timed_phase(phase: str) -> Callable:
+    """Decorator timing an :py:class:`OpenCTIStix2` method as part of `phase`
+    when the current import collects statistics.
+
+    :param phase: name of the phase
+    :type phase: str
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(self, *args, **kwargs):
+            stats = self.import_stats
+            if stats is None:
+                return function(self, *args, **kwargs)
+            with stats.phase(phase):
+                return function(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,305 @@
+# coding: utf-8
+
+import heapq
+import itertools
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+from requests import RequestException
+
+ERROR_TYPE_LOCK = "LOCK_ERROR"
+ERROR_TYPE_MISSING_REFERENCE = "MISSING_REFERENCE_ERROR"
+ERROR_TYPE_BAD_GATEWAY = "Bad Gateway"
+ERROR_TYPE_DRAFT_LOCK = "DRAFT_LOCKED"
+ERROR_TYPE_TIMEOUT = "Request timed out"
+ERROR_TYPE_CONNECTION = "CONNECTION_ERROR"
+
+PROCESSING_COUNT: int = 4
+MAX_PROCESSING_COUNT: int = 100
+
+# Delay range (in seconds) before retrying an item, per error type
+RETRY_DELAYS: Dict[str, Tuple[float, float]] = {
+    ERROR_TYPE_LOCK: (1, 3),
+    ERROR_TYPE_MISSING_REFERENCE: (1, 3),
+    ERROR_TYPE_CONNECTION: (10, 30),
+    ERROR_TYPE_BAD_GATEWAY: (60, 60),
+    ERROR_TYPE_TIMEOUT: (60, 60),
+}
+
+# Errors meaning the platform itself is unavailable: retrying other items
+# in the meantime would only fail the same way
+PLATFORM_ERROR_TYPES = (
+    ERROR_TYPE_CONNECTION,
+    ERROR_TYPE_BAD_GATEWAY,
+    ERROR_TYPE_TIMEOUT,
+)
+
+_STRUCTURED_ERROR_TYPES = (
+    ERROR_TYPE_LOCK,
+    ERROR_TYPE_MISSING_REFERENCE,
+    ERROR_TYPE_DRAFT_LOCK,
+)
+
+_MESSAGE_ERROR_TYPES = (
+    ERROR_TYPE_LOCK,
+    ERROR_TYPE_MISSING_REFERENCE,
+    ERROR_TYPE_BAD_GATEWAY,
+    ERROR_TYPE_TIMEOUT,
+    ERROR_TYPE_DRAFT_LOCK,
+)
+
+
+def _classify_single_error(ex: BaseException) -> Optional[str]:
+    if isinstance(ex, RequestException):
+        return ERROR_TYPE_CONNECTION
+    # GraphQL errors are raised by the client as ValueError({"name": ..., ...})
+    if len(ex.args) > 0 and isinstance(ex.args[0], dict):
+        error_name = ex.args[0].get("name")
+        if error_name in _STRUCTURED_ERROR_TYPES:
+            return error_name
+        message = str(ex.args[0].get("error_message", "")) + " " + str(error_name)
+    else:
+        # Non 200 responses are raised with the raw response text
+        message = str(ex)
+    for error_type in _MESSAGE_ERROR_TYPES:
+        if error_type in message:
+            return error_type
+    return None
+
+
+def classify_error(ex: BaseException) -> Optional[str]:
+    """Find the type of an import error.
+
+    The GraphQL error name is used when available, the error message
+    otherwise. Chained exceptions are inspected as well.
+
+    :param ex: exception raised while importing an item
+    :type ex: BaseException
+    :return: one of the ``ERROR_TYPE_*`` constants or None for unknown errors
+    :rtype: str or None
+    """
+    seen = set()
+    while ex is not None and id(ex) not in seen:
+        seen.add(id(ex))
+        error_type = _classify_single_error(ex)
+        if error_type is not None:
+            return error_type
+        ex = ex.__cause__ or ex.__context__
+    return None
+
+
+def retry_delay(error_type: Optional[str], processing_count: int) -> Optional[float]:
+    """Compute the delay before retrying an item.
+
+    :param error_type: error type returned by :py:func:`classify_error`
+    :type error_type: str or None
+    :param processing_count: number of attempts already done for the item
+    :type processing_count: int
+    :return: delay in seconds or None if the item must not be retried
+    :rtype: float or None
+    """
+    if error_type not in RETRY_DELAYS:
+        return None
+    # Missing references are only retried a few times
+    in_retry = processing_count < PROCESSING_COUNT
+    if error_type == ERROR_TYPE_MISSING_REFERENCE and not in_retry:
+        return None
+    min_delay, max_delay = RETRY_DELAYS[error_type]
+    return round(random.uniform(min_delay, max_delay), 2)
+
+
+class RetryEntry:
+    """An item waiting in the retry scheduler
+
+    :param item: STIX object to import
+    :param processing_count: number of attempts already done
+    :param error_type: type of the last error
+    :param first_attempt_at: clock value of the first attempt
+    :param ready_at: clock value from which the item can be retried, None
+        for items waiting for missing references
+    :param sequence: insertion order in the scheduler
+    """
+
+    __slots__ = (
+        "item",
+        "processing_count",
+        "error_type",
+        "first_attempt_at",
+        "ready_at",
+        "sequence",
+    )
+
+    def __init__(
+        self,
+        item: Dict,
+        processing_count: int,
+        error_type: Optional[str],
+        first_attempt_at: float,
+        ready_at: Optional[float],
+        sequence: int = 0,
+    ):
+        self.item = item
+        self.processing_count = processing_count
+        self.error_type = error_type
+        self.first_attempt_at = first_attempt_at
+        self.ready_at = ready_at
+        self.sequence = sequence
+
+
+class OpenCTIStix2RetryScheduler:
+    """Delay queue for the items of a bundle that have to be retried
+
+    Items are parked until their backoff delay expires, the worker importing
+    the other items of the bundle in the meantime. Errors telling that the
+    platform is unavailable pause the whole queue instead. Items failing on
+    missing references are deferred until one of these references is created.
+
+    :param clock: monotonic clock function
+    :param sleep: function used to wait
+    """
+
+    def __init__(self, clock=time.monotonic, sleep=time.sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self.paused_until = 0
+        self._queue = []
+        self._sequence = itertools.count()
+        # Deferred entries by sequence and by the reference they wait for
+        self._deferred_entries = {}
+        self._deferred_by_ref = {}
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    @property
+    def deferred_count(self) -> int:
+        return len(self._deferred_entries)
+
+    def schedule(
+        self,
+        item: Dict,
+        processing_count: int,
+        error_type: Optional[str],
+        delay: float,
+        first_attempt_at: Optional[float] = None,
+    ) -> RetryEntry:
+        """Park an item until its retry delay expires.
+
+        :param item: STIX object to import
+        :type item: Dict
+        :param processing_count: number of attempts for the next retry
+        :type processing_count: int
+        :param error_type: type of the error that triggered the retry
+        :type error_type: str or None
+        :param delay: delay in seconds
+        :type delay: float
+        :param first_attempt_at: clock value of the first attempt
+        :type first_attempt_at: float
+        :return: the scheduled entry
+        :rtype: RetryEntry
+        """
+        now = self.clock()
+        entry = RetryEntry(
+            item,
+            processing_count,
+            error_type,
+            now if first_attempt_at is None else first_attempt_at,
+            now + delay,
+            next(self._sequence),
+        )
+        if error_type in PLATFORM_ERROR_TYPES:
+            self.paused_until = max(self.paused_until, entry.ready_at)
+        heapq.heappush(self._queue, (entry.ready_at, entry.sequence, entry))
+        return entry
+
+    def wait_if_paused(self) -> None:
+        """Wait until the platform is expected to be available again."""
+        remaining = self.paused_until - self.clock()
+        if remaining > 0:
+            self.sleep(remaining)
+
+    def pop_ready(self) -> List[RetryEntry]:
+        """Remove and return the entries whose delay has expired.
+
+        :return: entries ready to be retried, oldest deadline first
+        :rtype: list
+        """
+        now = self.clock()
+        ready = []
+        while len(self._queue) > 0 and self._queue[0][0] <= now:
+            ready.append(heapq.heappop(self._queue)[2])
+        return ready
+
+    def wait_next(self) -> List[RetryEntry]:
+        """Wait for the next entry to be ready and return the ready entries.
+
+        :return: entries ready to be retried
+        :rtype: list
+        """
+        if len(self._queue) == 0:
+            return []
+        remaining = self._queue[0][0] - self.clock()
+        if remaining > 0:
+            self.sleep(remaining)
+        return self.pop_ready()
+
+    def defer(
+        self,
+        item: Dict,
+        processing_count: int,
+        ref_ids: List[str],
+        first_attempt_at: Optional[float] = None,
+    ) -> RetryEntry:
+        """Park an item until one of the references it misses is created.
+
+        :param item: STIX object to import
+        :type item: Dict
+        :param processing_count: number of attempts for the next retry
+        :type processing_count: int
+        :param ref_ids: ids of the missing references
+        :type ref_ids: List[str]
+        :param first_attempt_at: clock value of the first attempt
+        :type first_attempt_at: float
+        :return: the deferred entry
+        :rtype: RetryEntry
+        """
+        entry = RetryEntry(
+            item,
+            processing_count,
+            ERROR_TYPE_MISSING_REFERENCE,
+            self.clock() if first_attempt_at is None else first_attempt_at,
+            None,
+            next(self._sequence),
+        )
+        self._deferred_entries[entry.sequence] = entry
+        for ref_id in ref_ids:
+            self._deferred_by_ref.setdefault(ref_id, []).append(entry)
+        return entry
+
+    def resolve(self, ref_id: str) -> List[RetryEntry]:
+        """Remove and return the deferred entries waiting for a reference.
+
+        :param ref_id: id of the reference that has been created
+        :type ref_id: str
+        :return: entries to retry
+        :rtype: list
+        """
+        resolved = []
+        for entry in self._deferred_by_ref.pop(ref_id, []):
+            # Entries waiting for several references may be already resolved
+            if self._deferred_entries.pop(entry.sequence, None) is not None:
+                resolved.append(entry)
+        return resolved
+
+    def pop_deferred(self) -> Optional[RetryEntry]:
+        """Remove and return the oldest deferred entry.
+
+        :return: the entry or None if no entry is deferred
+        :rtype: RetryEntry or None
+        """
+        if len(self._deferred_entries) == 0:
+            self._deferred_by_ref.clear()
+            return None
+        sequence = next(iter(self._deferred_entries))
+        return self._deferred_entries.pop(sequence)
@@ -1,9 +1,9 @@
-import json
 import uuid
 from typing import Tuple
 
 from typing_extensions import deprecated
 
+from pycti.utils import opencti_json
 from pycti.utils.opencti_stix2_identifier import (
     external_reference_generate_id,
     kill_chain_phase_generate_id,
@@ -217,7 +217,7 @@ class OpenCTIStix2Splitter:
         """splits a valid stix2 bundle into a list of bundles"""
         if use_json:
             try:
-                bundle_data = json.loads(bundle)
+                bundle_data = opencti_json.loads(bundle)
             except:
                 raise Exception("File data is not a valid JSON")
         else:
@@ -297,4 +297,4 @@ class OpenCTIStix2Splitter:
         }
         if event_version is not None:
             bundle["x_opencti_event_version"] = event_version
-        return json.dumps(bundle) if use_json else bundle
+        return opencti_json.dumps(bundle) if use_json else bundle
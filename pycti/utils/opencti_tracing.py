@@ -0,0 +1,144 @@
+# coding: utf-8
+"""Opt-in OpenTelemetry tracing of the bundle life cycle.
+
+Spans are only created once :py:func:`enable_tracing` has been called, the
+spans are then sent to the tracer provider configured by the application.
+The trace context is propagated in the AMQP headers of the messages sent by
+the connectors. A worker links its imports to the connector that produced
+the bundle with::
+
+    with opencti_tracing.attach(opencti_tracing.extract(properties.headers)):
+        api.stix2.import_bundle_from_json(...)
+"""
+
+import contextlib
+import functools
+from typing import Callable, Dict, Optional
+
+_enabled = False
+_NO_SPAN = contextlib.nullcontext()
+
+
+def enable_tracing(enabled: bool = True):
+    """Enable or disable the tracing spans.
+
+    :param enabled: whether spans are created
+    :type enabled: bool
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    """Whether the tracing spans are enabled.
+
+    :rtype: bool
+    """
+    return _enabled
+
+
+def _tracer():
+    from opentelemetry import trace
+
+    return trace.get_tracer("pycti")
+
+
+def span(name: str, attributes: Optional[Dict] = None):
+    """Get a context manager running its block in a new span.
+
+    :param name: name of the span
+    :type name: str
+    :param attributes: attributes of the span
+    :type attributes: dict
+    :return: the span context manager, a no-op one if tracing is disabled
+    """
+    if not _enabled:
+        return _NO_SPAN
+    return _tracer().start_as_current_span(name, attributes=attributes)
+
+
+def traced(name: str) -> Callable:
+    """Decorator running the decorated function in a new span.
+
+    :param name: name of the span
+    :type name: str
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            with _tracer().start_as_current_span(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def inject(headers: Optional[Dict] = None) -> Optional[Dict]:
+    """Add the current trace context to message headers.
+
+    :param headers: headers to complete, a new dict if None
+    :type headers: dict
+    :return: the headers, unchanged if tracing is disabled
+    :rtype: dict
+    """
+    if not _enabled:
+        return headers
+    from opentelemetry import propagate
+
+    headers = {} if headers is None else headers
+    propagate.inject(headers)
+    return headers
+
+
+def extract(headers: Optional[Dict]):
+    """Get the trace context propagated in message headers.
+
+    :param headers: message headers
+    :type headers: dict
+    :return: the trace context, None if there is none or tracing is disabled
+    """
+    if not _enabled or not headers:
+        return None
+    from opentelemetry import propagate
+
+    return propagate.extract(headers)
+
+
+@contextlib.contextmanager
+def attach(context):
+    """Run a block with a trace context extracted by :py:func:`extract`.
+
+    :param context: the trace context, None to keep the current one
+    """
+    if context is None:
+        yield
+        return
+    from opentelemetry import context as otel_context
+
+    token = otel_context.attach(context)
+    try:
+        yield
+    finally:
+        otel_context.detach(token)
+
+
+def bind(function: Callable, context) -> Callable:
+    """Bind a function to a trace context, to run it in another thread.
+
+    :param function: function to bind
+    :param context: the trace context, None to leave the function unchanged
+    :return: the bound function
+    """
+    if context is None:
+        return function
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        with attach(context):
+            return function(*args, **kwargs)
+
+    return wrapper
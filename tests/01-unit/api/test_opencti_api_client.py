@@ -0,0 +1,88 @@
+import subprocess
+import sys
+
+from pycti import OpenCTIApiClient
+
+
+def get_client():
+    return OpenCTIApiClient(
+        "http://fake:4000", "fake", ssl_verify=False, perform_health_check=False
+    )
+
+
+def test_process_multiple_fields():
+    client = get_client()
+    data = {
+        "id": "1",
+        "entity_type": "Malware",
+        "name_alt": "Emotet",
+        "createdBy": {"id": "identity-1", "objectLabel": [{"id": "label-1"}]},
+        "objectMarking": [{"id": "marking-1"}, {"id": "marking-2"}],
+        "externalReferences": {"edges": [{"node": {"id": "ref-1"}}]},
+    }
+    result = client.process_multiple_fields(data)
+    assert result["name"] == "Emotet"
+    assert "name_alt" not in result
+    assert result["createdById"] == "identity-1"
+    assert result["createdBy"]["objectLabelIds"] == ["label-1"]
+    assert result["objectMarkingIds"] == ["marking-1", "marking-2"]
+    assert result["externalReferences"] == [{"id": "ref-1", "createdById": None}]
+    assert result["externalReferencesIds"] == ["ref-1"]
+
+
+def test_process_multiple_pagination():
+    client = get_client()
+    data = {
+        "edges": [{"node": {"id": "1"}}, {"node": {"id": "2"}}],
+        "pageInfo": {"hasNextPage": False},
+    }
+    result = client.process_multiple(data, with_pagination=True)
+    assert [entity["id"] for entity in result["entities"]] == ["1", "2"]
+    assert result["pagination"] == {"hasNextPage": False}
+    assert client.process_multiple(None) == []
+    assert client.process_multiple({"edges": None}, True) == {
+        "entities": [],
+        "pagination": {},
+    }
+
+
+def test_entities_are_built_on_first_access():
+    client = get_client()
+    assert "report" not in client.__dict__
+    report = client.report
+    assert client.report is report
+    assert client.__dict__["report"] is report
+    assert client.stix_domain_object.file is not None
+
+
+def test_import_does_not_load_the_connector_stack():
+    code = (
+        "import sys\n"
+        "import pycti\n"
+        "from pycti import OpenCTIApiClient\n"
+        "OpenCTIApiClient('http://fake:4000', 'fake', perform_health_check=False)\n"
+        "heavy = ['fastapi', 'uvicorn', 'pika', 'prometheus_client',\n"
+        "         'datefinder', 'magic', 'opentelemetry']\n"
+        "print(','.join(name for name in heavy if name in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_import_registers_the_custom_observables():
+    code = (
+        "import stix2\n"
+        "import pycti\n"
+        "observable = stix2.parse(\n"
+        "    {'type': 'hostname', 'id': 'hostname--' + str(__import__('uuid').uuid4()),\n"
+        "     'spec_version': '2.1', 'value': 'example.org'},\n"
+        "    allow_custom=False,\n"
+        ")\n"
+        "print(type(observable).__name__)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "CustomObservableHostname"
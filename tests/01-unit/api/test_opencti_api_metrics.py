@@ -0,0 +1,117 @@
+import pytest
+from requests import ConnectionError
+
+from pycti import OpenCTIApiClient
+from pycti.api.opencti_api_metrics import operation_name
+
+
+class Recorder:
+    def __init__(self):
+        self.values = []
+
+    def record(self, value, attributes=None):
+        self.values.append((value, attributes))
+
+    add = record
+
+
+class FakeRequest:
+    def __init__(self, body):
+        self.body = body
+
+
+class FakeResponse:
+    def __init__(self, status_code, content, body=b"{}"):
+        self.status_code = status_code
+        self.content = content
+        self.text = content.decode("utf-8")
+        self.request = FakeRequest(body)
+
+
+class FakeMetricHandler:
+    def __init__(self):
+        self.counts = {}
+
+    def inc(self, name, n=1, labels=None):
+        key = (name, tuple(sorted((labels or {}).values())))
+        self.counts[key] = self.counts.get(key, 0) + n
+
+
+def get_client(responses):
+    client = OpenCTIApiClient(
+        "http://fake:4000", "fake", ssl_verify=False, perform_health_check=False
+    )
+
+    def post(url, data=None, **kwargs):
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    client.session.post = post
+    return client
+
+
+def instrument(client):
+    metrics = client.query_metrics
+    for name in [
+        "duration_histogram",
+        "request_size_histogram",
+        "response_size_histogram",
+        "retry_counter",
+        "error_counter",
+    ]:
+        setattr(metrics, name, Recorder())
+    return metrics
+
+
+def test_operation_name():
+    assert operation_name("\n  query Reports($first: Int) { x }") == "Reports"
+    assert operation_name("mutation ReportAdd($input: X) { x }") == "ReportAdd"
+    assert operation_name("{ me { id } }") == "anonymous"
+
+
+def test_query_records_metrics_by_operation():
+    client = get_client(
+        [
+            FakeResponse(200, b'{"data": {"report": null}}', b"x" * 42),
+            FakeResponse(200, b'{"errors": [{"name": "LOCK_ERROR", "message": "x"}]}'),
+            FakeResponse(502, b"Bad Gateway"),
+            ConnectionError("refused"),
+        ]
+    )
+    handler = FakeMetricHandler()
+    client.enable_query_metrics(handler)
+    metrics = instrument(client)
+
+    client.query("query Report($id: String) { report(id: $id) { id } }")
+    assert metrics.duration_histogram.values[0][1] == {
+        "operation": "Report",
+        "status": "success",
+    }
+    assert metrics.request_size_histogram.values == [(42, {"operation": "Report"})]
+    assert metrics.response_size_histogram.values[0][0] == 26
+
+    client.set_retry_number(2)
+    for _ in range(3):
+        with pytest.raises((ValueError, ConnectionError)):
+            client.query("mutation ReportAdd { reportAdd { id } }")
+    assert [value[1]["error_type"] for value in metrics.error_counter.values] == [
+        "LOCK_ERROR",
+        "HTTP_502",
+        "ConnectionError",
+    ]
+    assert len(metrics.retry_counter.values) == 3
+    assert handler.counts == {
+        ("api_query_count", ("Report",)): 1,
+        ("api_query_count", ("ReportAdd",)): 3,
+        ("api_query_error_count", ("LOCK_ERROR", "ReportAdd")): 1,
+        ("api_query_error_count", ("HTTP_502", "ReportAdd")): 1,
+        ("api_query_error_count", ("ConnectionError", "ReportAdd")): 1,
+    }
+
+
+def test_query_metrics_are_disabled_by_default():
+    client = get_client([FakeResponse(200, b'{"data": {}}')])
+    assert client.query_metrics is None
+    assert client.query("{ me { id } }") == {"data": {}}
@@ -0,0 +1,66 @@
+from unittest.mock import MagicMock
+
+from pycti.connector.opencti_connector_helper import ConnectorInfo, PingAlive
+from pycti.utils.opencti_logger import logger
+
+
+class Connector:
+    def __init__(self, connector_state, remote_state):
+        self.connector_state = connector_state
+        self.remote_state = remote_state
+        self.sent_states = []
+        self.api = MagicMock()
+        self.api.connector.ping.side_effect = self.ping
+
+    def ping(self, connector_id, connector_state, connector_info, serialized_state):
+        self.sent_states.append(serialized_state)
+        remote_state = self.remote_state
+        return {
+            "connector_state": (
+                serialized_state if remote_state is None else remote_state
+            )
+        }
+
+    def set_state(self, state):
+        self.connector_state = None
+
+    def ping_alive(self, **kwargs):
+        return PingAlive(
+            logger("INFO")("test"),
+            "connector-id",
+            self.api,
+            MagicMock(return_value=None),
+            self.set_state,
+            MagicMock(),
+            ConnectorInfo(),
+            get_serialized_state=lambda: self.connector_state or "null",
+            **kwargs,
+        )
+
+
+def test_unchanged_state_is_not_decoded(monkeypatch):
+    connector = Connector('{"last_run": 1}', None)
+    loads = MagicMock()
+    monkeypatch.setattr("pycti.utils.opencti_json.loads", loads)
+    connector.ping_alive().ping_once()
+    assert connector.sent_states == ['{"last_run": 1}']
+    loads.assert_not_called()
+    assert connector.connector_state == '{"last_run": 1}'
+
+
+def test_remote_reset_and_serialization_differences():
+    connector = Connector('{"last_run":1}', '{"last_run": 1}')
+    connector.ping_alive().ping_once()
+    assert connector.connector_state == '{"last_run":1}'
+
+    connector.remote_state = ""
+    connector.ping_alive().ping_once()
+    assert connector.connector_state is None
+
+
+def test_interval_jitter():
+    connector = Connector(None, None)
+    assert connector.ping_alive().next_wait() == 40
+    ping = connector.ping_alive(interval=10, jitter=20)
+    assert ping.jitter == 9
+    assert all(1 <= ping.next_wait() <= 19 for _ in range(100))
@@ -0,0 +1,78 @@
+import os
+import pstats
+import threading
+
+from pycti.connector.opencti_connector_helper import ConnectorInfo
+from pycti.connector.opencti_connector_profiler import (
+    OpenCTIConnectorProfiler,
+    profiled,
+)
+from pycti.utils.opencti_logger import logger
+
+
+class Helper:
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    @profiled("send_stix2_bundle")
+    def send_stix2_bundle(self, bundle):
+        return len(bundle)
+
+
+def test_phases_are_timed_and_profiled(tmp_path):
+    connector_info = ConnectorInfo()
+    profiler = OpenCTIConnectorProfiler(
+        logger("INFO")("test"),
+        connector_info,
+        activated=True,
+        every=2,
+        directory=str(tmp_path),
+        keep=2,
+    )
+    helper = Helper(profiler)
+    for _ in range(6):
+        with profiler.profile("callback"):
+            assert helper.send_stix2_bundle("bundle") == 6
+
+    timers = connector_info.phase_timers
+    assert timers["callback"]["count"] == 6
+    assert timers["send_stix2_bundle"]["count"] == 6
+    assert timers["callback"]["max"] >= timers["callback"]["average"]
+    # Nested phases are not profiled while the callback is
+    files = sorted(os.listdir(tmp_path))
+    assert len(files) == 2
+    assert all(name.startswith("callback-") for name in files)
+    pstats.Stats(os.path.join(tmp_path, files[0]))
+    # Phase timers are not sent to the platform
+    assert "phase_timers" not in connector_info.all_details
+
+
+def test_profiling_is_disabled_by_default(tmp_path):
+    connector_info = ConnectorInfo()
+    profiler = OpenCTIConnectorProfiler(logger("INFO")("test"), connector_info)
+    with profiler.profile("callback"):
+        pass
+    assert Helper(profiler).send_stix2_bundle("b") == 1
+    assert connector_info.phase_timers == {}
+
+
+def test_threads_are_profiled_independently(tmp_path):
+    connector_info = ConnectorInfo()
+    profiler = OpenCTIConnectorProfiler(
+        logger("INFO")("test"),
+        connector_info,
+        activated=True,
+        every=1,
+        directory=str(tmp_path),
+    )
+
+    def run():
+        with profiler.profile("callback"):
+            pass
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert connector_info.phase_timers["callback"]["count"] == 4
@@ -0,0 +1,91 @@
+from pycti import OpenCTIApiClient
+
+
+def get_client():
+    return OpenCTIApiClient(
+        "http://fake:4000", "fake", ssl_verify=False, perform_health_check=False
+    )
+
+
+def test_get_by_stix_id_or_name_uses_one_query():
+    client = get_client()
+    calls = []
+
+    def fake_list(**kwargs):
+        calls.append(kwargs)
+        return [
+            {"id": "1", "name": "Other", "aliases": ["APT-X"]},
+            {"id": "2", "name": "apt x", "aliases": []},
+        ]
+
+    client.stix_domain_object.list = fake_list
+    result = client.stix_domain_object.get_by_stix_id_or_name(
+        name="APT X", aliases=["APT-X"]
+    )
+    assert result["id"] == "2"
+    assert len(calls) == 1
+    assert calls[0]["filters"]["mode"] == "or"
+
+
+def test_read_many_maps_requested_ids():
+    client = get_client()
+    calls = []
+
+    def fake_list(**kwargs):
+        calls.append(kwargs)
+        return [
+            {
+                "id": "internal",
+                "standard_id": "malware--a",
+                "x_opencti_stix_ids": ["malware--b"],
+            }
+        ]
+
+    client.stix_domain_object.list = fake_list
+    result = client.stix_domain_object.read_many(
+        ids=["malware--a", "malware--b", "malware--c"], chunkSize=2
+    )
+    assert len(calls) == 2
+    assert calls[0]["first"] == 2
+    assert set(result.keys()) == {"malware--a", "malware--b"}
+
+
+def test_get_by_stix_id_or_name_matches_aliases_on_the_aliases_field():
+    client = get_client()
+    calls = []
+
+    def fake_list(**kwargs):
+        calls.append(kwargs)
+        return [
+            {"id": "1", "name": "Fancy Bear", "aliases": []},
+            {"id": "2", "name": "Sofacy", "aliases": ["Fancy Bear"]},
+        ]
+
+    client.stix_domain_object.list = fake_list
+    result = client.stix_domain_object.get_by_stix_id_or_name(
+        name="APT28", aliases=["Fancy Bear"]
+    )
+    assert result["id"] == "2"
+    filters = calls[0]["filters"]["filters"]
+    assert filters[0] == {"key": "name", "values": ["APT28"]}
+    assert filters[1] == {"key": "aliases", "values": ["APT28", "Fancy Bear"]}
+
+
+def test_get_by_stix_id_or_name_without_name_in_projection():
+    client = get_client()
+    calls = []
+
+    def fake_list(**kwargs):
+        calls.append(kwargs)
+        return [{"id": "1", "standard_id": "intrusion-set--a"}]
+
+    client.stix_domain_object.list = fake_list
+    result = client.stix_domain_object.get_by_stix_id_or_name(
+        name="APT28", fields="minimal"
+    )
+    assert result["id"] == "1"
+    assert calls[0]["filters"]["filters"] == [{"key": "name", "values": ["APT28"]}]
+    result = client.stix_domain_object.resolve_names(
+        names=["APT28"], customAttributes="id standard_id entity_type"
+    )
+    assert result["APT28"]["id"] == "1"
@@ -0,0 +1,31 @@
+from pycti import OpenCTIApiClient
+
+
+def test_create_many_batches_mutations():
+    client = OpenCTIApiClient(
+        "http://fake:4000", "fake", ssl_verify=False, perform_health_check=False
+    )
+    queries = []
+
+    def fake_query(query, variables=None):
+        queries.append((query, variables))
+        return {
+            "data": {
+                key.replace("input", "rel"): {"id": value["toId"]}
+                for key, value in variables.items()
+            }
+        }
+
+    client.query = fake_query
+    relationships = [
+        {"fromId": "obs", "toId": "ref-" + str(i), "relationship_type": "resolves-to"}
+        for i in range(5)
+    ]
+    results = client.stix_nested_ref_relationship.create_many(
+        relationships=relationships, chunkSize=2
+    )
+    assert [result["id"] for result in results] == ["ref-" + str(i) for i in range(5)]
+    assert len(queries) == 3
+    query, variables = queries[0]
+    assert query.count("stixRefRelationshipAdd(") == 2
+    assert variables["input0"]["relationship_type"] == "obs_resolves-to"
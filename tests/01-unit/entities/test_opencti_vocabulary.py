@@ -0,0 +1,29 @@
+from pycti import OpenCTIApiClient
+
+
+def test_read_or_create_unchecked_with_cache_prefetches_category():
+    client = OpenCTIApiClient(
+        "http://fake:4000", "fake", ssl_verify=False, perform_health_check=False
+    )
+    list_calls = []
+    created = []
+
+    def fake_list(**kwargs):
+        list_calls.append(kwargs["filters"]["filters"][0]["values"])
+        return [{"id": "1", "name": "backdoor"}, {"id": "2", "name": "trojan"}]
+
+    def fake_read_or_create_unchecked(**kwargs):
+        created.append(kwargs)
+        return {"id": "3", "name": kwargs["name"]}
+
+    client.vocabulary.list = fake_list
+    client.vocabulary.read_or_create_unchecked = fake_read_or_create_unchecked
+    cache = {"category_malware_types": "malware_type_ov"}
+    field = {"key": "malware_types", "required": False}
+    resolve = client.vocabulary.read_or_create_unchecked_with_cache
+    assert resolve("backdoor", cache, field)["id"] == "1"
+    assert resolve("trojan", cache, field)["id"] == "2"
+    assert resolve("wiper", cache, field)["id"] == "3"
+    assert resolve("wiper", cache, field)["id"] == "3"
+    assert list_calls == [["malware_type_ov"]]
+    assert len(created) == 1
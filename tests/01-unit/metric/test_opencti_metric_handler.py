@@ -1,6 +1,7 @@
 from unittest import TestCase
+from unittest.mock import patch
 
-from prometheus_client import Counter, Enum
+from prometheus_client import REGISTRY, Counter, Enum
 
 from pycti import OpenCTIMetricHandler
 from pycti.utils.opencti_logger import logger
@@ -13,3 +14,59 @@ class TestOpenCTIMetricHandler(TestCase):
         self.assertTrue(metric._metric_exists("error_count", Counter))
         self.assertFalse(metric._metric_exists("error_count", Enum))
         self.assertFalse(metric._metric_exists("best_metric_count", Counter))
+
+    def test_labels_gauges_and_histograms(self):
+        test_logger = logger("INFO")("test")
+        metric = OpenCTIMetricHandler(
+            test_logger, activated=True, namespace="test_labels", port=0
+        )
+        metric.inc("api_query_count", labels={"operation": "Reports"})
+        metric.observe("bundle_send_size", 2048)
+        metric.set("queue_messages_size", 12.5)
+        metric.inc("in_flight_work")
+        metric.inc("in_flight_work")
+        metric.dec("in_flight_work")
+        self.assertEqual(
+            REGISTRY.get_sample_value(
+                "test_labels_api_queries_total", {"operation": "Reports"}
+            ),
+            1,
+        )
+        self.assertEqual(
+            REGISTRY.get_sample_value("test_labels_bundle_send_size_bytes_sum"), 2048
+        )
+        self.assertEqual(
+            REGISTRY.get_sample_value("test_labels_queue_messages_size_megabytes"),
+            12.5,
+        )
+        self.assertEqual(REGISTRY.get_sample_value("test_labels_in_flight_work"), 1)
+
+    def test_register_and_report_once(self):
+        test_logger = logger("INFO")("test")
+        metric = OpenCTIMetricHandler(
+            test_logger, activated=True, namespace="test_register", port=0
+        )
+        metric.register(
+            "objects_imported", "counter", "Imported objects", ["entity_type"]
+        )
+        metric.inc("objects_imported", 3, labels={"entity_type": "Report"})
+        self.assertEqual(
+            REGISTRY.get_sample_value(
+                "test_register_objects_imported_total", {"entity_type": "Report"}
+            ),
+            3,
+        )
+        with self.assertRaises(ValueError):
+            metric.register("objects_imported", "counter", "Imported objects")
+        with patch.object(test_logger, "error") as error:
+            metric.inc("unknown_metric")
+            metric.inc("unknown_metric")
+            metric.inc("objects_imported")
+            metric.inc("objects_imported")
+        self.assertEqual(error.call_count, 2)
+
+    def test_deactivated_handler_is_a_noop(self):
+        metric = OpenCTIMetricHandler(logger("INFO")("test"))
+        self.assertIsNone(metric.register("custom", "gauge", "Custom gauge"))
+        metric.set("custom", 1)
+        metric.observe("bundle_send_duration", 1)
@@ -0,0 +1,38 @@
+import glob
+import json
+
+import pytest
+
+from pycti.utils import opencti_json
+
+
+@pytest.fixture(params=opencti_json.available_backends())
+def backend(request):
+    previous = opencti_json.get_backend()
+    opencti_json.set_backend(request.param)
+    yield request.param
+    opencti_json.set_backend(previous)
+
+
+def test_backends_roundtrip_stix_bundles(backend):
+    for file_path in glob.glob("tests/data/*.json"):
+        with open(file_path, "rb") as file:
+            content = file.read()
+        data = opencti_json.loads(content)
+        assert data == json.loads(content)
+        assert json.loads(opencti_json.dumps(data)) == data
+        assert json.loads(opencti_json.dumps_bytes(data)) == data
+
+
+def test_backends_fallback_to_stdlib(backend):
+    assert opencti_json.loads('{"a": NaN}')["a"] != 0
+    assert opencti_json.dumps({1: 2**70}) == json.dumps({1: 2**70})
+    with pytest.raises(ValueError):
+        opencti_json.loads("{invalid")
+    with pytest.raises(TypeError):
+        opencti_json.dumps({"a": object()})
+
+
+def test_set_backend_unknown():
+    with pytest.raises(ValueError):
+        opencti_json.set_backend("unknown")
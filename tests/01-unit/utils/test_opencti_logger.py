@@ -0,0 +1,67 @@
+import json
+import logging
+from unittest.mock import patch
+
+from pycti.utils import opencti_logger
+from pycti.utils.opencti_logger import RateLimitFilter, logger
+
+
+def record(message, level=logging.INFO):
+    return logging.LogRecord("test", level, __file__, 1, message, None, None)
+
+
+def test_meta_is_only_built_when_logged():
+    app_logger = logger("WARNING")("test")
+    calls = []
+
+    def meta():
+        calls.append(1)
+        return {"filters": "{}"}
+
+    app_logger.info("Listing", meta)
+    assert calls == []
+    with patch.object(app_logger.local_logger, "warning") as warning:
+        app_logger.warning("Listing", meta)
+    assert calls == [1]
+    assert warning.call_args.kwargs["extra"] == {"attributes": {"filters": "{}"}}
+
+
+def test_error_only_attaches_the_handled_exception():
+    app_logger = logger("INFO")("test")
+    with patch.object(app_logger.local_logger, "error") as error:
+        app_logger.error("No exception")
+        try:
+            raise ValueError("failure")
+        except ValueError:
+            app_logger.error("Exception")
+    assert [call.kwargs["exc_info"] for call in error.call_args_list] == [
+        False,
+        True,
+    ]
+
+
+def test_rate_limit_filter():
+    rate_limit = RateLimitFilter(2, period=60)
+    assert [rate_limit.filter(record("same")) for _ in range(4)] == [
+        True,
+        True,
+        False,
+        False,
+    ]
+    assert rate_limit.filter(record("other"))
+    assert rate_limit.filter(record("same", logging.ERROR))
+    with patch("time.monotonic", return_value=10**9):
+        next_window = record("same")
+        assert rate_limit.filter(next_window)
+    assert next_window.suppressed == 2
+
+
+def test_async_logging(capsys):
+    app_logger = logger("INFO", async_logging=True, rate_limit=1)("test")
+    assert opencti_logger._queue_listener is not None
+    app_logger.info("Queued message", lambda: {"id": 1})
+    app_logger.info("Queued message", lambda: {"id": 2})
+    opencti_logger._stop_queue_listener()
+    lines = [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+    assert [line["attributes"] for line in lines] == [{"id": 1}]
+    logger("INFO")
@@ -0,0 +1,69 @@
+import time
+
+from pycti.utils.opencti_mapping_cache import (
+    MappingEntry,
+    OpenCTIMappingCache,
+    mapping_cache_namespace,
+)
+
+
+class FakeMetricHandler:
+    def __init__(self):
+        self.counts = {}
+
+    def inc(self, name, n=1):
+        self.counts[name] = self.counts.get(name, 0) + n
+
+
+def test_keys_are_routed_to_namespaces():
+    assert mapping_cache_namespace("malware--1") == "stix_ids"
+    assert mapping_cache_namespace("label_apt") == "labels"
+    assert mapping_cache_namespace("kill_chain_phase_mitre-attackexecution") == (
+        "kill_chain_phases"
+    )
+    assert mapping_cache_namespace("author_MITRE") == "authors"
+    assert mapping_cache_namespace("5e1a7c4e-7a2f-4b5b-9d6e-0c4f7c9e2a10") == (
+        "internal_ids"
+    )
+
+
+def test_entries_are_compact():
+    cache = OpenCTIMappingCache()
+    cache["malware--1"] = {"id": "1", "type": "Malware", "observables": []}
+    cache["author_ACME"] = {"id": "2", "name": "ACME", "description": ""}
+    entry = cache["malware--1"]
+    assert isinstance(entry, MappingEntry)
+    assert entry["id"] == "1" and entry.get("name") is None
+    assert entry == {"id": "1", "type": "Malware", "observables": []}
+    assert not hasattr(entry, "__dict__")
+    assert isinstance(cache["author_ACME"], dict)
+
+
+def test_namespaces_are_bounded_and_counted():
+    metric_handler = FakeMetricHandler()
+    cache = OpenCTIMappingCache(
+        {"stix_ids": {"maxsize": 2}, "internal_ids": {"maxsize": 10, "ttl": 0.01}},
+        metric_handler=metric_handler,
+    )
+    for i in range(3):
+        cache["malware--" + str(i)] = {"id": str(i)}
+    assert "malware--0" not in cache
+    assert cache["malware--2"]["id"] == "2"
+    cache["internal-1"] = {"id": "1"}
+    time.sleep(0.02)
+    assert cache.get("internal-1") is None
+    stats = cache.stats()
+    assert stats["stix_ids"] == {
+        "size": 2,
+        "maxsize": 2,
+        "ttl": None,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 1,
+    }
+    assert stats["internal_ids"]["misses"] == 1
+    assert metric_handler.counts["mapping_cache_hits"] == 1
+    assert metric_handler.counts["mapping_cache_evictions"] >= 1
+    assert len(cache) == 2
+    cache.clear()
+    assert len(cache) == 0
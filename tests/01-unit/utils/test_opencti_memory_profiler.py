@@ -0,0 +1,57 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from pycti.utils import opencti_memory_profiler
+
+
+@pytest.fixture
+def profiling():
+    logger = MagicMock()
+    opencti_memory_profiler.clear_records()
+    opencti_memory_profiler.enable_memory_profiling(top=3, logger=logger)
+    yield logger
+    opencti_memory_profiler.enable_memory_profiling(False)
+    opencti_memory_profiler.clear_records()
+
+
+def test_memory_profiling_is_disabled_by_default():
+    assert not opencti_memory_profiler.is_enabled()
+    with opencti_memory_profiler.phase("unused"):
+        pass
+    assert opencti_memory_profiler.profiled("unused")(lambda x: x + 1)(1) == 2
+    assert opencti_memory_profiler.records() == []
+
+
+def test_phase_is_recorded(profiling):
+    with opencti_memory_profiler.phase("split"):
+        data = [str(index) * 10 for index in range(10000)]
+
+    (record,) = opencti_memory_profiler.records()
+    assert record["phase"] == "split"
+    assert record["after"] - record["before"] > 100000
+    assert record["peak"] >= record["after"]
+    assert 0 < len(record["top"]) <= 3
+    assert record["top"][0]["location"].startswith(__file__)
+    assert record["top"][0]["size_diff"] > 0
+    assert len(data) == 10000
+    message, meta = profiling.info.call_args[0]
+    assert message == "Memory profile of phase"
+    assert "top" not in meta()
+
+
+def test_nested_phases_and_decorator(profiling):
+    @opencti_memory_profiler.profiled("import")
+    def run():
+        with opencti_memory_profiler.phase("split"):
+            pass
+        return 1
+
+    assert run() == 1
+    records = opencti_memory_profiler.records()
+    assert [record["phase"] for record in records] == ["split", "import"]
+    assert records[1]["peak"] >= records[0]["peak"]
+
+    opencti_memory_profiler.enable_memory_profiling(False)
+    assert run() == 1
+    assert len(opencti_memory_profiler.records()) == 2
@@ -0,0 +1,26 @@
+import pytest
+
+from pycti.utils.opencti_projection import (
+    STIX_CORE_OBJECT_PROJECTIONS,
+    build_fragment,
+    resolve_projection,
+)
+
+
+def test_build_fragment():
+    fragment = build_fragment(
+        ["id", {"createdBy": ["id", "name"]}, "... on Malware { name }"]
+    )
+    assert fragment == "id\ncreatedBy { id\nname }\n... on Malware { name }"
+
+
+def test_resolve_projection():
+    levels = STIX_CORE_OBJECT_PROJECTIONS
+    assert resolve_projection("id", "minimal", levels) == "id"
+    assert resolve_projection(None, None, levels) is None
+    assert resolve_projection(None, "full", levels) is None
+    assert resolve_projection(None, ["id", "name"], levels) == "id\nname"
+    minimal = resolve_projection(None, "minimal", levels)
+    assert minimal == "id\nstandard_id\nentity_type\nparent_types"
+    with pytest.raises(ValueError):
+        resolve_projection(None, "unknown", levels)
@@ -0,0 +1,46 @@
+from pycti.utils import opencti_stix2_dates
+from pycti.utils.opencti_stix2_dates import extract_date
+
+
+def test_extract_date_formats():
+    assert extract_date("Rob Graham, SuperFish, 2015--02---19, Errata") == (
+        "2015-02-19T00:00:00Z"
+    )
+    assert extract_date("Published 2019-03-04T10:11:12Z") == "2019-03-04T10:11:12Z"
+    assert extract_date("Mon, 02 Jan 2006 15:04:05 GMT") == "2006-01-02T15:04:05Z"
+    assert extract_date("Retrieved December 21, 2015.") == "2015-12-21T00:00:00Z"
+    assert extract_date("ACME. (2015, February). Report. Retrieved March 3, 2016") == (
+        "2015-02-01T00:00:00Z"
+    )
+    assert extract_date("CISA, Supply Chain Attacks, 2021--04, CISA") == (
+        "2021-04-01T00:00:00Z"
+    )
+    assert extract_date("RFC 1738 - Uniform Resource Locators, 1994--12") == (
+        "1994-12-01T00:00:00Z"
+    )
+    assert extract_date("Operation Cobalt Kitty, 2017, CyberReason") == (
+        "2017-01-01T00:00:00Z"
+    )
+
+
+def test_extract_date_without_date():
+    assert extract_date("Cache Poisoning") is None
+    assert extract_date("Planned for 2999-01-01") is None
+    assert extract_date(None) is None
+
+
+def test_extract_date_is_memoized(monkeypatch):
+    opencti_stix2_dates.clear_cache()
+    calls = []
+    fast_extract_date = opencti_stix2_dates._fast_extract_date
+
+    def counting_fast_extract_date(text, max_timestamp):
+        calls.append(text)
+        return fast_extract_date(text, max_timestamp)
+
+    monkeypatch.setattr(
+        opencti_stix2_dates, "_fast_extract_date", counting_fast_extract_date
+    )
+    assert extract_date("Report, 2020--01---15") == "2020-01-15T00:00:00Z"
+    assert extract_date("Report, 2020--01---15") == "2020-01-15T00:00:00Z"
+    assert len(calls) == 1
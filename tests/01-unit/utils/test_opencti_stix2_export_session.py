@@ -0,0 +1,47 @@
+from pycti import OpenCTIApiClient, OpenCTIStix2, OpenCTIStix2ExportSession
+
+
+def get_cti_helper():
+    client = OpenCTIApiClient(
+        "http://fake:4000", "fake", ssl_verify=False, perform_health_check=False
+    )
+    return OpenCTIStix2(client)
+
+
+def test_export_session_memoizes_conversion():
+    stix2 = get_cti_helper()
+    calls = []
+
+    def convert():
+        calls.append(1)
+        return {"id": "identity--1", "name": "ACME"}
+
+    with stix2.export_session() as session:
+        first = session.get_or_convert(("created_by", "1"), convert)
+        first["name"] = "changed"
+        second = session.get_or_convert(("created_by", "1"), convert)
+    assert len(calls) == 1
+    assert second["name"] == "ACME"
+    assert session.hits == 1
+    assert session.misses == 1
+
+
+def test_export_session_context_restores_previous():
+    stix2 = get_cti_helper()
+    assert stix2.current_export_session is None
+    with stix2.export_session() as outer:
+        assert stix2.current_export_session is outer
+        with stix2.export_session() as inner:
+            assert stix2.current_export_session is inner
+        assert stix2.current_export_session is outer
+    assert stix2.current_export_session is None
+
+
+def test_export_session_is_bounded():
+    stix2 = get_cti_helper()
+    session = OpenCTIStix2ExportSession(stix2, maxsize=2)
+    for i in range(5):
+        session.get_or_convert(i, lambda: [{"id": i}])
+    assert len(session.cache) == 2
+    assert session.access_key({"b": 1, "a": 2}) == '{"a": 2, "b": 1}'
+    assert session.access_key(None) is None
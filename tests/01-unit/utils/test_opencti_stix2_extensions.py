@@ -0,0 +1,49 @@
+from pycti import OpenCTIApiClient
+from pycti.utils.opencti_stix2_extensions import (
+    STIX_EXT_MITRE,
+    STIX_EXT_OCTI,
+    STIX_EXT_OCTI_SCO,
+    StixExtensionView,
+    extension_view,
+)
+
+stix_object = {
+    "type": "malware",
+    "id": "malware--1",
+    "name": "Top level",
+    "labels": ["a"],
+    "extensions": {
+        STIX_EXT_OCTI_SCO: {"score": 10, "description": "observable"},
+        STIX_EXT_OCTI: {"score": 50, "type": "Malware", "stix_ids": None},
+        STIX_EXT_MITRE: {"id": "S0001"},
+    },
+}
+
+
+def test_view_matches_get_attribute_in_extension():
+    view = StixExtensionView(stix_object)
+    for key in ["score", "description", "type", "stix_ids", "name", "labels", "id"]:
+        assert view.get(key) == OpenCTIApiClient.get_attribute_in_extension(
+            key, stix_object
+        )
+    for key in ["id", "missing"]:
+        assert view.get_mitre(key) == (
+            OpenCTIApiClient.get_attribute_in_mitre_extension(key, stix_object)
+        )
+    assert view.get("type") == "Malware"
+    assert StixExtensionView({"type": "malware"}).get("type") is None
+
+
+def test_view_reads_attributes_from_the_object():
+    data = {"type": "report", "id": "report--1"}
+    view = StixExtensionView(data)
+    data["x_opencti_score"] = 20
+    assert view.get("x_opencti_score") == 20
+
+
+def test_extension_view_reuses_extras_view():
+    view = StixExtensionView(stix_object)
+    assert extension_view(stix_object, {"extensions": view}) is view
+    other = extension_view(dict(stix_object), {"extensions": view})
+    assert other is not view
+    assert extension_view(stix_object, None).get("score") == 50
@@ -0,0 +1,54 @@
+from pycti import OpenCTIApiClient
+
+
+def get_client():
+    client = OpenCTIApiClient(
+        "http://fake:4000", "fake", ssl_verify=False, perform_health_check=False
+    )
+    # No open vocabulary to resolve
+    client.stix2.mapping_cache_permanent["vocabularies_definition_fields"] = []
+    return client
+
+
+def fake_create(calls):
+    def create(**kwargs):
+        calls.append(kwargs)
+        return {"id": "internal-" + kwargs["external_id"]}
+
+    return create
+
+
+def build_object():
+    return {
+        "type": "attack-pattern",
+        "external_references": [
+            {"source_name": "mitre-attack", "external_id": "T1001"},
+            {"source_name": "mitre-attack", "external_id": "T1001"},
+            {"source_name": "mitre-attack", "external_id": "T1002"},
+            {"source_name": "no-id"},
+        ],
+    }
+
+
+def test_external_references_upserted_once():
+    client = get_client()
+    calls = []
+    client.external_reference.create = fake_create(calls)
+    for _ in range(3):
+        result = client.stix2.extract_embedded_relationships(build_object())
+        assert result["external_references"] == [
+            "internal-T1001",
+            "internal-T1001",
+            "internal-T1002",
+        ]
+    assert len(calls) == 2
+
+
+def test_external_references_cache_opt_out():
+    client = get_client()
+    calls = []
+    client.external_reference.create = fake_create(calls)
+    client.stix2.cache_external_references = False
+    client.stix2.extract_embedded_relationships(build_object())
+    client.stix2.extract_embedded_relationships(build_object())
+    assert len(calls) == 6
@@ -0,0 +1,101 @@
+import base64
+import threading
+
+import pytest
+
+from pycti import OpenCTIApiClient, OpenCTIStix2
+from pycti.utils import opencti_stix2_file_upload
+from pycti.utils.opencti_stix2_file_upload import (
+    OpenCTIStix2FileUploader,
+    decode_file_data,
+)
+
+
+def get_cti_helper():
+    client = OpenCTIApiClient(
+        "http://fake:4000", "fake", ssl_verify=False, perform_health_check=False
+    )
+    return OpenCTIStix2(client)
+
+
+def test_decode_file_data(monkeypatch):
+    monkeypatch.setattr(opencti_stix2_file_upload, "DECODE_CHUNK_SIZE", 8)
+    content = bytes(range(256)) * 3
+    encoded = base64.b64encode(content).decode("utf-8")
+    with decode_file_data(encoded, spool_max_size=64) as spooled:
+        assert spooled._rolled
+        assert spooled.read() == content
+    wrapped = base64.encodebytes(content).decode("utf-8")
+    with decode_file_data(wrapped) as spooled:
+        assert spooled.read() == content
+
+
+def test_uploads_run_in_parallel():
+    uploader = OpenCTIStix2FileUploader(max_workers=3)
+    barrier = threading.Barrier(3, timeout=5)
+    uploaded = {}
+
+    def add_file(**kwargs):
+        barrier.wait()
+        uploaded[kwargs["file_name"]] = kwargs["data"].read()
+
+    with uploader.deferring():
+        for name in ["a", "b", "c"]:
+            uploader.submit(
+                add_file, base64.b64encode(name.encode()).decode(), file_name=name
+            )
+    uploader.wait()
+    assert uploaded == {"a": b"a", "b": b"b", "c": b"c"}
+    uploader.shutdown()
+
+
+def test_upload_errors_fail_the_item(monkeypatch):
+    stix2 = get_cti_helper()
+    uploaded = []
+
+    def add_file(**kwargs):
+        if kwargs["file_name"] == "broken.pdf":
+            raise ValueError("upload failed")
+        uploaded.append((kwargs["id"], kwargs["data"].read(), kwargs["mime_type"]))
+
+    def fake_import_object(item, update, types):
+        for file in item["x_opencti_files"]:
+            stix2.upload_file(add_file, "report-id", file, embedded=False)
+
+    monkeypatch.setattr(stix2, "import_object", fake_import_object)
+    files = [
+        {"name": "report.pdf", "data": "UERG", "mime_type": "application/pdf"},
+    ]
+    item = {"type": "report", "id": "report--1", "x_opencti_files": files}
+    assert stix2.import_item(item) is True
+    assert uploaded == [("report-id", b"PDF", "application/pdf")]
+    files.append({"name": "broken.pdf", "data": "UERG"})
+    assert stix2.import_item(item) is False
+    with pytest.raises(ValueError):
+        stix2.upload_file(add_file, "report-id", files[1])
+        stix2.wait_file_uploads()
+
+
+def test_direct_imports_upload_synchronously(monkeypatch):
+    stix2 = get_cti_helper()
+    observables = stix2.opencti.stix_cyber_observable
+
+    def add_file(**kwargs):
+        raise RuntimeError("upload failed")
+
+    monkeypatch.setattr(
+        observables,
+        "create",
+        lambda **kwargs: {"id": "observable-id", "entity_type": "Hostname"},
+    )
+    monkeypatch.setattr(observables, "add_file", add_file)
+    monkeypatch.setattr(stix2, "get_vocabularies_definition_fields", lambda: {})
+    item = {
+        "type": "hostname",
+        "id": "hostname--1",
+        "value": "example.org",
+        "x_opencti_files": [{"name": "file.txt", "data": "UERG"}],
+    }
+    with pytest.raises(RuntimeError):
+        stix2.import_observable(item)
+    assert stix2.file_uploader.pending == []
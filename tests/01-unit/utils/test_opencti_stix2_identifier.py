@@ -0,0 +1,65 @@
+import uuid
+
+import pytest
+from stix2.canonicalization.Canonicalize import canonicalize
+
+from pycti import OpenCTIApiClient, OpenCTIStix2
+from pycti.utils.opencti_stix2_identifier import (
+    OPENCTI_NAMESPACE,
+    canonicalize_data,
+    external_reference_generate_id,
+    generate_standard_id,
+    generate_standard_ids,
+)
+
+
+def get_cti_helper():
+    client = OpenCTIApiClient(
+        "http://fake:4000", "fake", ssl_verify=False, perform_health_check=False
+    )
+    return OpenCTIStix2(client)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"name": "julien", "identity_class": "individual"},
+        {"b": 'é \x01"\\/\n', "a": True, "c": None, "d": 5, "e": 5.12},
+        {"object_refs": ["report--1", "malware--2"]},
+        {"latitude": 5.12, "longitude": -73.5},
+        {"x": 1e-5, "y": 5.0, "z": 1e16},
+        {"x": 2**60},
+        {"nested": {"b": 1, "a": [1, 2]}},
+    ],
+)
+def test_canonicalize_data_matches_stix2(data):
+    assert canonicalize_data(data) == canonicalize(data, utf8=False)
+
+
+def test_generate_standard_id_matches_uuid5():
+    data = {"relationship_type": "uses", "source_ref": "a", "target_ref": "b"}
+    expected = "relationship--" + str(
+        uuid.uuid5(OPENCTI_NAMESPACE, canonicalize(data, utf8=False))
+    )
+    assert generate_standard_id("relationship", data) == expected
+    assert generate_standard_id("relationship", data) == expected
+    assert generate_standard_ids("relationship", [data, data]) == [expected] * 2
+    assert external_reference_generate_id(url="https://a") == (
+        "external-reference--"
+        + str(uuid.uuid5(OPENCTI_NAMESPACE, '{"url":"https://a"}'))
+    )
+
+
+def test_generate_ids():
+    stix2 = get_cti_helper()
+    records = [{"type": "malware", "name": "Emotet"}, {"name": "TrickBot"}]
+    assert stix2.generate_ids("malware", records) == [
+        stix2.opencti.malware.generate_id("Emotet"),
+        stix2.opencti.malware.generate_id("TrickBot"),
+    ]
+    assert stix2.generate_ids(
+        "kill-chain-phase",
+        [{"phase_name": "execution", "kill_chain_name": "mitre-attack"}],
+    ) == [stix2.opencti.kill_chain_phase.generate_id("execution", "mitre-attack")]
+    with pytest.raises(ValueError):
+        stix2.generate_ids("unknown", [{}])
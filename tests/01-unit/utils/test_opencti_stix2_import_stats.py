@@ -0,0 +1,71 @@
+import json
+
+from pycti import OpenCTIApiClient, OpenCTIStix2, OpenCTIStix2ImportStats
+from pycti.utils import opencti_stix2_retry
+from pycti.utils.opencti_stix2_retry import ERROR_TYPE_LOCK
+
+
+def get_cti_helper():
+    client = OpenCTIApiClient(
+        "http://fake:4000", "fake", ssl_verify=False, perform_health_check=False
+    )
+    return OpenCTIStix2(client)
+
+
+def test_import_bundle_collects_stats(monkeypatch):
+    monkeypatch.setitem(opencti_stix2_retry.RETRY_DELAYS, ERROR_TYPE_LOCK, (0, 0))
+    stix2 = get_cti_helper()
+    attempts = []
+
+    def fake_import_object(item, update, types):
+        attempts.append(item["id"])
+        if item["id"] == "malware--1" and attempts.count("malware--1") == 1:
+            raise ValueError({"name": "LOCK_ERROR"})
+        if item["id"] == "malware--3":
+            raise ValueError("functional error")
+        stix2.mapping_cache[item["id"]] = {"id": item["id"], "type": item["type"]}
+
+    monkeypatch.setattr(stix2, "import_object", fake_import_object)
+    bundle = {
+        "type": "bundle",
+        "id": "bundle--1",
+        "objects": [
+            {"type": "identity", "id": "identity--1", "name": "A"},
+            {"type": "malware", "id": "malware--1", "name": "B"},
+            {"type": "malware", "id": "malware--2", "name": "C"},
+            {"type": "malware", "id": "malware--3", "name": "D"},
+        ],
+    }
+    stats = OpenCTIStix2ImportStats(slowest_count=2)
+    imported, _ = stix2.import_bundle(bundle, stats=stats)
+    assert len(imported) == 4
+    assert stix2.import_stats is None
+
+    summary = stats.to_dict()
+    assert summary["objects"] == 4
+    assert summary["imported_by_type"] == {"identity": 1, "malware": 2}
+    assert summary["failed_by_type"] == {"malware": 1}
+    assert summary["retries"] == {ERROR_TYPE_LOCK: 1}
+    assert summary["attempts"] == 5
+    assert len(summary["slowest"]) == 2
+    assert summary["slowest"][0]["duration"] >= summary["slowest"][1]["duration"]
+    phases = summary["phases"]
+    assert {"split", "file_upload", "import"} <= set(phases)
+    assert phases["mutation"] <= phases["import"]
+    assert set(summary["cache_hit_ratios"]) == {
+        "mapping_cache",
+        "mapping_cache_permanent",
+    }
+    json.dumps(summary)
+
+
+def test_import_bundle_without_stats(monkeypatch):
+    stix2 = get_cti_helper()
+    monkeypatch.setattr(stix2, "import_object", lambda item, update, types: None)
+    bundle = {
+        "type": "bundle",
+        "id": "bundle--1",
+        "objects": [{"type": "malware", "id": "malware--1", "name": "B"}],
+    }
+    imported, _ = stix2.import_bundle(bundle)
+    assert len(imported) == 1
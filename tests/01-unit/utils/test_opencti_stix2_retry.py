@@ -0,0 +1,187 @@
+from requests import ConnectionError
+
+from pycti import OpenCTIApiClient, OpenCTIStix2
+from pycti.utils import opencti_stix2_retry
+from pycti.utils.opencti_stix2_retry import (
+    ERROR_TYPE_BAD_GATEWAY,
+    ERROR_TYPE_CONNECTION,
+    ERROR_TYPE_LOCK,
+    ERROR_TYPE_MISSING_REFERENCE,
+    OpenCTIStix2RetryScheduler,
+    classify_error,
+    retry_delay,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def get_cti_helper():
+    client = OpenCTIApiClient(
+        "http://fake:4000", "fake", ssl_verify=False, perform_health_check=False
+    )
+    return OpenCTIStix2(client)
+
+
+def test_classify_error():
+    assert classify_error(ValueError({"name": "LOCK_ERROR", "error_message": "x"})) == (
+        ERROR_TYPE_LOCK
+    )
+    assert classify_error(ConnectionError("refused")) == ERROR_TYPE_CONNECTION
+    assert classify_error(ValueError("<h1>502 Bad Gateway</h1>")) == (
+        ERROR_TYPE_BAD_GATEWAY
+    )
+    assert classify_error(ValueError({"name": "FUNCTIONAL_ERROR"})) is None
+    try:
+        try:
+            raise ValueError({"name": "MISSING_REFERENCE_ERROR"})
+        except ValueError as ex:
+            raise KeyError("wrapped") from ex
+    except KeyError as ex:
+        assert classify_error(ex) == ERROR_TYPE_MISSING_REFERENCE
+
+
+def test_retry_delay():
+    assert 1 <= retry_delay(ERROR_TYPE_LOCK, 50) <= 3
+    assert retry_delay(ERROR_TYPE_MISSING_REFERENCE, 0) is not None
+    assert retry_delay(ERROR_TYPE_MISSING_REFERENCE, 4) is None
+    assert retry_delay(None, 0) is None
+
+
+def test_scheduler_orders_by_deadline():
+    clock = FakeClock()
+    scheduler = OpenCTIStix2RetryScheduler(clock=clock, sleep=clock.sleep)
+    scheduler.schedule({"id": "late"}, 1, ERROR_TYPE_LOCK, 3)
+    scheduler.schedule({"id": "early"}, 1, ERROR_TYPE_LOCK, 1)
+    assert scheduler.pop_ready() == []
+    ready = scheduler.wait_next()
+    assert [entry.item["id"] for entry in ready] == ["early"]
+    assert clock.sleeps == [1]
+    scheduler.schedule({"id": "platform"}, 1, ERROR_TYPE_BAD_GATEWAY, 60)
+    scheduler.wait_if_paused()
+    assert clock.now == 61
+    assert [entry.item["id"] for entry in scheduler.pop_ready()] == [
+        "late",
+        "platform",
+    ]
+
+
+def test_import_bundle_continues_while_item_is_parked(monkeypatch):
+    monkeypatch.setitem(opencti_stix2_retry.RETRY_DELAYS, ERROR_TYPE_LOCK, (0.05, 0.05))
+    stix2 = get_cti_helper()
+    attempts = []
+
+    def fake_import_object(item, update, types):
+        attempts.append(item["id"])
+        if item["id"] == "malware--1" and attempts.count("malware--1") < 3:
+            raise ValueError({"name": "LOCK_ERROR", "error_message": "locked"})
+
+    monkeypatch.setattr(stix2, "import_object", fake_import_object)
+    bundle = {
+        "type": "bundle",
+        "id": "bundle--1",
+        "objects": [
+            {"type": "malware", "id": "malware--1", "name": "A"},
+            {"type": "malware", "id": "malware--2", "name": "B"},
+        ],
+    }
+    imported, _ = stix2.import_bundle(bundle)
+    assert attempts.index("malware--2") < attempts.index("malware--1", 1)
+    assert attempts.count("malware--1") == 3
+    assert len(imported) == 2
+
+
+def test_import_item_retries_without_recursion(monkeypatch):
+    monkeypatch.setitem(opencti_stix2_retry.RETRY_DELAYS, ERROR_TYPE_LOCK, (0, 0))
+    stix2 = get_cti_helper()
+    attempts = []
+
+    def fake_import_object(item, update, types):
+        attempts.append(item["id"])
+        if len(attempts) < 5:
+            raise ValueError({"name": "LOCK_ERROR"})
+
+    monkeypatch.setattr(stix2, "import_object", fake_import_object)
+    assert stix2.import_item({"type": "malware", "id": "malware--1"}) is True
+    assert len(attempts) == 5
+
+    def failing_import_object(item, update, types):
+        raise ValueError("boom")
+
+    monkeypatch.setattr(stix2, "import_object", failing_import_object)
+    assert stix2.import_item({"type": "malware", "id": "malware--1"}) is False
+
+
+def test_scheduler_defers_until_reference_is_resolved():
+    scheduler = OpenCTIStix2RetryScheduler()
+    entry = scheduler.defer({"id": "malware--1"}, 1, ["identity--1", "marking--1"])
+    assert scheduler.deferred_count == 1
+    assert scheduler.resolve("marking--1") == [entry]
+    assert scheduler.resolve("identity--1") == []
+    assert scheduler.pop_deferred() is None
+
+
+def test_import_bundle_retries_deferred_item_once_reference_exists(monkeypatch):
+    monkeypatch.setitem(opencti_stix2_retry.RETRY_DELAYS, ERROR_TYPE_LOCK, (0.05, 0.05))
+    stix2 = get_cti_helper()
+    attempts = []
+
+    def fake_import_object(item, update, types):
+        attempts.append(item["id"])
+        if item["id"] == "identity--1" and attempts.count("identity--1") == 1:
+            raise ValueError({"name": "LOCK_ERROR"})
+        if item.get("created_by_ref") not in (None, *stix2.mapping_cache.keys()):
+            raise ValueError({"name": "MISSING_REFERENCE_ERROR"})
+        stix2.mapping_cache[item["id"]] = {"id": item["id"], "type": item["type"]}
+
+    monkeypatch.setattr(stix2, "import_object", fake_import_object)
+    bundle = {
+        "type": "bundle",
+        "id": "bundle--1",
+        "objects": [
+            {"type": "identity", "id": "identity--1", "name": "A"},
+            {
+                "type": "malware",
+                "id": "malware--1",
+                "name": "B",
+                "created_by_ref": "identity--1",
+            },
+        ],
+    }
+    stix2.import_bundle(bundle)
+    assert attempts == ["identity--1", "malware--1", "identity--1", "malware--1"]
+    assert "malware--1" in stix2.mapping_cache
+
+
+def test_import_bundle_fails_deferred_item_after_drain(monkeypatch):
+    monkeypatch.setitem(
+        opencti_stix2_retry.RETRY_DELAYS, ERROR_TYPE_MISSING_REFERENCE, (0, 0)
+    )
+    stix2 = get_cti_helper()
+    attempts = []
+
+    def fake_import_object(item, update, types):
+        attempts.append(item["id"])
+        raise ValueError(
+            {"name": "MISSING_REFERENCE_ERROR", "unresolvedIds": ["identity--9"]}
+        )
+
+    monkeypatch.setattr(stix2, "import_object", fake_import_object)
+    bundle = {
+        "type": "bundle",
+        "id": "bundle--1",
+        "objects": [{"type": "malware", "id": "malware--1", "name": "B"}],
+    }
+    imported, _ = stix2.import_bundle(bundle)
+    assert len(imported) == 1
+    assert len(attempts) == opencti_stix2_retry.PROCESSING_COUNT + 1
@@ -0,0 +1,76 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+from pycti import OpenCTIApiClient
+from pycti.utils import opencti_tracing
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    opencti_tracing.enable_tracing()
+    with patch.object(opencti_tracing, "_tracer", lambda: provider.get_tracer("t")):
+        yield exporter
+    opencti_tracing.enable_tracing(False)
+
+
+def test_tracing_is_disabled_by_default():
+    assert not opencti_tracing.is_enabled()
+    assert opencti_tracing.inject() is None
+    assert opencti_tracing.extract({"traceparent": "x"}) is None
+    with opencti_tracing.span("unused") as span:
+        assert span is None
+    assert opencti_tracing.traced("unused")(lambda x: x + 1)(1) == 2
+
+
+def test_context_is_propagated_through_headers(exporter):
+    @opencti_tracing.traced("consume")
+    def consume():
+        with opencti_tracing.span("import", {"sequence": 1}):
+            pass
+
+    with opencti_tracing.span("publish"):
+        headers = opencti_tracing.inject()
+    assert "traceparent" in headers
+
+    context = opencti_tracing.extract(headers)
+    thread = threading.Thread(target=opencti_tracing.bind(consume, context))
+    thread.start()
+    thread.join()
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert spans["import"].parent.span_id == spans["consume"].context.span_id
+    assert spans["consume"].parent.span_id == spans["publish"].context.span_id
+    assert spans["import"].attributes["sequence"] == 1
+
+
+def test_query_span_and_headers(exporter):
+    client = OpenCTIApiClient(
+        "http://fake:4000", "fake", ssl_verify=False, perform_health_check=False
+    )
+    sent_headers = []
+
+    class Response:
+        status_code = 200
+        content = b'{"data": {}}'
+
+    def post(url, data=None, headers=None, **kwargs):
+        sent_headers.append(headers)
+        return Response()
+
+    client.session.post = post
+    client.query("query Me { me { id } }")
+    (span,) = exporter.get_finished_spans()
+    assert span.name == "opencti.api.query"
+    assert span.attributes["graphql.operation.name"] == "Me"
+    assert "traceparent" in sent_headers[0]
+    assert "traceparent" not in client.request_headers